@@ -0,0 +1,286 @@
+import socket
+import time
+from dataclasses import dataclass, field
+from threading import Lock
+
+from PySide6.QtCore import QObject, Signal, QThread, QTimer, Qt, Slot
+
+from ledboarddesktop.artnet.packet import (
+    ARTNET_PORT, ARTDMX_HEADER_SIZE, ARTDMX_SEQUENCE_OFFSET, UNIVERSE_SIZE, make_artdmx_header
+)
+from ledboarddesktop.artnet.recording import RecordingWriter
+
+
+@dataclass
+class ArtnetOutputStatistics:
+    ticks: int = 0
+    sent: int = 0  # packets, one per universe and target
+    keep_alives: int = 0  # universes sent unchanged
+    errors: int = 0
+
+
+@dataclass
+class ArtnetUniverse:
+    number: int
+    targets: list[tuple[str, int]] = field(default_factory=list)
+    buffer: bytearray = field(default_factory=lambda: bytearray(UNIVERSE_SIZE))
+    is_dirty: bool = True
+    last_sent: float = 0.0
+    sequence: int = 0
+    packet: bytearray | None = None
+
+    def __post_init__(self):
+        if self.packet is None:
+            self.packet = make_artdmx_header(self.number, 0) + bytearray(UNIVERSE_SIZE)
+
+
+class ArtnetSender(QObject):
+    """
+    Sends, on each tick of its thread's timer, the universes written since the previous tick,
+    and the ones left unchanged for keep_alive_interval.
+
+    Universe buffers are copied into their packet while holding the lock, sending (and recording) happens
+    after releasing it.
+    """
+
+    errorOccurred = Signal(str)
+
+    def __init__(self, universes: dict[int, ArtnetUniverse], lock: Lock, statistics: ArtnetOutputStatistics, parent=None):
+        super().__init__(parent)
+
+        self.keep_alive_interval = 1.0  # seconds
+
+        self._universes = universes
+        self._lock = lock
+        self._statistics = statistics
+        self._interval = 23
+        self._timer: QTimer | None = None
+        self._socket: socket.socket | None = None
+        self._failing_targets: set[tuple[str, int]] = set()
+
+        self._recorder: RecordingWriter | None = None
+        self._recorder_lock = Lock()
+
+    @property
+    def is_recording(self) -> bool:
+        return self._recorder is not None
+
+    def set_recorder(self, recorder: RecordingWriter | None) -> RecordingWriter | None:
+        """
+        Returns the previous recorder, once it is no longer used
+        """
+        with self._recorder_lock:
+            previous = self._recorder
+            self._recorder = recorder
+            return previous
+
+    @Slot()
+    def start(self):
+        if self._socket is None:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            self._socket.setblocking(False)
+
+        if self._timer is None:
+            self._timer = QTimer(self)
+            self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+            self._timer.timeout.connect(self._tick)
+
+        self._timer.start(self._interval)
+
+    def stop(self):
+        """
+        Must be called once the sender thread is stopped
+        """
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    @Slot(int)
+    def set_interval(self, interval: int):
+        self._interval = interval
+        if self._timer is not None and self._timer.isActive():
+            self._timer.start(interval)
+
+    def _tick(self):
+        now = time.monotonic()
+        due: list[tuple[int, bytearray, list[tuple[str, int]]]] = list()
+
+        with self._lock:
+            self._statistics.ticks += 1
+            for universe in self._universes.values():
+                if not universe.is_dirty:
+                    if now - universe.last_sent < self.keep_alive_interval:
+                        continue
+                    self._statistics.keep_alives += 1
+
+                universe.sequence = universe.sequence % 255 + 1
+                universe.packet[ARTDMX_SEQUENCE_OFFSET] = universe.sequence
+                universe.packet[ARTDMX_HEADER_SIZE:] = universe.buffer
+                universe.is_dirty = False
+                universe.last_sent = now
+                due.append((universe.number, universe.packet, universe.targets))
+
+        sent = errors = 0
+        for _, packet, targets in due:
+            for target in targets:
+                try:
+                    self._socket.sendto(packet, target)
+                    sent += 1
+                    self._failing_targets.discard(target)
+
+                except OSError as e:
+                    errors += 1
+                    if target not in self._failing_targets:
+                        self._failing_targets.add(target)
+                        self.errorOccurred.emit(f"Art-Net output to {target[0]}:{target[1]} failed ({e})")
+
+        with self._recorder_lock:
+            if self._recorder is not None and due:
+                self._recorder.record(now, [
+                    (number, memoryview(packet)[ARTDMX_HEADER_SIZE:]) for number, packet, _ in due
+                ])
+
+        if sent or errors:
+            with self._lock:
+                self._statistics.sent += sent
+                self._statistics.errors += errors
+
+
+class ArtnetOutputEngine(QObject):
+    """
+    Art-Net output for any number of universes, each sent to one or more targets.
+
+    Writers only update the universes' shared buffers (write, or direct buffer writes under lock followed
+    by mark_dirty), a sender thread sends at refresh_rate the universes that changed, and sends unchanged
+    universes again every keep_alive_interval so receivers don't time out.
+
+    What is sent can be recorded to a file (start_recording), to be replayed offline.
+    """
+
+    errorOccurred = Signal(str)
+    intervalChanged = Signal(int)
+
+    recording_keyframe_interval = 10.0  # seconds
+
+    def __init__(self, refresh_rate: int = 44, parent=None):
+        super().__init__(parent)
+
+        self.lock = Lock()
+        self._universes: dict[int, ArtnetUniverse] = dict()
+        self._statistics = ArtnetOutputStatistics()
+
+        self._sender = ArtnetSender(self._universes, self.lock, self._statistics)
+        self._sender.errorOccurred.connect(self.errorOccurred)
+        self.intervalChanged.connect(self._sender.set_interval)
+
+        self._thread = QThread()
+        self._thread.setObjectName("ArtnetOutput")
+        self._sender.moveToThread(self._thread)
+        self._thread.started.connect(self._sender.start)
+
+        self.refresh_rate = refresh_rate
+        self.interval = 0
+        self.set_refresh_rate(refresh_rate)
+
+    def start(self):
+        if not self._thread.isRunning():
+            self._thread.start()
+
+    def stop(self):
+        self._thread.quit()
+        self._thread.wait()
+        self._sender.stop()
+        self.stop_recording()
+
+    def set_refresh_rate(self, refresh_rate: int):
+        """
+        Hz, Art-Net receivers expect 44 at most
+        """
+        self.refresh_rate = refresh_rate
+        self.interval = max(1, round(1000 / refresh_rate))  # ms, the actual rate is 1000 / interval
+        self.intervalChanged.emit(self.interval)
+
+    def start_recording(self, filepath: str):
+        """
+        Records every universe sent (see RecordingWriter) until stop_recording
+        """
+        self.stop_recording()
+        self._sender.set_recorder(RecordingWriter(filepath, keyframe_interval=self.recording_keyframe_interval))
+
+    def stop_recording(self):
+        recorder = self._sender.set_recorder(None)
+        if recorder is not None:
+            recorder.close()
+
+    @property
+    def is_recording(self) -> bool:
+        return self._sender.is_recording
+
+    def set_keep_alive_interval(self, interval: float):
+        self._sender.keep_alive_interval = interval
+
+    def add_universe(self, number: int, target_ip: str, port: int = ARTNET_PORT) -> bytearray:
+        """
+        Adds the target to the universe (creating it if needed) and returns the universe's buffer
+        """
+        with self.lock:
+            universe = self._universes.get(number)
+            if universe is None:
+                universe = ArtnetUniverse(number)
+                self._universes[number] = universe
+
+            target = (target_ip, port)
+            if target not in universe.targets:
+                universe.targets = universe.targets + [target]  # the sender may be iterating the former list
+            universe.is_dirty = True
+
+            return universe.buffer
+
+    def remove_universe(self, number: int, target_ip: str | None = None, port: int = ARTNET_PORT):
+        """
+        Removes the target from the universe, or the whole universe if no target is given (or none is left)
+        """
+        with self.lock:
+            universe = self._universes.get(number)
+            if universe is None:
+                return
+
+            if target_ip is not None:
+                universe.targets = [target for target in universe.targets if target != (target_ip, port)]
+
+            if target_ip is None or not universe.targets:
+                self._universes.pop(number)
+
+    def universe_numbers(self) -> list[int]:
+        with self.lock:
+            return sorted(self._universes)
+
+    def buffer(self, number: int) -> bytearray:
+        """
+        Writers must hold lock and call mark_dirty afterward
+        """
+        return self._universes[number].buffer
+
+    def write(self, number: int, offset: int, values: bytes):
+        """
+        Values beyond the universe's end are dropped
+        """
+        if not 0 <= offset <= UNIVERSE_SIZE:
+            raise ValueError(f"Offset {offset} is outside of the universe (0-{UNIVERSE_SIZE})")
+
+        values = values[:UNIVERSE_SIZE - offset]  # a longer slice assignment would grow the buffer
+        with self.lock:
+            universe = self._universes[number]
+            universe.buffer[offset:offset + len(values)] = values
+            universe.is_dirty = True
+
+    def mark_dirty(self, number: int):
+        """
+        Does not take the lock, to be called after writing a buffer while holding it
+        """
+        self._universes[number].is_dirty = True
+
+    def statistics(self) -> ArtnetOutputStatistics:
+        with self.lock:
+            return ArtnetOutputStatistics(**self._statistics.__dict__)
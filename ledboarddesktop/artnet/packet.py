@@ -0,0 +1,29 @@
+import struct
+
+ARTNET_PORT = 6454
+UNIVERSE_SIZE = 512
+
+ARTDMX_HEADER_SIZE = 18
+ARTDMX_SEQUENCE_OFFSET = 12
+
+_ARTDMX_HEADER = struct.Struct("<8sH2xBBHH")  # protocol version and length are big endian, packed apart
+
+
+def make_artdmx_header(universe: int, sequence: int, length: int = UNIVERSE_SIZE) -> bytearray:
+    """
+    ArtDmx header, universe is the 15 bits port address (net, sub-net and universe).
+
+    Sequence is 1-255 (0 disables reordering on the receiver), length must be even, 2-512
+    """
+    header = bytearray(_ARTDMX_HEADER.pack(b"Art-Net\x00", 0x5000, sequence, 0, universe & 0x7FFF, 0))
+    struct.pack_into(">H", header, 10, 14)  # protocol version
+    struct.pack_into(">H", header, 16, length)
+    return header
+
+
+def make_artdmx_packet(universe: int, sequence: int, data: bytes) -> bytearray:
+    data = bytes(data)
+    if len(data) % 2:
+        data += b"\x00"
+
+    return make_artdmx_header(universe, sequence, len(data)) + data
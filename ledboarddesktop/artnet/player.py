@@ -0,0 +1,224 @@
+import time
+from dataclasses import dataclass
+from threading import Condition
+
+import numpy as np
+from PySide6.QtCore import QObject, Signal, QThread, Slot
+
+from ledboarddesktop.artnet.output_engine import ArtnetOutputEngine
+from ledboarddesktop.artnet.sequence_file import SequenceFile
+
+
+@dataclass
+class PlaybackDrift:
+    mean: float = 0.0  # seconds late, on average, when a frame was written
+    max: float = 0.0
+    frames: int = 0
+    dropped: int = 0  # frames skipped to catch up
+
+
+class ArtnetPlaybackLoop(QObject):
+    """
+    Playback thread loop, commands are read from ArtnetPlayer's state under its condition
+    """
+
+    driftReported = Signal(PlaybackDrift)
+    finished = Signal()
+    positionChanged = Signal(int)
+
+    def __init__(self, player: "ArtnetPlayer", parent=None):
+        super().__init__(parent)
+        self._player = player
+
+    @Slot()
+    def run(self):
+        self._player._run(self)
+
+
+class ArtnetPlayer(QObject):
+    """
+    Plays a SequenceFile into the Art-Net output universe buffers.
+
+    Frame deadlines are computed from the monotonic clock time playback (re)started at, so lateness
+    doesn't accumulate. Frames more than one period late are skipped, drift is reported every report_interval.
+
+    Destination buffers are wrapped once when loading, each frame is a np.copyto per universe from the
+    memory map, no frame buffer is allocated while playing. Universes not added to the output engine are not played.
+    """
+
+    driftReported = Signal(PlaybackDrift)
+    finished = Signal()
+    positionChanged = Signal(int)
+
+    report_interval = 1.0  # seconds
+
+    def __init__(self, output: ArtnetOutputEngine, parent=None):
+        super().__init__(parent)
+
+        self._output = output
+        self._condition = Condition()
+
+        self._sequence: SequenceFile | None = None
+        self._destinations: list[tuple[int, int, np.ndarray]] = list()  # universe number, sequence row, buffer view
+        self._is_playing = False
+        self.is_looping = False
+        self._is_quitting = False
+        self._frame = 0
+        self._seek_frame: int | None = None
+
+        self._loop = ArtnetPlaybackLoop(self)
+        self._loop.driftReported.connect(self.driftReported)
+        self._loop.finished.connect(self.finished)
+        self._loop.positionChanged.connect(self.positionChanged)
+
+        self._thread = QThread()
+        self._thread.setObjectName("ArtnetPlayer")
+        self._loop.moveToThread(self._thread)
+        self._thread.started.connect(self._loop.run)
+        self._thread.finished.connect(self._loop.deleteLater)
+
+    @property
+    def is_playing(self) -> bool:
+        return self._is_playing
+
+    @property
+    def position(self) -> int:
+        return self._frame
+
+    @property
+    def sequence(self) -> SequenceFile | None:
+        return self._sequence
+
+    def start(self):
+        if not self._thread.isRunning():
+            self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._is_quitting = True
+            self._condition.notify_all()
+
+        self._thread.quit()
+        self._thread.wait()
+
+    def load(self, sequence: SequenceFile):
+        universe_numbers = set(self._output.universe_numbers())
+        with self._condition:
+            self._sequence = sequence
+            self._destinations = [
+                (number, row, np.frombuffer(self._output.buffer(number), dtype=np.uint8))
+                for row, number in enumerate(sequence.universes)
+                if number in universe_numbers
+            ]
+            self._is_playing = False
+            self._frame = 0
+            self._seek_frame = 0
+            self._condition.notify_all()
+
+    def play(self):
+        with self._condition:
+            if self._sequence is None or not self._sequence.frame_count:
+                return
+
+            if self._frame >= self._sequence.frame_count - 1 and not self.is_looping:
+                self._seek_frame = 0
+            self._is_playing = True
+            self._condition.notify_all()
+
+    def pause(self):
+        with self._condition:
+            self._is_playing = False
+            self._condition.notify_all()
+
+    def seek(self, frame: int):
+        """
+        Scrubbing, the frame is output right away, even when paused
+        """
+        with self._condition:
+            if self._sequence is None or not self._sequence.frame_count:
+                return
+
+            self._seek_frame = min(max(0, frame), self._sequence.frame_count - 1)
+            self._condition.notify_all()
+
+    #
+    # Playback thread
+    def _run(self, loop: ArtnetPlaybackLoop):
+        drift = PlaybackDrift()
+        drift_sum = 0.0
+        report_time = time.monotonic()
+        start_time = 0.0
+        start_frame = 0
+        was_playing = False
+
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._is_quitting or self._is_playing or self._seek_frame is not None
+                )
+                if self._is_quitting:
+                    return
+
+                if self._seek_frame is not None:
+                    self._frame = self._seek_frame
+                    self._seek_frame = None
+                    was_playing = False  # restarts the clock
+                    self._write_frame(self._frame)
+                    loop.positionChanged.emit(self._frame)
+                    if not self._is_playing:
+                        continue
+
+                frame_rate = self._sequence.frame_rate
+                frame_count = self._sequence.frame_count
+
+                if not was_playing:
+                    start_time = time.monotonic()
+                    start_frame = self._frame
+                    was_playing = True
+
+                deadline = start_time + (self._frame + 1 - start_frame) / frame_rate
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)  # commands interrupt the wait
+                    was_playing = self._is_playing
+                    continue
+
+                now = time.monotonic()
+                late = now - deadline
+                skipped = max(0, int(late * frame_rate))
+                frame = self._frame + 1 + skipped
+
+                if frame >= frame_count:
+                    if self.is_looping:
+                        start_frame -= (frame // frame_count) * frame_count
+                        frame %= frame_count
+                    else:
+                        self._is_playing = False
+                        was_playing = False
+                        self._frame = frame_count - 1
+                        loop.positionChanged.emit(self._frame)
+                        loop.finished.emit()
+                        continue
+
+                self._frame = frame
+                self._write_frame(frame)
+
+            drift.frames += 1
+            drift.dropped += skipped
+            drift_sum += late
+            drift.max = max(drift.max, late)
+
+            if now - report_time >= self.report_interval:
+                drift.mean = drift_sum / drift.frames
+                loop.driftReported.emit(drift)
+                loop.positionChanged.emit(frame)
+                drift = PlaybackDrift()
+                drift_sum = 0.0
+                report_time = now
+
+    def _write_frame(self, frame: int):
+        frames = self._sequence.frames
+        with self._output.lock:
+            for number, row, destination in self._destinations:
+                np.copyto(destination, frames[frame, row])
+                self._output.mark_dirty(number)
@@ -0,0 +1,254 @@
+import bisect
+import mmap
+import struct
+
+import numpy as np
+
+from ledboarddesktop.artnet.packet import UNIVERSE_SIZE
+from ledboarddesktop.artnet.sequence_file import SequenceFile
+
+
+class RecordingError(Exception):
+    pass
+
+
+_HEADER = struct.Struct("<8sHxxf")  # magic, version, keyframe interval
+_RECORD = struct.Struct("<dHBH")  # timestamp, universe, is keyframe, run count
+_RUN = struct.Struct("<HH")  # first channel, channel count, followed by the channel values
+_INDEX_ENTRY = struct.Struct("<dQ")  # keyframe timestamp, file offset
+_FOOTER = struct.Struct("<QI4s")  # index offset, index entry count, index magic
+
+_MAGIC = b"LBDMXREC"
+_INDEX_MAGIC = b"LBIX"
+_VERSION = 1
+
+
+class RecordingWriter:
+    """
+    Records sent universes to a delta-compressed file.
+
+    Each record holds a universe's changed channels as runs (changes closer than run_gap channels are merged
+    into one run). Every keyframe_interval, all universes are written whole, and the keyframe's offset is
+    added to the index written as a footer when closing, so a reader can seek without decoding from the start.
+    The file is flushed after each keyframe, a recording left without footer (crash) keeps everything up to
+    its last keyframe and is still readable, its index is rebuilt by scanning.
+
+    Timestamps are seconds since the first recorded frame.
+    """
+
+    run_gap = 4
+
+    def __init__(self, filepath: str, keyframe_interval: float = 10.0):
+        self.filepath = filepath
+        self.keyframe_interval = keyframe_interval
+
+        self._file = open(filepath, "wb", buffering=1024 * 1024)
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, keyframe_interval))
+        self._offset = _HEADER.size
+
+        self._states: dict[int, np.ndarray] = dict()
+        self._index: list[tuple[float, int]] = list()
+        self._start_time: float | None = None
+        self._keyframe_time = 0.0
+
+    def record(self, time: float, universes: list[tuple[int, bytes]]):
+        """
+        Universes (number, 512 channels) sent at monotonic time
+        """
+        if self._start_time is None:
+            self._start_time = time
+        timestamp = time - self._start_time
+
+        is_keyframe = not self._index or timestamp - self._keyframe_time >= self.keyframe_interval
+        for number, data in universes:
+            channels = np.frombuffer(data, dtype=np.uint8, count=UNIVERSE_SIZE)
+            state = self._states.get(number)
+
+            if state is None:
+                self._states[number] = channels.copy()
+                if not is_keyframe:
+                    self._write_record(timestamp, number, False, [(0, channels)])
+                continue
+
+            if not is_keyframe:
+                runs = self._changed_runs(state, channels)
+                if runs:
+                    self._write_record(timestamp, number, False, runs)
+            np.copyto(state, channels)
+
+        if is_keyframe:
+            self._keyframe_time = timestamp
+            self._index.append((timestamp, self._offset))
+            for number, state in self._states.items():
+                self._write_record(timestamp, number, True, [(0, state)])
+            self._file.flush()
+
+    def close(self):
+        index_offset = self._offset
+        for timestamp, offset in self._index:
+            self._file.write(_INDEX_ENTRY.pack(timestamp, offset))
+        self._file.write(_FOOTER.pack(index_offset, len(self._index), _INDEX_MAGIC))
+        self._file.close()
+
+    def _changed_runs(self, previous: np.ndarray, current: np.ndarray) -> list[tuple[int, np.ndarray]]:
+        changed = np.flatnonzero(previous != current)
+        if not len(changed):
+            return list()
+
+        breaks = np.flatnonzero(np.diff(changed) > self.run_gap)
+        starts = changed[np.r_[0, breaks + 1]]
+        ends = changed[np.r_[breaks, len(changed) - 1]] + 1
+        return [(int(start), current[start:end]) for start, end in zip(starts.tolist(), ends.tolist())]
+
+    def _write_record(self, timestamp: float, number: int, is_keyframe: bool, runs: list[tuple[int, np.ndarray]]):
+        self._file.write(_RECORD.pack(timestamp, number, is_keyframe, len(runs)))
+        self._offset += _RECORD.size
+        for start, values in runs:
+            self._file.write(_RUN.pack(start, len(values)))
+            self._file.write(values.tobytes())
+            self._offset += _RUN.size + len(values)
+
+
+class RecordingReader:
+    """
+    Reads a RecordingWriter file, seek returns every universe's channels at a given time
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+
+        with open(filepath, "rb") as file:
+            try:
+                self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise RecordingError(f"{filepath} is empty")
+
+        if len(self._data) < _HEADER.size:
+            raise RecordingError(f"{filepath} is not a DMX recording")
+
+        magic, version, self.keyframe_interval = _HEADER.unpack_from(self._data)
+        if magic != _MAGIC:
+            raise RecordingError(f"{filepath} is not a DMX recording")
+        if version > _VERSION:
+            raise RecordingError(f"{filepath} was saved by a newer version (format {version})")
+
+        self._records_end = len(self._data)
+        self._scanned_universes: set[int] = set()
+        self._index = self._read_index()
+        if not self._index:
+            self._index = self._scan_index()
+
+        self._index_times = [timestamp for timestamp, _ in self._index]
+        self.duration = self._last_timestamp()
+        # The last keyframe has every universe seen before it, unless a crash cut it (then every record was scanned)
+        self.universes: list[int] = sorted(self.seek(self.duration).keys() | self._scanned_universes)
+
+    def close(self):
+        self._data.close()
+
+    def records(self, offset: int | None = None):
+        """
+        Yields (offset, timestamp, universe, is keyframe, runs) from offset (the first record if None)
+        """
+        offset = _HEADER.size if offset is None else offset
+        while offset + _RECORD.size <= self._records_end:
+            timestamp, number, is_keyframe, run_count = _RECORD.unpack_from(self._data, offset)
+            record_offset = offset
+            offset += _RECORD.size
+
+            runs = list()
+            for _ in range(run_count):
+                if offset + _RUN.size > self._records_end:
+                    return  # truncated recording
+                start, count = _RUN.unpack_from(self._data, offset)
+                offset += _RUN.size
+                if offset + count > self._records_end:
+                    return
+                runs.append((start, np.frombuffer(self._data[offset:offset + count], dtype=np.uint8)))
+                offset += count
+
+            yield record_offset, timestamp, number, bool(is_keyframe), runs
+
+    def seek(self, timestamp: float) -> dict[int, np.ndarray]:
+        """
+        Channels of every universe recorded at or before timestamp
+        """
+        states: dict[int, np.ndarray] = dict()
+        keyframe = max(0, bisect.bisect_right(self._index_times, timestamp) - 1)
+        offset = self._index[keyframe][1] if self._index else None
+
+        for _, record_timestamp, number, _, runs in self.records(offset):
+            if record_timestamp > timestamp:
+                break
+            self._apply(states, number, runs)
+
+        return states
+
+    def write_sequence(self, filepath: str, frame_rate: float):
+        """
+        Resamples the recording at frame_rate into a SequenceFile, each frame holding the last channels
+        recorded up to half a frame after its time (recording at the output refresh rate replays frame for frame)
+        """
+        frame_count = int(self.duration * frame_rate) + 1
+        frames = SequenceFile.create(filepath, frame_count, self.universes, frame_rate)
+        rows = {number: row for row, number in enumerate(self.universes)}
+
+        states: dict[int, np.ndarray] = dict()
+        frame = 0
+        for _, timestamp, number, _, runs in self.records():
+            while frame < frame_count and (frame + 0.5) / frame_rate < timestamp:
+                self._store(frames[frame], states, rows)
+                frame += 1
+            self._apply(states, number, runs)
+
+        while frame < frame_count:
+            self._store(frames[frame], states, rows)
+            frame += 1
+
+        if isinstance(frames, np.memmap):
+            frames.flush()
+
+    def _read_index(self) -> list[tuple[float, int]]:
+        if len(self._data) < _HEADER.size + _FOOTER.size:
+            return list()
+
+        index_offset, count, magic = _FOOTER.unpack_from(self._data, len(self._data) - _FOOTER.size)
+        if magic != _INDEX_MAGIC or index_offset + count * _INDEX_ENTRY.size + _FOOTER.size != len(self._data):
+            return list()
+
+        self._records_end = index_offset
+        return [_INDEX_ENTRY.unpack_from(self._data, index_offset + i * _INDEX_ENTRY.size) for i in range(count)]
+
+    def _scan_index(self) -> list[tuple[float, int]]:
+        """
+        Also collects the universes of every record
+        """
+        index = list()
+        for offset, timestamp, number, is_keyframe, _ in self.records():
+            self._scanned_universes.add(number)
+            if is_keyframe and (not index or index[-1][0] != timestamp):
+                index.append((timestamp, offset))
+
+        return index
+
+    def _last_timestamp(self) -> float:
+        offset = self._index[-1][1] if self._index else None
+        timestamp = 0.0
+        for _, timestamp, _, _, _ in self.records(offset):
+            pass
+
+        return timestamp
+
+    @staticmethod
+    def _apply(states: dict[int, np.ndarray], number: int, runs: list[tuple[int, np.ndarray]]):
+        state = states.get(number)
+        if state is None:
+            state = states[number] = np.zeros(UNIVERSE_SIZE, dtype=np.uint8)
+
+        for start, values in runs:
+            state[start:start + len(values)] = values
+
+    @staticmethod
+    def _store(frame: np.ndarray, states: dict[int, np.ndarray], rows: dict[int, int]):
+        for number, state in states.items():
+            frame[rows[number]] = state
@@ -0,0 +1,109 @@
+import os
+import struct
+
+import numpy as np
+
+from ledboarddesktop.artnet.packet import UNIVERSE_SIZE
+
+
+class SequenceFileError(Exception):
+    pass
+
+
+class SequenceFile:
+    """
+    Raw DMX sequence, (frame count, universe count, 512) bytes memory-mapped after a small header
+    (frame rate and universe numbers), so frames are read from disk only when played.
+    """
+
+    magic = b"LBDMXSEQ"
+    version = 1
+    _header = struct.Struct("<8sHxxfII")  # magic, version, frame rate, frame count, universe count
+    _data_alignment = 64
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+
+        with open(filepath, "rb") as file:
+            header = file.read(self._header.size)
+            if len(header) < self._header.size:
+                raise SequenceFileError(f"{filepath} is not a DMX sequence")
+
+            magic, version, frame_rate, frame_count, universe_count = self._header.unpack(header)
+            if magic != self.magic:
+                raise SequenceFileError(f"{filepath} is not a DMX sequence")
+            if version > self.version:
+                raise SequenceFileError(f"{filepath} was saved by a newer version (format {version})")
+
+            self.frame_rate: float = frame_rate
+            universes = file.read(2 * universe_count)
+            if len(universes) < 2 * universe_count:
+                raise SequenceFileError(f"{filepath} is truncated")
+            self.universes: list[int] = list(struct.unpack(f"<{universe_count}H", universes))
+
+            file_size = file.seek(0, os.SEEK_END)
+
+        shape = (frame_count, universe_count, UNIVERSE_SIZE)
+        expected_size = self._data_offset(universe_count) + frame_count * universe_count * UNIVERSE_SIZE
+        if frame_count and universe_count and file_size < expected_size:
+            raise SequenceFileError(
+                f"{filepath} is truncated ({file_size} bytes, {frame_count} frames need {expected_size})"
+            )
+
+        if not frame_count or not universe_count:
+            self.frames: np.ndarray = np.zeros(shape, dtype=np.uint8)  # zero length files can't be mapped
+        else:
+            self.frames: np.ndarray = np.memmap(
+                filepath, dtype=np.uint8, mode="r", offset=self._data_offset(universe_count), shape=shape
+            )
+
+    @property
+    def frame_count(self) -> int:
+        return self.frames.shape[0]
+
+    @property
+    def duration(self) -> float:
+        return self.frame_count / self.frame_rate
+
+    @classmethod
+    def write(cls, filepath: str, frames: np.ndarray, universes: list[int], frame_rate: float):
+        """
+        frames is (frame count, universe count, 512), generated sequences can be written from a memmap too
+        """
+        frames = np.asarray(frames, dtype=np.uint8)
+        if frames.ndim != 3 or frames.shape[1:] != (len(universes), UNIVERSE_SIZE):
+            raise SequenceFileError(f"Frames must be (frame count, {len(universes)}, {UNIVERSE_SIZE}), got {frames.shape}")
+
+        with open(filepath, "wb") as file:
+            file.write(cls._make_header(frames.shape[0], universes, frame_rate))
+            for frame in frames:
+                file.write(frame.tobytes())
+
+    @classmethod
+    def create(cls, filepath: str, frame_count: int, universes: list[int], frame_rate: float) -> np.ndarray:
+        """
+        Creates a zeroed sequence and returns its writable (frame count, universe count, 512) memory map,
+        for sequences generated frame by frame
+        """
+        with open(filepath, "wb") as file:
+            file.write(cls._make_header(frame_count, universes, frame_rate))
+            file.truncate(cls._data_offset(len(universes)) + frame_count * len(universes) * UNIVERSE_SIZE)
+
+        if not frame_count or not universes:
+            return np.zeros((frame_count, len(universes), UNIVERSE_SIZE), dtype=np.uint8)
+
+        return np.memmap(
+            filepath, dtype=np.uint8, mode="r+", offset=cls._data_offset(len(universes)),
+            shape=(frame_count, len(universes), UNIVERSE_SIZE)
+        )
+
+    @classmethod
+    def _make_header(cls, frame_count: int, universes: list[int], frame_rate: float) -> bytes:
+        header = cls._header.pack(cls.magic, cls.version, frame_rate, frame_count, len(universes))
+        header += struct.pack(f"<{len(universes)}H", *universes)
+        return header.ljust(cls._data_offset(len(universes)), b"\x00")
+
+    @classmethod
+    def _data_offset(cls, universe_count: int) -> int:
+        size = cls._header.size + 2 * universe_count
+        return -(-size // cls._data_alignment) * cls._data_alignment
@@ -1,25 +1,37 @@
-from PySide6.QtWidgets import QWidget, QHBoxLayout
-
-from pythonartnet.broadcaster import ArtnetBroadcaster
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication, QWidget, QHBoxLayout, QVBoxLayout, QPushButton, QCheckBox, QSlider, QLabel, QFileDialog
 
 from pyside6helpers.slider import Slider
 
+from ledboarddesktop.artnet.player import ArtnetPlayer, PlaybackDrift
+from ledboarddesktop.artnet.recording import RecordingReader, RecordingError
+from ledboarddesktop.artnet.sequence_file import SequenceFile, SequenceFileError
+from ledboarddesktop.components import Components
+
 
 class ArtnetWidget(QWidget):
+    """
+    Manual channels and sequence playback, both only write into the shared universe buffers,
+    Components().artnet_output sends them.
+
+    What is sent can be recorded, opening a recording converts it to a sequence next to it first
+    """
+
+    sequence_file_filter = "DMX sequences (*.dmxseq);;DMX recordings (*.dmxrec)"
+    recording_file_filter = "DMX recordings (*.dmxrec)"
 
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        target_ip = "192.168.20.12"
-        universe_number = 0
+        self._target_ip = target_ip = Components().settings.artnet_target_ip
+        self._universe_number = Components().settings.artnet_universe
 
-        self._artnet = ArtnetBroadcaster(target_ip)
-        self._artnet.add_universe(universe_number)
+        Components().artnet_output.add_universe(self._universe_number, target_ip)
 
-        QApplication.instance().setApplicationName(f"Artnet mini - {target_ip} universe {universe_number}")
+        QApplication.instance().setApplicationName(f"Artnet mini - {target_ip} universe {self._universe_number}")
 
         self._sliders: list[Slider] = []
-        layout = QHBoxLayout(self)
+        sliders_layout = QHBoxLayout()
 
         for i in range(8):
             new_slider = Slider(
@@ -29,21 +41,139 @@ class ArtnetWidget(QWidget):
                 is_vertical=True
             )
             self._sliders.append(new_slider)
-            layout.addWidget(new_slider)
+            sliders_layout.addWidget(new_slider)
+
+        #
+        # Playback
+        self._player = ArtnetPlayer(Components().artnet_output)
+        self._player.positionChanged.connect(self._player_position_changed)
+        self._player.driftReported.connect(self._player_drift_reported)
+        self._player.finished.connect(self._player_finished)
+        self._player.start()
+
+        self.button_open = QPushButton("Open sequence...")
+        self.button_open.clicked.connect(self._open_clicked)
+
+        self.button_play = QPushButton("Play")
+        self.button_play.setCheckable(True)
+        self.button_play.setEnabled(False)
+        self.button_play.toggled.connect(self._play_toggled)
+
+        self.checkbox_loop = QCheckBox("Loop")
+        self.checkbox_loop.toggled.connect(self._loop_toggled)
+
+        self.slider_position = QSlider(Qt.Orientation.Horizontal)
+        self.slider_position.setEnabled(False)
+        self.slider_position.sliderMoved.connect(self._player.seek)
+
+        self.button_record = QPushButton("Record...")
+        self.button_record.setCheckable(True)
+        self.button_record.toggled.connect(self._record_toggled)
+
+        self.label_playback = QLabel("No sequence")
+
+        playback_layout = QHBoxLayout()
+        playback_layout.addWidget(self.button_open)
+        playback_layout.addWidget(self.button_play)
+        playback_layout.addWidget(self.checkbox_loop)
+        playback_layout.addWidget(self.slider_position, stretch=1)
+        playback_layout.addWidget(self.button_record)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(sliders_layout)
+        layout.addLayout(playback_layout)
+        layout.addWidget(self.label_playback)
+
+    def stop(self):
+        self._player.stop()
 
     def _on_slider_value_changed(self, idx: int, value: int):
-        self._artnet.universes[0].buffer[idx] = value
-        self._artnet.send_data()
+        Components().artnet_output.write(self._universe_number, idx, bytes([value]))
+
+    def _open_clicked(self):
+        filepath, _ = QFileDialog.getOpenFileName(self, "Open sequence", "", self.sequence_file_filter)
+        if not filepath:
+            return
+
+        try:
+            if filepath.endswith(".dmxrec"):
+                filepath = self._convert_recording(filepath)
+            sequence = SequenceFile(filepath)
+        except (SequenceFileError, RecordingError, OSError) as e:
+            self.label_playback.setText(str(e))
+            return
+
+        for universe_number in sequence.universes:
+            Components().artnet_output.add_universe(universe_number, self._target_ip)
+
+        self.button_play.setChecked(False)
+        self._player.load(sequence)
+
+        self.button_play.setEnabled(bool(sequence.frame_count))
+        self.slider_position.setEnabled(bool(sequence.frame_count))
+        self.slider_position.setRange(0, max(0, sequence.frame_count - 1))
+        self.label_playback.setText(
+            f"{sequence.frame_count} frames at {sequence.frame_rate:g} fps, universes {sequence.universes}"
+        )
+
+    @staticmethod
+    def _convert_recording(filepath: str) -> str:
+        sequence_filepath = filepath[:-len(".dmxrec")] + ".dmxseq"
+        recording = RecordingReader(filepath)
+        recording.write_sequence(sequence_filepath, 1000 / Components().artnet_output.interval)
+        recording.close()
+        return sequence_filepath
+
+    def _record_toggled(self, is_checked: bool):
+        if not is_checked:
+            Components().artnet_output.stop_recording()
+            self.button_record.setText("Record...")
+            return
+
+        filepath, _ = QFileDialog.getSaveFileName(self, "Record to", "", self.recording_file_filter)
+        if not filepath:
+            self.button_record.setChecked(False)
+            return
+
+        Components().artnet_output.start_recording(filepath)
+        self.button_record.setText("Stop recording")
+
+    def _play_toggled(self, is_checked: bool):
+        self.button_play.setText("Pause" if is_checked else "Play")
+        if is_checked:
+            self._player.play()
+        else:
+            self._player.pause()
+
+    def _loop_toggled(self, is_checked: bool):
+        self._player.is_looping = is_checked
+
+    def _player_position_changed(self, frame: int):
+        if not self.slider_position.isSliderDown():
+            self.slider_position.setValue(frame)
+
+    def _player_drift_reported(self, drift: PlaybackDrift):
+        self.label_playback.setText(
+            f"Drift {drift.mean * 1000:.2f} ms (max {drift.max * 1000:.2f} ms), {drift.dropped} frames dropped"
+        )
+
+    def _player_finished(self):
+        self.button_play.setChecked(False)
 
 
 if __name__ == "__main__":
     import sys
-    from PySide6.QtWidgets import QApplication
+
+    Components().settings.load()
+    Components().artnet_output.set_refresh_rate(Components().settings.artnet_refresh_rate)
 
     app = QApplication(sys.argv)
     app.setOrganizationName("Frangitron")
 
     w = ArtnetWidget()
+    app.aboutToQuit.connect(w.stop)
+    app.aboutToQuit.connect(Components().artnet_output.stop)
     w.resize(300, 300)
     w.show()
+    Components().artnet_output.start()
     sys.exit(app.exec())
@@ -48,16 +48,42 @@ class BoardListItemWidget(QWidget):
         self.button_upload_firmware.setEnabled(self.board.available)
         self.button_upload_points.setEnabled(self.board.available)
 
-        if self.board.available:
-            self.label.setText(f"{self.board.serial_port_name} - {self.board.hardware_info.name}")
-        else:
+        self._update_label()
+
+    def set_port_busy(self):
+        """
+        A request gave up waiting for the port (leased by another operation), shown until the next request
+        """
+        self.setEnabled(True)
+        self._update_label("Port busy, retry later")
+
+    def set_operation_failed(self, error: str):
+        """
+        A reboot or firmware upload failed, shown until the next request
+        """
+        self.setEnabled(True)
+        self._update_label(f"Failed: {error}")
+        self.label.setToolTip(error)
+
+    def _update_label(self, status: str = ""):
+        self.label.setToolTip("")
+        if not self.board.available:
             self.label.setText(f"{self.board.serial_port_name} - Occupied")
+            return
+
+        text = f"{self.board.serial_port_name} - {self.board.hardware_info.name}"
+        self.label.setText(f"{text} - {status}" if status else text)
 
     def _reboot(self):
+        self._update_label()
         self.setEnabled(False)
         Components().board_communicator.request_board_reboot(self.board)
 
     def _upload_firmware(self):
+        if not Components().settings.firmware_filepath:
+            self._update_label("Select a firmware file first")
+            return
+
         response = QMessageBox.warning(
             self,
             "Firmware upload",
@@ -66,6 +92,7 @@ class BoardListItemWidget(QWidget):
             QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.Cancel
         )
         if response == QMessageBox.StandardButton.Ok:
+            self._update_label()
             self.setEnabled(False)
             Components().board_communicator.request_firmware_upload(
                 self.board,
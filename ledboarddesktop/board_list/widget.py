@@ -1,6 +1,8 @@
+from bisect import bisect_left
+
 from PySide6.QtCore import Slot, Qt
 from PySide6.QtGui import QMouseEvent
-from PySide6.QtWidgets import QListWidgetItem, QListWidget
+from PySide6.QtWidgets import QListWidgetItem, QListWidget, QAbstractItemView
 
 from ledboardlib import ListedBoard
 
@@ -12,28 +14,37 @@ class BoardListWidget(QListWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        self._widgets: list[BoardListItemWidget] = []
+        self._items: dict[str, QListWidgetItem] = dict()
+        self._sorted_ports: list[str] = list()  # Rows are kept sorted by port name, this list mirrors that order
+        self._widgets: dict[str, BoardListItemWidget] = dict()
 
         board_communicator = Components().board_communicator
+        # boardChanged covers availability changes and refreshes, boardsChanged (same changes, batched) isn't needed
         board_communicator.boardChanged.connect(self._board_changed)
         board_communicator.boardDetailsAcquired.connect(self._enable_and_focus)
         board_communicator.boardDetailsAcquisitionFailed.connect(self._enable_and_focus)
         board_communicator.boardDetailsRequested.connect(self._enable_and_focus)
+        board_communicator.boardPortBusy.connect(self._board_port_busy)
         board_communicator.boardRebooted.connect(self._board_rebooted)
-        board_communicator.boardsListed.connect(self.set_boards)
+        board_communicator.boardsAdded.connect(self.add_boards)
+        board_communicator.boardsRemoved.connect(self.remove_boards)
+        board_communicator.operationFailed.connect(self._operation_failed)
 
         self.setMinimumWidth(300)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
 
     def board_widget(self, board: ListedBoard) -> BoardListItemWidget | None:
-        for widget in self._widgets:
-            if widget.board.serial_port_name == board.serial_port_name:
-                return widget
+        return self._widgets.get(board.serial_port_name)
 
-        return None
+    def boards(self) -> list[ListedBoard]:
+        return [self._widgets[port].board for port in self._sorted_ports]
 
     def selected_board(self) -> ListedBoard:
         return self.itemWidget(self.selectedItems()[0]).board if self.selectedItems() else None
 
+    def selected_boards(self) -> list[ListedBoard]:
+        return [self.itemWidget(item).board for item in self.selectedItems()]
+
     def mousePressEvent(self, event: QMouseEvent):
         item_at_pos = self.itemAt(event.pos())
         if not item_at_pos:
@@ -42,30 +53,62 @@ class BoardListWidget(QListWidget):
 
     @Slot(list)
     def set_boards(self, boards: list[ListedBoard]):
-        selected_board = self.selected_board()
+        ports = {board.serial_port_name for board in boards}
+        changed = [board for board in boards if board.serial_port_name in self._items]
+        self.remove_boards([port for port in self._items if port not in ports])
+        self.add_boards([board for board in boards if board.serial_port_name not in self._items])
+        self._boards_changed(changed)
 
+    @Slot(list)
+    def add_boards(self, boards: list[ListedBoard]):
         self.setUpdatesEnabled(False)
-        self.blockSignals(True)
-
-        self.clear()
-        self._widgets.clear()
 
         for board in boards:
+            if board.serial_port_name in self._items:
+                self._widgets[board.serial_port_name].set_board(board)
+                continue
+
+            row = bisect_left(self._sorted_ports, board.serial_port_name)
+
             widget = BoardListItemWidget(board)
             item = QListWidgetItem()
             item.setSizeHint(widget.sizeHint())
-            self.addItem(item)
+            self.insertItem(row, item)
             self.setItemWidget(item, widget)
-            is_selected = board.serial_port_name == selected_board.serial_port_name if selected_board else False
-            item.setSelected(is_selected)
-            self._widgets.append(widget)
+            self._items[board.serial_port_name] = item
+            self._sorted_ports.insert(row, board.serial_port_name)
+            self._widgets[board.serial_port_name] = widget
+
+        self.setUpdatesEnabled(True)
+
+    @Slot(list)
+    def remove_boards(self, serial_port_names: list[str]):
+        had_selection = bool(self.selectedItems())
+
+        self.setUpdatesEnabled(False)
+        self.blockSignals(True)
+
+        for serial_port_name in serial_port_names:
+            item = self._items.pop(serial_port_name, None)
+            if item is None:
+                continue
+
+            self._widgets.pop(serial_port_name)
+            self._sorted_ports.pop(bisect_left(self._sorted_ports, serial_port_name))
+            self.removeItemWidget(item)
+            self.takeItem(self.row(item))
 
         self.blockSignals(False)
         self.setUpdatesEnabled(True)
 
-        if selected_board and not self.selectedItems():
+        if had_selection and not self.selectedItems():
             self.itemSelectionChanged.emit()
 
+    @Slot(list)
+    def _boards_changed(self, boards: list[ListedBoard]):
+        for board in boards:
+            self._board_changed(board)
+
     @Slot(ListedBoard)
     def _board_changed(self, board: ListedBoard):
         board_widget = self.board_widget(board)
@@ -82,6 +125,18 @@ class BoardListWidget(QListWidget):
         if board_widget is not None:
             board_widget.setEnabled(True)
 
+    @Slot(ListedBoard)
+    def _board_port_busy(self, board: ListedBoard):
+        board_widget = self.board_widget(board)
+        if board_widget is not None:
+            board_widget.set_port_busy()
+
+    @Slot(ListedBoard, str)
+    def _operation_failed(self, board: ListedBoard, error: str):
+        board_widget = self.board_widget(board)
+        if board_widget is not None:
+            board_widget.set_operation_failed(error)
+
     @Slot()
     def _enable_and_focus(self):
         self.setEnabled(True)
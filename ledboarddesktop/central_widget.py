@@ -7,6 +7,7 @@ from ledboarddesktop.board_list.widget import BoardListWidget
 from ledboarddesktop.components import Components
 from ledboarddesktop.control_parameters.widget import ControlParametersWidget
 from ledboarddesktop.firmware_selector_widget import FirmwareSelectorWidget
+from ledboarddesktop.project.widget import ProjectWidget
 from ledboarddesktop.scan.widget import ScanWidget
 
 
@@ -46,7 +47,7 @@ class CentralWidget(QWidget):
             "Control Parameters",
             [self.control_parameters_widget],
             with_checkbox=True),
-            0, 1, 3, 1
+            0, 1, 4, 1
         )
 
         self.scan_widget = ScanWidget()
@@ -54,7 +55,15 @@ class CentralWidget(QWidget):
             "Scan",
             [self.scan_widget],
             with_checkbox=True),
-            0, 2, 3, 1
+            0, 2, 4, 1
+        )
+
+        self.project_widget = ProjectWidget(self.scan_widget.viewport)
+        layout.addWidget(make_group(
+            "Project",
+            [self.project_widget],
+            fixed_width=400),
+            3, 0
         )
 
         #layout.setColumnStretch(1, 50)
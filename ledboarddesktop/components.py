@@ -3,6 +3,7 @@ from pythonhelpers.singleton_metaclass import SingletonMetaclass
 from ledboardlib.scan.detection_executor import DetectionExecutor
 from ledboardlib.scan.detector_options import DetectorOptions
 
+from ledboarddesktop.artnet.output_engine import ArtnetOutputEngine
 from ledboarddesktop.settings import Settings
 from ledboarddesktop.threaded_board_communication.threaded_board_communicator import ThreadedBoardCommunicator
 
@@ -10,6 +11,8 @@ from ledboarddesktop.threaded_board_communication.threaded_board_communicator im
 class Components(metaclass=SingletonMetaclass):
     def __init__(self):
         self.board_list_widget = None
+        self.project = None
+        self.artnet_output = ArtnetOutputEngine()
         self.board_communicator = ThreadedBoardCommunicator()
         self.settings = Settings()
         # FIXME move DetectorOptions to Settings
@@ -0,0 +1,113 @@
+import time
+from dataclasses import fields, replace
+
+from PySide6.QtCore import QObject, Signal, QTimer, Qt
+
+from ledboardlib import ListedBoard, ControlParameters
+
+from ledboarddesktop.components import Components
+
+
+def interpolated_fields(source: ControlParameters, target: ControlParameters) -> list[str]:
+    """
+    Numeric fields that differ, flags, triggers, enums and LED selections are not interpolated
+    """
+    return [
+        field.name for field in fields(ControlParameters)
+        if field.name not in ControlParametersCrossFader.discrete_fields
+        and type(getattr(source, field.name)) in (int, float)
+        and type(getattr(target, field.name)) in (int, float)
+        and getattr(source, field.name) != getattr(target, field.name)
+    ]
+
+
+class ControlParametersCrossFader(QObject):
+    """
+    Fades a board's control parameters from source to target in duration seconds, at frame_rate.
+
+    Numeric fields are interpolated linearly, the other fields switch to their target value at the start.
+    Every frame goes through board_communicator.set_control_parameters, whose per board stream merges
+    the frames the serial link can't keep up with, so the last frame always reaches the board.
+    """
+
+    finished = Signal()
+    progressChanged = Signal(float)
+
+    frame_rate = 30  # Hz
+    discrete_fields = {
+        "are_colors_inverted", "dmx_enabled", "is_noise_on", "runner_trigger",
+        "single_led", "single_led_brightness", "strand_mask",
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.is_running = False
+
+        self._board: ListedBoard | None = None
+        self._source: ControlParameters | None = None
+        self._target: ControlParameters | None = None
+        self._fields: list[str] = list()
+        self._duration = 0.0
+        self._start_time = 0.0
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(int(1000 / self.frame_rate))
+        self._timer.timeout.connect(self._step)
+
+    @property
+    def target(self) -> ControlParameters | None:
+        return self._target
+
+    def start(self, board: ListedBoard, source: ControlParameters, target: ControlParameters, duration: float):
+        self.stop()
+
+        self._board = board
+        self._target = target
+        self._fields = interpolated_fields(source, target)
+        self._source = replace(target, **{name: getattr(source, name) for name in self._fields})
+        self._duration = duration
+        self._start_time = time.monotonic()
+        self.is_running = True
+
+        if duration <= 0 or not self._fields:
+            self._finish()
+            return
+
+        self._send(self._source)
+        self._timer.start()
+
+    def stop(self):
+        """
+        Leaves the board at the last sent frame
+        """
+        self._timer.stop()
+        self.is_running = False
+
+    def _step(self):
+        progress = min(1.0, (time.monotonic() - self._start_time) / self._duration)
+        if progress >= 1.0:
+            self._finish()
+            return
+
+        self._send(replace(self._source, **{
+            name: self._interpolate(getattr(self._source, name), getattr(self._target, name), progress)
+            for name in self._fields
+        }))
+        self.progressChanged.emit(progress)
+
+    def _finish(self):
+        self._timer.stop()
+        self._send(self._target)
+        self.is_running = False
+        self.progressChanged.emit(1.0)
+        self.finished.emit()
+
+    def _send(self, parameters: ControlParameters):
+        Components().board_communicator.set_control_parameters(self._board, parameters)
+
+    @staticmethod
+    def _interpolate(source, target, progress: float):
+        value = source + (target - source) * progress
+        return round(value) if type(source) is int else value
@@ -0,0 +1,118 @@
+import copy
+import json
+import os
+import re
+
+from ledboardlib import ControlParameters
+
+
+class PresetLibraryError(Exception):
+    pass
+
+
+class PresetLibrary:
+    """
+    Named control parameters snapshots, one JSON file per preset and an index.json listing them.
+
+    The index is read once, presets are read on first recall and kept in memory, so recalling again
+    doesn't touch the disk. Files are written to a temporary file first, then renamed over the previous one.
+    Presets are stored with the ControlParameters dataclass_json schema, a malformed preset only fails its own recall.
+    An unreadable index is rebuilt from the preset files found, named after their filename.
+    """
+
+    index_filename = "index.json"
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self._filenames: dict[str, str] = dict()  # preset name: filename
+        self._cache: dict[str, ControlParameters] = dict()
+
+        index_filepath = os.path.join(folder, self.index_filename)
+        if os.path.exists(index_filepath):
+            try:
+                with open(index_filepath, "r") as file:
+                    self._filenames = {
+                        str(name): filename
+                        for name, filename in dict(json.load(file)["presets"]).items()
+                        if isinstance(filename, str)
+                    }
+            except (OSError, ValueError, KeyError, TypeError):
+                self._filenames = self._scan_folder()
+
+    def names(self) -> list[str]:
+        return sorted(self._filenames, key=str.lower)
+
+    def load(self, name: str) -> ControlParameters:
+        if name not in self._filenames:
+            raise PresetLibraryError(f"No preset named {name}")
+
+        if name not in self._cache:
+            filepath = os.path.join(self.folder, self._filenames[name])
+            try:
+                with open(filepath, "r") as file:
+                    self._cache[name] = ControlParameters.from_dict(json.load(file))
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                raise PresetLibraryError(f"Cannot read preset {name} ({e})")
+
+        return copy.copy(self._cache[name])
+
+    def save(self, name: str, parameters: ControlParameters):
+        """
+        Creates or replaces the preset
+        """
+        os.makedirs(self.folder, exist_ok=True)
+
+        filename = self._filenames.get(name) or self._new_filename(name)
+        self._write(filename, parameters.to_dict(encode_json=True))
+        self._cache[name] = copy.copy(parameters)
+
+        if name not in self._filenames:
+            self._filenames[name] = filename
+            self._write_index()
+
+    def remove(self, name: str):
+        filename = self._filenames.pop(name, None)
+        if filename is None:
+            return
+
+        self._cache.pop(name, None)
+        self._write_index()
+        try:
+            os.remove(os.path.join(self.folder, filename))
+        except OSError:
+            pass  # Not listed anymore
+
+    def _scan_folder(self) -> dict[str, str]:
+        try:
+            filenames = os.listdir(self.folder)
+        except OSError:
+            return dict()
+
+        return {
+            filename[:-len(".json")]: filename
+            for filename in filenames
+            if filename.endswith(".json") and filename != self.index_filename
+        }
+
+    def _new_filename(self, name: str) -> str:
+        stem = re.sub(r"[^a-zA-Z0-9_-]+", "-", name).strip("-").lower() or "preset"
+        used = set(self._filenames.values())
+        filename = f"{stem}.json"
+        suffix = 1
+        while filename in used or filename == self.index_filename:
+            suffix += 1
+            filename = f"{stem}-{suffix}.json"
+
+        return filename
+
+    def _write_index(self):
+        self._write(self.index_filename, {"presets": self._filenames})
+
+    def _write(self, filename: str, content: dict):
+        filepath = os.path.join(self.folder, filename)
+        try:
+            with open(filepath + ".tmp", "w") as file:
+                json.dump(content, file, indent=2)
+            os.replace(filepath + ".tmp", filepath)
+        except OSError as e:
+            raise PresetLibraryError(f"Cannot write {filepath} ({e})")
@@ -1,23 +1,24 @@
-import os.path
-
 from PySide6.QtCore import Slot
-from PySide6.QtWidgets import QWidget, QLabel, QGridLayout, QPushButton, QScrollArea
+from PySide6.QtWidgets import QWidget, QLabel, QGridLayout, QPushButton, QScrollArea, QComboBox, QInputDialog
 
 from pyside6helpers import icons, resources
 from pyside6helpers.annotated_form import AnnotatedFormWidget
 from pyside6helpers.message_box import confirmation_box
+from pyside6helpers.spinbox import SpinBox
 
 from ledboardlib import ListedBoard, ControlParameters, InteropDataStore
 
 from ledboarddesktop.components import Components
 from ledboarddesktop.control_parameters.annotated_dataclass import UiControlParameters
+from ledboarddesktop.control_parameters.cross_fader import ControlParametersCrossFader
+from ledboarddesktop.control_parameters.preset_library import PresetLibrary, PresetLibraryError
 from ledboarddesktop.control_parameters.widget_maker import make_control_parameter_widget
+from ledboarddesktop.interop import interop_filepath
+from ledboarddesktop.project.project_file import ProjectFileError
 
 
 class ControlParametersWidget(QWidget):
 
-    _interop_filepath = "C:/Users/Ourson/PROJETS/ledboard/ledboard-translator-emulator/ledboardtranslatoremulator/resources/interop-data-elephanz.json"
-
     def __init__(self, parent=None):
         super().__init__(parent)
 
@@ -40,6 +41,30 @@ class ControlParametersWidget(QWidget):
         self._button_restore_from_emulator = QPushButton("Restore from emulator default values")
         self._button_restore_from_emulator.setIcon(icons.login())
         self._button_restore_from_emulator.clicked.connect(self._restore_defaults_from_emulator)
+
+        self._button_restore_from_project = QPushButton("Restore from project")
+        self._button_restore_from_project.setIcon(icons.login())
+        self._button_restore_from_project.clicked.connect(self._restore_from_project)
+
+        #
+        # Presets
+        self._presets = PresetLibrary(Components().settings.control_parameters_presets_folder)
+        self._cross_fader = ControlParametersCrossFader(self)
+        self._cross_fader.finished.connect(self._cross_fade_finished)
+
+        self._combo_presets = QComboBox()
+        self._combo_presets.addItems(self._presets.names())
+
+        self._fade_time = SpinBox(name="Fade time (ms)", minimum=0, maximum=60000, value=1000)
+
+        self._button_recall_preset = QPushButton("Recall preset")
+        self._button_recall_preset.setIcon(icons.login())
+        self._button_recall_preset.clicked.connect(self._recall_preset)
+
+        self._button_save_preset = QPushButton("Save as preset...")
+        self._button_save_preset.setIcon(icons.diskette())
+        self._button_save_preset.clicked.connect(self._save_preset)
+
         self._scroll_area = QScrollArea()
         self._scroll_area.setWidgetResizable(True)
 
@@ -50,6 +75,11 @@ class ControlParametersWidget(QWidget):
         self._layout.addWidget(self._button_save_to_board_defaults, 2, 0)
         self._layout.addWidget(self._button_save_to_emulator, 2, 1)
         self._layout.addWidget(self._button_restore_from_emulator, 2, 2)
+        self._layout.addWidget(self._button_restore_from_project, 3, 2)
+        self._layout.addWidget(self._combo_presets, 4, 0)
+        self._layout.addWidget(self._fade_time, 4, 1)
+        self._layout.addWidget(self._button_recall_preset, 4, 2)
+        self._layout.addWidget(self._button_save_preset, 5, 2)
 
         Components().board_communicator.boardControlParametersAcquired.connect(self.control_parameters_acquired)
 
@@ -62,6 +92,7 @@ class ControlParametersWidget(QWidget):
             self._form = None
 
     def set_board(self, board: ListedBoard | None):
+        self._cross_fader.stop()
         self.clear()
 
         self._selected_board = board
@@ -74,7 +105,11 @@ class ControlParametersWidget(QWidget):
         if self._form is None:
             return
 
-        interop_store = InteropDataStore(self._interop_filepath)
+        filepath = interop_filepath(self)
+        if not filepath:
+            return
+
+        interop_store = InteropDataStore(filepath)
         interop_store.data.default_control_parameters = self._form.value()
         interop_store.save()
 
@@ -89,22 +124,79 @@ class ControlParametersWidget(QWidget):
         ]):
             return
 
+        filepath = interop_filepath(self)
+        if not filepath:
+            return
 
-        interop_store = InteropDataStore(self._interop_filepath)
+        interop_store = InteropDataStore(filepath)
         interop_data = interop_store.data
         if interop_data.default_control_parameters is None:
             self._label.setText("No default values stored in emulator data")
         else:
             self.control_parameters_acquired(interop_data.default_control_parameters)
 
+    def _restore_from_project(self):
+        if self._form is None or Components().project is None or not self._selected_board.available:
+            return
+
+        try:
+            parameters = Components().project.load_control_parameters(self._selected_board.hardware_info.name)
+        except ProjectFileError as e:
+            self._label.setText(str(e))
+            self._label.setVisible(True)
+            return
+
+        if parameters is None:
+            self._label.setText("No values stored in project for this board")
+            self._label.setVisible(True)
+            return
+
+        self.control_parameters_acquired(parameters)
+        Components().board_communicator.set_control_parameters(self._selected_board, parameters)
+
+    def _recall_preset(self):
+        name = self._combo_presets.currentText()
+        if self._form is None or not name:
+            return
+
+        try:
+            parameters = self._presets.load(name)
+        except PresetLibraryError as e:
+            self._label.setText(str(e))
+            self._label.setVisible(True)
+            return
+
+        self._form.setEnabled(False)
+        self._cross_fader.start(self._selected_board, self._form.value(), parameters, self._fade_time.value() / 1000)
+
+    def _cross_fade_finished(self):
+        self.control_parameters_acquired(self._cross_fader.target)
+
+    def _save_preset(self):
+        if self._form is None:
+            return
+
+        name, is_accepted = QInputDialog.getText(self, "Save preset", "Preset name", text=self._combo_presets.currentText())
+        if not is_accepted or not name:
+            return
+
+        try:
+            self._presets.save(name, self._form.value())
+        except PresetLibraryError as e:
+            self._label.setText(str(e))
+            self._label.setVisible(True)
+            return
+
+        self._combo_presets.clear()
+        self._combo_presets.addItems(self._presets.names())
+        self._combo_presets.setCurrentText(name)
+
+    def _form_value_changed(self, parameters: ControlParameters):
+        Components().board_communicator.set_control_parameters(self._selected_board, parameters)
+
     @Slot(ControlParameters)
     def control_parameters_acquired(self, parameters: ControlParameters):
         self._form = make_control_parameter_widget(parameters)
-        self._form.valueChanged.connect(
-            lambda parameters_ : Components().board_communicator.set_control_parameters(
-                self._selected_board,
-                parameters_
-            )
-        )
+        self._form.valueChanged.connect(self._form_value_changed)
         self._scroll_area.setWidget(self._form)
         self._label.setVisible(False)
@@ -1,4 +1,6 @@
-from PySide6.QtWidgets import QWidget, QGridLayout, QLineEdit, QLabel, QPushButton, QFileDialog
+from PySide6.QtWidgets import QWidget, QGridLayout, QLineEdit, QLabel, QPushButton, QFileDialog, QMessageBox
+
+from pyside6helpers import icons
 
 from ledboarddesktop.components import Components
 
@@ -23,6 +25,22 @@ class FirmwareSelectorWidget(QWidget):
         self.button_browse.clicked.connect(self._browse)
         layout.addWidget(self.button_browse, 0, 2)
 
+        self.button_upload_selected = QPushButton("Upload to selected boards")
+        self.button_upload_selected.setIcon(icons.upload())
+        self.button_upload_selected.clicked.connect(self._upload_to_selected)
+        layout.addWidget(self.button_upload_selected, 1, 0, 1, 3)
+
+        self.label_batch = QLabel()
+        layout.addWidget(self.label_batch, 2, 0, 1, 3)
+
+        self._batch_id: int | None = None
+        self._batch_board_count = 0
+        self._batch_done_count = 0
+
+        board_communicator = Components().board_communicator
+        board_communicator.batchProgress.connect(self._batch_progress)
+        board_communicator.batchFinished.connect(self._batch_finished)
+
     def filepath(self) -> str:
         return self.lineedit_filepath.text()
 
@@ -41,3 +59,48 @@ class FirmwareSelectorWidget(QWidget):
         )
         if filepath:
             self.set_filepath(filepath)
+
+    def _upload_to_selected(self):
+        boards = Components().board_list_widget.selected_boards()
+        if not boards:
+            return
+
+        if not self.filepath():
+            self.label_batch.setText("Select a firmware file first")
+            return
+
+        response = QMessageBox.warning(
+            self,
+            "Firmware upload",
+            f"Are you sure you want to upload {self.filepath()} "
+            f"to {', '.join(board.serial_port_name for board in boards)} ?",
+            QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.Cancel
+        )
+        if response != QMessageBox.StandardButton.Ok:
+            return
+
+        self.button_upload_selected.setEnabled(False)
+        self._batch_board_count = len(boards)
+        self._batch_done_count = 0
+        self.label_batch.setText(f"Uploading 0/{self._batch_board_count}...")
+        self._batch_id = Components().board_communicator.batch_firmware_upload(boards, self.filepath())
+
+    def _batch_progress(self, batch_id: int, board, error: str):
+        if batch_id != self._batch_id:
+            return
+
+        self._batch_done_count += 1
+        self.label_batch.setText(f"Uploading {self._batch_done_count}/{self._batch_board_count}...")
+
+    def _batch_finished(self, batch_id: int, results: dict):
+        if batch_id != self._batch_id:
+            return
+
+        self._batch_id = None
+        self.button_upload_selected.setEnabled(True)
+
+        failed = {port: error for port, error in results.items() if error}
+        if failed:
+            self.label_batch.setText("\n".join(f"{port}: {error}" for port, error in failed.items()))
+        else:
+            self.label_batch.setText(f"Uploaded to {len(results)} board(s)")
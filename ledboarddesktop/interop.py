@@ -0,0 +1,15 @@
+from PySide6.QtWidgets import QFileDialog, QWidget
+
+from ledboarddesktop.components import Components
+
+
+def interop_filepath(parent: QWidget) -> str:
+    """
+    Interop data file from the settings, asked once if not set. Empty if the user cancelled
+    """
+    settings = Components().settings
+    if not settings.interop_filepath:
+        filepath, _ = QFileDialog.getOpenFileName(parent, "Select interop data file", "", "JSON files (*.json)")
+        settings.interop_filepath = filepath
+
+    return settings.interop_filepath
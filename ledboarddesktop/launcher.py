@@ -14,6 +14,8 @@ from ledboarddesktop.components import Components
 class Launcher:
     def __init__(self):
         Components().settings.load()
+        Components().board_communicator.control_parameters_max_rate = Components().settings.control_parameters_max_rate
+        Components().artnet_output.set_refresh_rate(Components().settings.artnet_refresh_rate)
 
         self._app = QApplication([])
         self._app.setApplicationName("LEDBoard")
@@ -28,11 +30,13 @@ class Launcher:
         self._central_widget = CentralWidget()
         self._main_window.setCentralWidget(self._central_widget)
 
+        self._app.aboutToQuit.connect(Components().artnet_output.stop)
         self._app.aboutToQuit.connect(Components().board_communicator.stop)
         self._app.aboutToQuit.connect(Components().settings.save)
         self._app.aboutToQuit.connect(Components().scan_detection.stop)
 
     def run(self):
         self._main_window.show()
+        Components().artnet_output.start()
         Components().board_communicator.start()
         self._app.exec()
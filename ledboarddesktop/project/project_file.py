@@ -0,0 +1,179 @@
+import sqlite3
+from contextlib import contextmanager
+
+import numpy as np
+
+from ledboardlib import ControlParameters
+
+
+class ProjectFileError(Exception):
+    pass
+
+
+class ProjectFile:
+    """
+    SQLite project container: scan points, mask polygons and per-board control parameters.
+
+    Points are stored as packed arrays (the detection point cloud arrays), cut in chunks of
+    chunk_size rows so saving only rewrites the chunks holding edited rows. Nothing is read when
+    opening, each part is loaded when asked for. Control parameters are stored with their dataclass_json schema.
+
+    The schema version is SQLite's user_version. SQLite errors (locked or corrupted file, full disk...)
+    are raised as ProjectFileError.
+    """
+
+    version = 1
+    chunk_size = 4096
+
+    point_arrays = {
+        "leds": (np.int64, ()),
+        "positions": (np.float64, (2,)),
+        "segments": (np.int8, ()),
+        "is_deleted": (np.bool_, ()),
+    }
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        try:
+            self._connection = sqlite3.connect(filepath)
+        except sqlite3.DatabaseError as e:
+            raise ProjectFileError(f"Cannot open {filepath} ({e})")
+
+        try:
+            file_version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            if file_version == 0:
+                self._create()
+        except sqlite3.DatabaseError as e:
+            self._connection.close()
+            raise ProjectFileError(f"{filepath} is not a project file ({e})")
+
+        if file_version > self.version:
+            self._connection.close()
+            raise ProjectFileError(f"{filepath} was saved by a newer version (format {file_version})")
+
+    def close(self):
+        self._connection.close()
+
+    #
+    # Points
+    def point_count(self) -> int:
+        with self._sqlite_errors("read points"):
+            row = self._connection.execute("SELECT value FROM properties WHERE key = 'point_count'").fetchone()
+            return 0 if row is None else int(row[0])
+
+    def load_points(self) -> dict[str, np.ndarray]:
+        with self._sqlite_errors("read points"):
+            count = self.point_count()
+            arrays = dict()
+            for name, (dtype, shape) in self.point_arrays.items():
+                array = np.zeros((count,) + shape, dtype=dtype)
+                chunks = self._connection.execute(
+                    "SELECT chunk, data FROM point_chunks WHERE array_name = ? ORDER BY chunk", (name,)
+                )
+                for chunk, data in chunks:
+                    values = np.frombuffer(data, dtype=dtype).reshape((-1,) + shape)
+                    start = chunk * self.chunk_size
+                    array[start:start + len(values)] = values[:max(0, count - start)]
+
+                arrays[name] = array
+
+            return arrays
+
+    def save_points(self, arrays: dict[str, np.ndarray], count: int, dirty_rows: np.ndarray | None = None):
+        """
+        Arrays may be allocated beyond count. Only chunks holding dirty rows are written, all of them if dirty_rows is None
+        """
+        chunk_count = -(-count // self.chunk_size)
+        if dirty_rows is None:
+            chunks = range(chunk_count)
+        else:
+            chunks = np.unique(np.asarray(dirty_rows) // self.chunk_size).tolist()
+
+        with self._sqlite_errors("save points"), self._connection:
+            for name, (dtype, _) in self.point_arrays.items():
+                for chunk in chunks:
+                    start = chunk * self.chunk_size
+                    values = np.ascontiguousarray(arrays[name][start:min(start + self.chunk_size, count)], dtype=dtype)
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO point_chunks (array_name, chunk, data) VALUES (?, ?, ?)",
+                        (name, chunk, values.tobytes())
+                    )
+
+            self._connection.execute("DELETE FROM point_chunks WHERE chunk >= ?", (chunk_count,))
+            self._set_property("point_count", count)
+
+    #
+    # Mask
+    def load_mask_polygons(self) -> list[tuple[bool, np.ndarray]]:
+        """
+        (is_exclusion, (N, 2) vertices) per polygon
+        """
+        with self._sqlite_errors("read mask"):
+            return [
+                (bool(is_exclusion), np.frombuffer(vertices, dtype=np.float64).reshape(-1, 2))
+                for is_exclusion, vertices in self._connection.execute(
+                    "SELECT is_exclusion, vertices FROM mask_polygons ORDER BY polygon"
+                )
+            ]
+
+    def save_mask_polygons(self, polygons: list[tuple[bool, np.ndarray]]):
+        with self._sqlite_errors("save mask"), self._connection:
+            self._connection.execute("DELETE FROM mask_polygons")
+            self._connection.executemany(
+                "INSERT INTO mask_polygons (polygon, is_exclusion, vertices) VALUES (?, ?, ?)",
+                [
+                    (index, int(is_exclusion), np.ascontiguousarray(vertices, dtype=np.float64).tobytes())
+                    for index, (is_exclusion, vertices) in enumerate(polygons)
+                ]
+            )
+
+    #
+    # Control parameters
+    def board_names(self) -> list[str]:
+        with self._sqlite_errors("read control parameters"):
+            return [row[0] for row in self._connection.execute("SELECT board FROM control_parameters ORDER BY board")]
+
+    def load_control_parameters(self, board_name: str) -> ControlParameters | None:
+        with self._sqlite_errors("read control parameters"):
+            row = self._connection.execute(
+                "SELECT parameters FROM control_parameters WHERE board = ?", (board_name,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        try:
+            return ControlParameters.from_json(row[0])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ProjectFileError(f"Cannot read control parameters of {board_name} ({e})")
+
+    def save_control_parameters(self, board_name: str, parameters: ControlParameters):
+        with self._sqlite_errors("save control parameters"), self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO control_parameters (board, parameters) VALUES (?, ?)",
+                (board_name, parameters.to_json())
+            )
+
+    #
+    # Private
+    def _create(self):
+        with self._connection:
+            self._connection.executescript("""
+                CREATE TABLE properties (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE point_chunks (
+                    array_name TEXT, chunk INTEGER, data BLOB,
+                    PRIMARY KEY (array_name, chunk)
+                );
+                CREATE TABLE mask_polygons (polygon INTEGER PRIMARY KEY, is_exclusion INTEGER, vertices BLOB);
+                CREATE TABLE control_parameters (board TEXT PRIMARY KEY, parameters TEXT);
+            """)
+            self._connection.execute(f"PRAGMA user_version = {self.version}")
+
+    @contextmanager
+    def _sqlite_errors(self, action: str):
+        try:
+            yield
+        except sqlite3.Error as e:
+            raise ProjectFileError(f"Cannot {action} in {self.filepath} ({e})")
+
+    def _set_property(self, key: str, value):
+        self._connection.execute("INSERT OR REPLACE INTO properties (key, value) VALUES (?, ?)", (key, str(value)))
@@ -0,0 +1,131 @@
+import os.path
+
+from PySide6.QtWidgets import QWidget, QGridLayout, QLabel, QPushButton, QFileDialog
+
+from pyside6helpers import icons
+
+from ledboarddesktop.components import Components
+from ledboarddesktop.project.project_file import ProjectFile, ProjectFileError
+from ledboarddesktop.scan.viewport.widget import ScanViewport
+
+
+class ProjectWidget(QWidget):
+    """
+    Opens and saves the project file, saving again only writes what changed since the last save.
+
+    Opening loads the points and mask into the scan viewport right away, control parameters are only read
+    when restored from the control parameters panel.
+    """
+
+    file_filter = "LED Board projects (*.ledproj)"
+
+    def __init__(self, scan_viewport: ScanViewport, parent=None):
+        super().__init__(parent)
+
+        self._scan_viewport = scan_viewport
+        self._is_full_save_needed = False
+
+        self.label = QLabel("No project")
+
+        self.button_open = QPushButton("Open...")
+        self.button_open.setIcon(icons.file())
+        self.button_open.clicked.connect(self._open_clicked)
+
+        self.button_save = QPushButton("Save")
+        self.button_save.setIcon(icons.diskette())
+        self.button_save.clicked.connect(self._save_clicked)
+
+        self.button_save_as = QPushButton("Save as...")
+        self.button_save_as.clicked.connect(self._save_as_clicked)
+
+        layout = QGridLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.label, 0, 0, 1, 3)
+        layout.addWidget(self.button_open, 1, 0)
+        layout.addWidget(self.button_save, 1, 1)
+        layout.addWidget(self.button_save_as, 1, 2)
+
+    def _open_clicked(self):
+        filepath, _ = QFileDialog.getOpenFileName(self, "Open project", "", self.file_filter)
+        if not filepath:
+            return
+
+        try:
+            project = ProjectFile(filepath)
+        except ProjectFileError as e:
+            self.label.setText(str(e))
+            return
+
+        try:
+            arrays = project.load_points()
+            mask_polygons = project.load_mask_polygons()
+        except ProjectFileError as e:
+            project.close()
+            self.label.setText(str(e))
+            return
+
+        self._set_project(project)
+        self._scan_viewport.set_detection_point_arrays(arrays)
+        self._scan_viewport.set_mask_polygons(mask_polygons)
+
+    def _save_clicked(self):
+        if Components().project is None:
+            self._save_as_clicked()
+            return
+
+        self._save(Components().project, is_new=False)
+
+    def _save_as_clicked(self):
+        filepath, _ = QFileDialog.getSaveFileName(self, "Save project", "", self.file_filter)
+        if not filepath:
+            return
+
+        if os.path.exists(filepath):
+            os.remove(filepath)  # The dialog asked for confirmation
+
+        try:
+            project = ProjectFile(filepath)
+        except ProjectFileError as e:
+            self.label.setText(str(e))
+            return
+
+        self._set_project(project)
+        self._save(project, is_new=True)
+
+    def _save(self, project: ProjectFile, is_new: bool):
+        """
+        Dirty rows are only cleared once saved, so the next save writes them again if this one fails
+        (every row if it was the first save of this file)
+        """
+        detection_points = self._scan_viewport.detection_points
+        board_communicator = Components().board_communicator
+        self._is_full_save_needed |= is_new
+        try:
+            dirty_rows = None if self._is_full_save_needed else detection_points.dirty_rows()
+            project.save_points(detection_points.arrays(), detection_points.count, dirty_rows)
+            detection_points.clear_dirty_rows()
+            self._is_full_save_needed = False
+
+            project.save_mask_polygons(self._scan_viewport.mask_polygons())
+
+            for board in Components().board_list_widget.boards():
+                if not board.available:
+                    continue
+
+                parameters = board_communicator.last_control_parameters(board)
+                if parameters is not None:
+                    project.save_control_parameters(board.hardware_info.name, parameters)
+
+        except ProjectFileError as e:
+            self.label.setText(f"Save failed: {e}")
+            return
+
+        self.label.setText(f"Saved {os.path.basename(project.filepath)}")
+
+    def _set_project(self, project: ProjectFile):
+        if Components().project is not None:
+            Components().project.close()
+
+        Components().project = project
+        self._is_full_save_needed = False
+        self.label.setText(os.path.basename(project.filepath))
@@ -0,0 +1,79 @@
+import numpy as np
+from PySide6.QtCore import QTimer
+
+from ledboarddesktop.artnet.output_engine import ArtnetOutputEngine
+from ledboarddesktop.artnet.packet import UNIVERSE_SIZE
+from ledboarddesktop.scan.led_pattern_emitter import LedPatternEmitter
+
+
+class ArtnetLedPatternEmitter(LedPatternEmitter):
+    """
+    Lights LED sets through the board's DMX input (dmx_enabled), no serial round-trip per pattern.
+
+    LED i uses channels_per_led consecutive channels, from universe first_universe, each universe
+    holding as many whole LEDs as fit in 512 channels. Lit LEDs get brightness on all their channels.
+
+    Patterns are written into the Art-Net output buffers, patternApplied is emitted once the sender
+    had two ticks to send them. Applying a pattern (or restoring) cancels the pending notification of the
+    previous one.
+    """
+
+    brightness = 255
+
+    def __init__(self, output: ArtnetOutputEngine, target_ip: str, first_universe: int, channels_per_led: int = 3, parent=None):
+        super().__init__(parent)
+
+        self._output = output
+        self._target_ip = target_ip
+        self._first_universe = first_universe
+        self._channels_per_led = channels_per_led
+        self._leds_per_universe = UNIVERSE_SIZE // channels_per_led
+        self._buffers: dict[int, np.ndarray] = dict()  # universe number: buffer view
+
+        self._applied_timer = QTimer(self)
+        self._applied_timer.setSingleShot(True)
+        self._applied_timer.timeout.connect(self.patternApplied)
+
+    def apply(self, first_led: int, pattern: np.ndarray) -> None:
+        last_led = first_led + len(pattern)
+        first_index = first_led // self._leds_per_universe
+        last_index = (last_led - 1) // self._leds_per_universe
+        for index in range(first_index, last_index + 1):
+            self._buffer(self._first_universe + index)
+
+        channels = np.repeat(np.where(pattern, self.brightness, 0).astype(np.uint8), self._channels_per_led)
+
+        with self._output.lock:
+            for buffer in self._buffers.values():
+                buffer[:] = 0
+
+            for index in range(first_index, last_index + 1):
+                universe_first_led = index * self._leds_per_universe
+                start = max(first_led, universe_first_led)
+                end = min(last_led, universe_first_led + self._leds_per_universe)
+
+                size = self._channels_per_led
+                buffer = self._buffers[self._first_universe + index]
+                buffer[(start - universe_first_led) * size:(end - universe_first_led) * size] = \
+                    channels[(start - first_led) * size:(end - first_led) * size]
+
+            for number in self._buffers:
+                self._output.mark_dirty(number)
+
+        self._applied_timer.start(2 * self._output.interval)
+
+    def restore(self) -> None:
+        """
+        Blacks out the universes used, the caller gives the LEDs back by disabling the board's DMX input
+        """
+        self._applied_timer.stop()
+        with self._output.lock:
+            for number, buffer in self._buffers.items():
+                buffer[:] = 0
+                self._output.mark_dirty(number)
+
+    def _buffer(self, number: int) -> np.ndarray:
+        if number not in self._buffers:
+            self._buffers[number] = np.frombuffer(self._output.add_universe(number, self._target_ip), dtype=np.uint8)
+
+        return self._buffers[number]
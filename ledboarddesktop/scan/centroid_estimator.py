@@ -0,0 +1,57 @@
+import math
+
+
+class CentroidEstimator:
+    """
+    Running mean of the detected positions of one LED, with the standard error of that mean.
+
+    A point further than outlier_distance from the mean restarts the estimation (the LED was not
+    lit yet, or a reflection was picked up).
+    """
+
+    def __init__(self, outlier_distance: float):
+        self.outlier_distance = outlier_distance
+
+        self.count = 0
+        self._mean_x = 0.0
+        self._mean_y = 0.0
+        self._squared_deviations = 0.0
+
+    def reset(self):
+        self.count = 0
+        self._mean_x = 0.0
+        self._mean_y = 0.0
+        self._squared_deviations = 0.0
+
+    def add(self, point: tuple[float, float]):
+        if self.count and math.dist(point, self.mean) > self.outlier_distance:
+            self.reset()
+
+        # Welford's online algorithm, on both axes at once
+        self.count += 1
+        delta_x = point[0] - self._mean_x
+        delta_y = point[1] - self._mean_y
+        self._mean_x += delta_x / self.count
+        self._mean_y += delta_y / self.count
+        self._squared_deviations += delta_x * (point[0] - self._mean_x) + delta_y * (point[1] - self._mean_y)
+
+    @property
+    def mean(self) -> tuple[float, float]:
+        return self._mean_x, self._mean_y
+
+    @property
+    def standard_error(self) -> float:
+        """
+        Pixels, infinite until two points were added
+        """
+        if self.count < 2:
+            return math.inf
+
+        variance = self._squared_deviations / (self.count - 1)
+        return math.sqrt(variance / self.count)
+
+    def confidence(self, target_error: float) -> float:
+        """
+        1.0 when the mean is known within target_error pixels, decreasing toward 0.0 as it gets noisier
+        """
+        return min(1.0, target_error / max(self.standard_error, 1e-9))
@@ -0,0 +1,11 @@
+import numpy as np
+from PySide6.QtGui import QImage
+
+
+def qimage_to_gray_array(image: QImage) -> np.ndarray:
+    """
+    Returns a (H, W) uint8 copy of the image luminance
+    """
+    gray = image.convertToFormat(QImage.Format.Format_Grayscale8)
+    array = np.frombuffer(gray.constBits(), dtype=np.uint8).reshape(gray.height(), gray.bytesPerLine())
+    return array[:, :gray.width()].copy()
@@ -0,0 +1,109 @@
+import math
+
+import numpy as np
+
+
+def bit_count(led_count: int) -> int:
+    return max(1, math.ceil(math.log2(led_count)))
+
+
+def gray_encode(indices: np.ndarray) -> np.ndarray:
+    return indices ^ (indices >> 1)
+
+
+def gray_decode(codes: np.ndarray, bits: int) -> np.ndarray:
+    indices = codes.copy()
+    shift = 1
+    while shift < bits:
+        indices ^= indices >> shift
+        shift <<= 1
+
+    return indices
+
+
+def led_pattern(led_count: int, bit: int, is_complement: bool = False) -> np.ndarray:
+    """
+    Boolean mask of the LEDs lit for the given bit (LEDs whose Gray code has that bit set)
+    """
+    pattern = ((gray_encode(np.arange(led_count)) >> bit) & 1).astype(bool)
+    return ~pattern if is_complement else pattern
+
+
+class GrayCodeDecoder:
+    """
+    Locates every LED at once from one grayscale frame per Gray code bit, plus its complement.
+
+    For each pixel, a bit is set when the pixel is brighter in the pattern frame than in the
+    complement frame. Pixels whose contrast is below minimum_contrast for any bit don't see a
+    lit LED and are ignored. The remaining pixels' codes give an LED index, and each LED position
+    is the contrast-weighted centroid of its pixels.
+
+    An LED's confidence is the mean contrast of its pixels' weakest bit, 1.0 from full_confidence_contrast
+    on, so LEDs barely above minimum_contrast (dim, or partly hidden) get a lower score.
+    """
+
+    minimum_contrast = 24  # grey levels
+    full_confidence_contrast = 96  # grey levels
+    minimum_pixel_count = 3
+
+    def __init__(self, led_count: int):
+        self.led_count = led_count
+        self.bits = bit_count(led_count)
+
+    def decode(
+            self,
+            frames: list[np.ndarray],
+            complements: list[np.ndarray],
+            mask: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Frames and complements are (H, W) uint8 arrays, ordered by bit. Mask is an optional (H, W) boolean
+        array of the pixels to consider.
+
+        Returns (led_count, 2) positions, a (led_count,) boolean array of the LEDs found
+        and their (led_count,) confidences between 0.0 and 1.0
+        """
+        if len(frames) != self.bits or len(complements) != self.bits:
+            raise ValueError(f"Expected {self.bits} frames and complements")
+
+        height, width = frames[0].shape
+        codes = np.zeros((height, width), dtype=np.int64)
+        contrast_min = np.full((height, width), 255, dtype=np.int16)
+        contrast_sum = np.zeros((height, width), dtype=np.float64)
+
+        for bit, (frame, complement) in enumerate(zip(frames, complements)):
+            difference = frame.astype(np.int16) - complement.astype(np.int16)
+            codes |= (difference > 0).astype(np.int64) << bit
+            np.minimum(contrast_min, np.abs(difference), out=contrast_min)
+            contrast_sum += np.abs(difference)
+
+        is_valid = contrast_min >= self.minimum_contrast
+        if mask is not None:
+            is_valid &= mask
+
+        indices = gray_decode(codes[is_valid], self.bits)
+        weights = contrast_sum[is_valid]
+        contrasts = contrast_min[is_valid]
+        ys, xs = np.nonzero(is_valid)
+
+        in_range = indices < self.led_count
+        indices, weights, contrasts = indices[in_range], weights[in_range], contrasts[in_range]
+        xs, ys = xs[in_range], ys[in_range]
+
+        pixel_counts = np.bincount(indices, minlength=self.led_count)
+        weight_sums = np.bincount(indices, weights=weights, minlength=self.led_count)
+        x_sums = np.bincount(indices, weights=weights * xs, minlength=self.led_count)
+        y_sums = np.bincount(indices, weights=weights * ys, minlength=self.led_count)
+        contrast_sums = np.bincount(indices, weights=contrasts, minlength=self.led_count)
+
+        is_found = pixel_counts >= self.minimum_pixel_count
+        positions = np.zeros((self.led_count, 2), dtype=np.float64)
+        positions[is_found, 0] = x_sums[is_found] / weight_sums[is_found]
+        positions[is_found, 1] = y_sums[is_found] / weight_sums[is_found]
+
+        confidences = np.zeros(self.led_count, dtype=np.float64)
+        confidences[is_found] = np.minimum(
+            1.0, contrast_sums[is_found] / pixel_counts[is_found] / self.full_confidence_contrast
+        )
+
+        return positions, is_found, confidences
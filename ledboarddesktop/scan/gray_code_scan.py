@@ -0,0 +1,147 @@
+import numpy as np
+from PySide6.QtCore import QObject, Signal, Slot
+from PySide6.QtGui import QImage
+
+from ledboarddesktop.scan.frames import qimage_to_gray_array
+from ledboarddesktop.scan.gray_code import GrayCodeDecoder, led_pattern
+from ledboarddesktop.scan.led_pattern_emitter import LedPatternEmitter
+from ledboarddesktop.scan.scan_mask import ScanMask
+
+
+class GrayCodeScan(QObject):
+    """
+    Locates a range of LEDs from ~2·log2(N) frames instead of one frame per LED.
+
+    For each Gray code bit, the LEDs having that bit set are lit, then the complement set.
+    Each pattern is captured from frames newer than the last one received when the emitter applied it,
+    skipping settle_frame_count of them (exposed while the LEDs switched), averaging frames_per_pattern
+    frames, and every LED is decoded at once when all patterns are captured (see GrayCodeDecoder).
+
+    With a mask, frames are cropped to its region of interest as they arrive, and pixels outside
+    the mask are ignored by the decoder.
+    """
+
+    finished = Signal()
+    pointDetected = Signal(int, float, float, float)  # LED, x, y, confidence
+    stepStarted = Signal(int, int)  # step, step count
+
+    frames_per_pattern = 2
+    settle_frame_count = 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.is_running = False
+        self.mask: ScanMask | None = None
+
+        self._emitter: LedPatternEmitter | None = None
+        self._decoder: GrayCodeDecoder | None = None
+        self._first_led = 0
+        self._steps: list[tuple[int, bool]] = list()
+        self._step = 0
+        self._last_frame_id = 0
+        self._applied_frame_id: int | None = None  # last frame id received when the pattern was applied
+        self._accumulator: np.ndarray | None = None
+        self._accumulated_count = 0
+        self._frames: list[np.ndarray] = list()
+        self._complements: list[np.ndarray] = list()
+        self._region_of_interest: tuple[int, int, int, int] | None = None
+
+    def start(self, emitter: LedPatternEmitter, first_led: int, last_led: int):
+        self._emitter = emitter
+        self._emitter.patternApplied.connect(self._pattern_applied)
+        self._decoder = GrayCodeDecoder(last_led - first_led + 1)
+        self._first_led = first_led
+        self._steps = [
+            (bit, is_complement)
+            for bit in range(self._decoder.bits)
+            for is_complement in (False, True)
+        ]
+        self._step = 0
+        self._frames.clear()
+        self._complements.clear()
+        self._region_of_interest = None
+        self.is_running = True
+
+        self._apply_current_step()
+
+    def stop(self):
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        self._emitter.patternApplied.disconnect(self._pattern_applied)
+        self._emitter.restore()
+        self.finished.emit()
+
+    @Slot(int, QImage)
+    def frame_received(self, frame_id: int, image: QImage):
+        self._last_frame_id = frame_id
+        if not self.is_running or self._applied_frame_id is None:
+            return
+
+        if frame_id - self._applied_frame_id <= self.settle_frame_count:
+            return  # Captured before or while the pattern changed
+
+        frame = self._crop(qimage_to_gray_array(image))
+        if self._accumulator is None:
+            self._accumulator = np.zeros(frame.shape, dtype=np.float32)
+        self._accumulator += frame
+        self._accumulated_count += 1
+
+        if self._accumulated_count < self.frames_per_pattern:
+            return
+
+        averaged = (self._accumulator / self._accumulated_count).astype(np.uint8)
+        _, is_complement = self._steps[self._step]
+        (self._complements if is_complement else self._frames).append(averaged)
+
+        self._step += 1
+        if self._step < len(self._steps):
+            self._apply_current_step()
+        else:
+            self._decode()
+
+    def _apply_current_step(self):
+        self._applied_frame_id = None
+        self._accumulator = None
+        self._accumulated_count = 0
+
+        bit, is_complement = self._steps[self._step]
+        self.stepStarted.emit(self._step, len(self._steps))
+        self._emitter.apply(self._first_led, led_pattern(self._decoder.led_count, bit, is_complement))
+
+    @Slot()
+    def _pattern_applied(self):
+        if self.is_running and self._applied_frame_id is None:
+            self._applied_frame_id = self._last_frame_id
+
+    def _crop(self, frame: np.ndarray) -> np.ndarray:
+        if self.mask is None or self.mask.is_empty or frame.shape != self.mask.bitmap.shape:
+            return frame
+
+        if self._region_of_interest is None:
+            self._region_of_interest = self.mask.region_of_interest() or (0, 0, 0, 0)
+
+        left, top, right, bottom = self._region_of_interest
+        return frame[top:bottom, left:right]
+
+    def _decode(self):
+        mask = None
+        offset = np.zeros(2)
+        if self._region_of_interest is not None:
+            left, top, right, bottom = self._region_of_interest
+            mask = self.mask.bitmap[top:bottom, left:right]
+            offset = np.array([left, top])
+
+        positions, is_found, confidences = self._decoder.decode(self._frames, self._complements, mask)
+        positions += offset
+        for index in np.flatnonzero(is_found):
+            self.pointDetected.emit(
+                self._first_led + int(index),
+                float(positions[index, 0]),
+                float(positions[index, 1]),
+                float(confidences[index])
+            )
+
+        self.stop()
@@ -0,0 +1,24 @@
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+
+
+class LedPatternEmitter(QObject):
+    """
+    Lights an arbitrary set of LEDs, used by pattern based scans.
+
+    Implementations emit patternApplied once the LEDs actually show the pattern.
+    """
+
+    patternApplied = Signal()
+
+    def apply(self, first_led: int, pattern: np.ndarray) -> None:
+        """
+        Lights LED first_led + i for every True in pattern, turns the others off
+        """
+        raise NotImplementedError
+
+    def restore(self) -> None:
+        """
+        Gives the LEDs back to the board's normal rendering
+        """
+        raise NotImplementedError
@@ -0,0 +1,27 @@
+import numpy as np
+
+from ledboardlib.scan.detection_point import DetectionPoint
+from ledboardlib.scan.quantizer import DetectionPointsQuantizer
+
+
+def quantize_positions(positions: np.ndarray) -> np.ndarray:
+    """
+    Runs ledboardlib's DetectionPointsQuantizer on an (N, 2) array ordered by LED index.
+
+    The algorithm is the library's, only the data path is array based: DetectionPoints are built from
+    and read back into arrays in bulk, without graphics items. Returns a new (N, 2) array.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    if not len(positions):
+        return positions.copy()
+
+    detection_points = [
+        DetectionPoint(led_index=led_index, x=x, y=y)
+        for led_index, (x, y) in enumerate(positions.tolist())
+    ]
+    quantized_points = DetectionPointsQuantizer(detection_points).quantize()
+
+    quantized = positions.copy()
+    rows = np.array([point.led_index for point in quantized_points], dtype=np.int64)
+    quantized[rows] = np.array([(point.x, point.y) for point in quantized_points], dtype=np.float64).reshape(-1, 2)
+    return quantized
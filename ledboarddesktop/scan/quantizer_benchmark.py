@@ -0,0 +1,74 @@
+"""
+Compares quantize_positions with the per-item path the viewport used before (one DetectionPoint per
+selected point, results written back point by point), and estimates the drag preview load: the share of
+a second spent quantizing at a 120 Hz mouse event rate, unthrottled and throttled by the viewport
+
+python -m ledboarddesktop.scan.quantizer_benchmark
+"""
+import math
+import time
+
+import numpy as np
+
+from ledboardlib.scan.detection_point import DetectionPoint
+from ledboardlib.scan.quantizer import DetectionPointsQuantizer
+
+from ledboarddesktop.scan.quantizer import quantize_positions
+from ledboarddesktop.scan.viewport.widget import ScanViewport
+
+MOUSE_EVENT_RATE = 120  # Hz
+
+
+def _make_strip(count: int) -> np.ndarray:
+    """
+    Noisy spiral, unevenly spaced, as a detected LED strip would be
+    """
+    rng = np.random.default_rng(0)
+    t = np.sort(rng.uniform(0, 20 * math.pi, count))
+    positions = np.column_stack((t * np.cos(t), t * np.sin(t))) * 10 + 1000
+    return positions + rng.normal(0, 1.5, positions.shape)
+
+
+def _timeit(function, repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def _quantize_items(leds: list[int], positions: np.ndarray):
+    detection_points = [
+        DetectionPoint(led_index=led_index, x=x, y=y)
+        for led_index, (x, y) in zip(leds, positions.tolist())
+    ]
+    row_by_led = {led: row for row, led in enumerate(leds)}
+    quantized = positions.copy()
+    for point in DetectionPointsQuantizer(detection_points).quantize():
+        quantized[row_by_led[point.led_index]] = point.x, point.y
+
+    return quantized
+
+
+def main():
+    throttled_rate = min(MOUSE_EVENT_RATE, 1000 / ScanViewport.quantize_preview_interval)
+    print(
+        f"{'points':>8} {'per-item (ms)':>14} {'quantize_positions (ms)':>24} {'speedup':>8} "
+        f"{'drag load':>10} {'throttled':>10}"
+    )
+    for count in (1_000, 10_000, 100_000):
+        positions = _make_strip(count)
+        leds = list(range(count))
+
+        items = _timeit(lambda: _quantize_items(leds, positions), repeat=3) * 1000
+        arrays = _timeit(lambda: quantize_positions(positions), repeat=3) * 1000
+        print(
+            f"{count:>8} {items:>14.2f} {arrays:>24.2f} {items / arrays:>7.1f}x "
+            f"{arrays * MOUSE_EVENT_RATE / 1000:>10.0%} {arrays * throttled_rate / 1000:>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+from dataclasses import replace
+
+import numpy as np
+from PySide6.QtCore import QObject, Signal, Slot, QTimer
+
+from ledboardlib import ListedBoard, ControlParameters
+
+from ledboarddesktop.components import Components
+from ledboarddesktop.scan.centroid_estimator import CentroidEstimator
+from ledboarddesktop.scan.led_pattern_emitter import LedPatternEmitter
+
+
+class ScanEngine(QObject):
+    """
+    Lights LEDs one after the other and records where the detector sees them.
+
+    The next LED is lit as soon as the current one gave a stable detection (stable_frame_count
+    consecutive points within stable_distance pixels), instead of waiting a fixed interval.
+
+    In adaptive mode (the detector averaging a single frame), points are accumulated until the
+    standard error of their mean drops below target_error, bright LEDs settle within a couple of
+    frames while dim or noisy ones take up to adaptive_max_frame_count frames.
+    Detections are only considered once their frame id is newer than the last one received when the
+    board acknowledged the LED change, and only from the average_frame_count-th fresh result on,
+    so the detector's average doesn't include frames captured before the switch. An LED without
+    stable detection after step_timeout is reported missed.
+
+    Control parameters are read once at start (requested from the board if none are known yet),
+    and only single_led is changed afterward.
+    With an emitter (Art-Net), LEDs are lit through it instead, and the board's control parameters are left untouched.
+    """
+
+    finished = Signal()
+    pointDetected = Signal(int, float, float, float, int)  # LED, x, y, confidence, frames used
+    pointMissed = Signal(int)
+    stepStarted = Signal(int)
+
+    stable_distance = 2.0  # pixels
+    stable_frame_count = 2
+
+    adaptive_outlier_distance = 10.0  # pixels
+    adaptive_min_frame_count = 2
+    adaptive_max_frame_count = 20
+    target_error = 0.5  # pixels
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.board: ListedBoard | None = None
+        self.is_running = False
+        self.is_adaptive = False
+        self.average_frame_count = 1  # frames averaged by the detector for each result
+
+        self._parameters: ControlParameters | None = None
+        self._emitter: LedPatternEmitter | None = None
+        self._single_led_pattern = np.ones(1, dtype=bool)
+        self._original_single_led = -1
+        self._current_led = 0
+        self._last_led = 0
+        self._last_frame_id = 0
+        self._lit_frame_id: int | None = None  # last frame id received when the LED change was acknowledged
+        self._estimator = CentroidEstimator(self.stable_distance)
+
+        self._step_timer = QTimer(self)
+        self._step_timer.setSingleShot(True)
+        self._step_timer.timeout.connect(self._step_timed_out)
+
+        board_communicator = Components().board_communicator
+        board_communicator.boardControlParametersSet.connect(self._control_parameters_set)
+        board_communicator.controlParametersAcquired.connect(self._control_parameters_acquired)
+        board_communicator.controlParametersAcquisitionFailed.connect(self._control_parameters_acquisition_failed)
+
+    def start(
+            self,
+            board: ListedBoard,
+            first_led: int,
+            last_led: int,
+            step_timeout_ms: int,
+            emitter: LedPatternEmitter | None = None
+    ):
+        self.board = board
+        self.is_running = True
+        self._current_led = first_led
+        self._last_led = last_led
+        self._step_timer.setInterval(step_timeout_ms)
+        self._estimator.outlier_distance = self.adaptive_outlier_distance if self.is_adaptive else self.stable_distance
+
+        self._emitter = emitter
+        if emitter is not None:
+            emitter.patternApplied.connect(self._pattern_applied)
+            self._light_current_led()
+            return
+
+        board_communicator = Components().board_communicator
+        self._parameters = board_communicator.last_control_parameters(board)
+        if self._parameters is None:
+            board_communicator.request_board_control_parameters(board)  # Continues in _control_parameters_acquired
+            return
+
+        self._original_single_led = self._parameters.single_led
+        self._light_current_led()
+
+    def stop(self):
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        self._step_timer.stop()
+        if self._emitter is not None:
+            self._emitter.patternApplied.disconnect(self._pattern_applied)
+            self._emitter.restore()
+            self._emitter = None
+        elif self._parameters is not None:
+            Components().board_communicator.set_control_parameters(
+                self.board,
+                replace(self._parameters, single_led=self._original_single_led)
+            )
+        self.board = None
+        self.finished.emit()
+
+    @Slot(int, object)
+    def detection_received(self, frame_id: int, point: tuple[float, float] | None):
+        self._last_frame_id = frame_id
+        if not self.is_running or self._lit_frame_id is None:
+            return
+
+        if frame_id - self._lit_frame_id < self.average_frame_count:
+            return  # Averaged with frames captured before the LED change
+
+        if point is None:
+            self._estimator.reset()
+            return
+
+        self._estimator.add(point)
+        if not self._is_estimation_finished():
+            return
+
+        x, y = self._estimator.mean
+        self.pointDetected.emit(
+            self._current_led, x, y,
+            self._estimator.confidence(self.target_error),
+            self._estimator.count
+        )
+        self._next_led()
+
+    def _is_estimation_finished(self) -> bool:
+        if not self.is_adaptive:
+            return self._estimator.count >= self.stable_frame_count
+
+        if self._estimator.count < self.adaptive_min_frame_count:
+            return False
+
+        return (
+            self._estimator.standard_error <= self.target_error or
+            self._estimator.count >= self.adaptive_max_frame_count
+        )
+
+    def _light_current_led(self):
+        if self._current_led > self._last_led:
+            self.stop()
+            return
+
+        self._lit_frame_id = None
+        self._estimator.reset()
+        self.stepStarted.emit(self._current_led)
+        self._step_timer.start()
+
+        if self._emitter is not None:
+            self._emitter.apply(self._current_led, self._single_led_pattern)
+            return
+
+        if self._parameters.single_led == self._current_led:
+            self._lit_frame_id = self._last_frame_id  # Already lit, the stream won't send an identical update
+            return
+
+        self._parameters = replace(self._parameters, single_led=self._current_led)
+        Components().board_communicator.set_control_parameters(self.board, self._parameters)
+
+    @Slot(ListedBoard, ControlParameters)
+    def _control_parameters_set(self, board: ListedBoard, parameters: ControlParameters):
+        if not self.is_running or self._emitter is not None or board.serial_port_name != self.board.serial_port_name:
+            return
+
+        if self._parameters is None:
+            return  # Not started yet, waiting for the board's control parameters
+
+        if parameters.single_led == self._current_led and self._lit_frame_id is None:
+            self._lit_frame_id = self._last_frame_id
+
+    @Slot(ListedBoard, ControlParameters)
+    def _control_parameters_acquired(self, board: ListedBoard, parameters: ControlParameters):
+        if not self._is_waiting_for_parameters(board):
+            return
+
+        self._parameters = parameters
+        self._original_single_led = parameters.single_led
+        self._light_current_led()
+
+    @Slot(ListedBoard, str)
+    def _control_parameters_acquisition_failed(self, board: ListedBoard, error: str):
+        if not self._is_waiting_for_parameters(board):
+            return
+
+        print(f"Cannot read control parameters ({error})")
+        self.stop()
+
+    def _is_waiting_for_parameters(self, board: ListedBoard) -> bool:
+        return (
+            self.is_running and self._emitter is None and self._parameters is None
+            and board.serial_port_name == self.board.serial_port_name
+        )
+
+    @Slot()
+    def _pattern_applied(self):
+        if self.is_running and self._lit_frame_id is None:
+            self._lit_frame_id = self._last_frame_id
+
+    def _step_timed_out(self):
+        self.pointMissed.emit(self._current_led)
+        self._next_led()
+
+    def _next_led(self):
+        self._step_timer.stop()
+        self._current_led += 1
+        self._light_current_led()
@@ -0,0 +1,114 @@
+import json
+import os
+import time
+from dataclasses import dataclass, asdict
+
+
+@dataclass
+class ScanRecord:
+    led: int
+    x: float
+    y: float
+    confidence: float = 1.0
+    frames_used: int = 1
+    timestamp: float = 0.0
+
+
+class ScanLogWriter:
+    """
+    Appends one NDJSON line per detected LED, flushed immediately so a crash loses at most the current LED.
+
+    Lines are also fsync'ed every fsync_interval records to survive power loss.
+    When resuming a log, a last line truncated by a crash is removed before appending.
+    """
+
+    fsync_interval = 50
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._truncate_partial_line()
+        self._file = open(filepath, "a", encoding="utf-8")
+        self._unsynced_count = 0
+
+    def write(self, record: ScanRecord):
+        if not record.timestamp:
+            record.timestamp = time.time()
+
+        self._file.write(json.dumps(asdict(record), separators=(",", ":")) + "\n")
+        self._file.flush()
+
+        self._unsynced_count += 1
+        if self._unsynced_count >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._unsynced_count = 0
+
+    def close(self):
+        if self._file.closed:
+            return
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+    def _truncate_partial_line(self):
+        try:
+            file = open(self.filepath, "rb+")
+        except FileNotFoundError:
+            return
+
+        with file:
+            end = file.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - 4096)
+                file.seek(start)
+                newline = file.read(position - start).rfind(b"\n")
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+
+            if position != end:
+                file.truncate(position)
+
+
+def read_scan_log(filepath: str) -> list[ScanRecord]:
+    records = list()
+    with open(filepath, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                records.append(ScanRecord(**json.loads(line)))
+            except (json.JSONDecodeError, TypeError):
+                continue  # Line truncated by a crash
+
+    return records
+
+
+def last_recorded_led(filepath: str) -> int | None:
+    """
+    Reads only the end of the file, to resume a scan without loading the whole log
+    """
+    with open(filepath, "rb") as file:
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        file.seek(max(0, size - 4096))
+        lines = file.read().splitlines()
+
+    for line in reversed(lines):
+        try:
+            return int(json.loads(line)["led"])
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            continue
+
+    return None
+
+
+def load_scan_records(filepath: str) -> list[ScanRecord]:
+    """
+    Loads a scan log, or a legacy JSON list of [x, y] points (list index is the LED number)
+    """
+    if filepath.endswith(".ndjson"):
+        return read_scan_log(filepath)
+
+    with open(filepath, "r", encoding="utf-8") as file:
+        return [ScanRecord(led=led, x=point[0], y=point[1]) for led, point in enumerate(json.load(file))]
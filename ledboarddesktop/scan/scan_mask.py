@@ -0,0 +1,205 @@
+import numpy as np
+
+
+def rasterize_polygon(
+        vertices: np.ndarray,
+        shape: tuple[int, int],
+        rect: tuple[int, int, int, int] | None = None
+) -> np.ndarray:
+    """
+    (H, W) boolean bitmap of the pixels whose center is inside the polygon (even-odd rule).
+
+    Only the (left, top, right, bottom) rect is computed if given, pixels outside it are False
+    """
+    height, width = shape
+    left, top, right, bottom = rect if rect is not None else (0, 0, width, height)
+
+    bitmap = np.zeros(shape, dtype=bool)
+    bitmap[top:bottom, left:right] = rasterize_polygon_region(vertices, (left, top, right, bottom))
+    return bitmap
+
+
+def rasterize_polygon_region(vertices: np.ndarray, rect: tuple[int, int, int, int]) -> np.ndarray:
+    """
+    Same as rasterize_polygon, returns only the (bottom - top, right - left) rect
+    """
+    left, top, right, bottom = rect
+    xs = np.arange(left, right) + 0.5
+    ys = np.arange(top, bottom) + 0.5
+
+    inside = np.zeros((len(ys), len(xs)), dtype=bool)
+    if len(vertices) < 3 or not len(xs) or not len(ys):
+        return inside
+
+    previous = vertices[-1]
+    for current in vertices:
+        (x0, y0), (x1, y1) = previous, current
+        previous = current
+        if y0 == y1:
+            continue
+
+        # Rows crossed by this edge, and where they cross it
+        is_crossed = (ys >= min(y0, y1)) & (ys < max(y0, y1))
+        crossing_xs = x0 + (ys[is_crossed] - y0) * (x1 - x0) / (y1 - y0)
+        inside[is_crossed] ^= xs[np.newaxis, :] < crossing_xs[:, np.newaxis]
+
+    return inside
+
+
+class ScanMask:
+    """
+    Camera pixels where LEDs may be detected, rasterized once from mask polygons.
+
+    Pixels inside any inclusion polygon are included (every pixel if there is no inclusion polygon of three
+    vertices or more), then pixels inside any exclusion polygon are removed, whatever the polygon order.
+    Editing a single polygon only rasterizes again the area it covered and covers.
+
+    The detector runs in the detection process on frames the desktop never sees raw, so for single LED
+    scans the mask only filters its detections afterward: a brighter reflection outside the mask still
+    wins over the LED inside it. Gray-code scans decode frames on the desktop and ignore masked out
+    pixels before detection.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.polygons: list[tuple[bool, np.ndarray]] = list()
+        self.bitmap = np.ones((height, width), dtype=bool)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.polygons
+
+    def set_polygons(self, polygons: list[tuple[bool, np.ndarray]]):
+        """
+        (is_exclusion, (N, 2) vertices) per polygon
+        """
+        self.polygons = [(is_exclusion, np.asarray(vertices, dtype=np.float64)) for is_exclusion, vertices in polygons]
+        self.bitmap = self._rasterize()
+
+    def set_polygon(self, index: int, is_exclusion: bool, vertices: np.ndarray):
+        """
+        Replaces the polygon at index, or adds it (after empty ones if index is past the polygon count)
+        """
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+        had_inclusion = self._has_inclusion()
+
+        while len(self.polygons) < index:
+            self.polygons.append((False, np.zeros((0, 2))))
+
+        dirty_rect = self._polygon_rect(vertices)
+        if index < len(self.polygons):
+            dirty_rect = _union(dirty_rect, self._polygon_rect(self.polygons[index][1]))
+            self.polygons[index] = (is_exclusion, vertices)
+        else:
+            self.polygons.append((is_exclusion, vertices))
+
+        self._update(had_inclusion, dirty_rect)
+
+    def remove_polygon(self, index: int):
+        if index >= len(self.polygons):
+            return
+
+        had_inclusion = self._has_inclusion()
+        _, vertices = self.polygons.pop(index)
+        self._update(had_inclusion, self._polygon_rect(vertices))
+
+    def resize(self, width: int, height: int):
+        if (width, height) == (self.width, self.height):
+            return
+
+        self.width = width
+        self.height = height
+        self.bitmap = self._rasterize()
+
+    def contains(self, x: float, y: float) -> bool:
+        column, row = int(x), int(y)
+        if not (0 <= column < self.width and 0 <= row < self.height):
+            return False
+
+        return bool(self.bitmap[row, column])
+
+    def region_of_interest(self) -> tuple[int, int, int, int] | None:
+        """
+        (left, top, right, bottom) bounding box of the included pixels, None if there is none
+        """
+        rows = np.flatnonzero(self.bitmap.any(axis=1))
+        if not len(rows):
+            return None
+
+        columns = np.flatnonzero(self.bitmap.any(axis=0))
+        return int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1
+
+    def _has_inclusion(self) -> bool:
+        return any(not is_exclusion and len(vertices) >= 3 for is_exclusion, vertices in self.polygons)
+
+    def _update(self, had_inclusion: bool, dirty_rect: tuple[int, int, int, int]):
+        if had_inclusion != self._has_inclusion():
+            self.bitmap = self._rasterize()  # Everything switched between included and excluded
+            return
+
+        left, top, right, bottom = dirty_rect
+        self.bitmap[top:bottom, left:right] = self._rasterize_region(dirty_rect)
+
+    def _rasterize(self) -> np.ndarray:
+        return self._rasterize_region((0, 0, self.width, self.height))
+
+    def _rasterize_region(self, rect: tuple[int, int, int, int]) -> np.ndarray:
+        left, top, right, bottom = rect
+        shape = (bottom - top, right - left)
+
+        if self._has_inclusion():
+            region = np.zeros(shape, dtype=bool)
+        else:
+            region = np.ones(shape, dtype=bool)
+
+        # Inclusions first, so an exclusion wins over any inclusion whatever the polygon order
+        for is_exclusion in (False, True):
+            for polygon_is_exclusion, vertices in self.polygons:
+                if polygon_is_exclusion != is_exclusion:
+                    continue
+
+                polygon_rect = _intersection(rect, self._polygon_rect(vertices))
+                if polygon_rect is None:
+                    continue
+
+                polygon_left, polygon_top, polygon_right, polygon_bottom = polygon_rect
+                window = (
+                    slice(polygon_top - top, polygon_bottom - top),
+                    slice(polygon_left - left, polygon_right - left)
+                )
+                inside = rasterize_polygon_region(vertices, polygon_rect)
+                if is_exclusion:
+                    region[window] &= ~inside
+                else:
+                    region[window] |= inside
+
+        return region
+
+    def _polygon_rect(self, vertices: np.ndarray) -> tuple[int, int, int, int]:
+        if not len(vertices):
+            return 0, 0, 0, 0
+
+        minimum = np.floor(vertices.min(axis=0)).astype(int)
+        maximum = np.ceil(vertices.max(axis=0)).astype(int) + 1
+        return (
+            int(np.clip(minimum[0], 0, self.width)), int(np.clip(minimum[1], 0, self.height)),
+            int(np.clip(maximum[0], 0, self.width)), int(np.clip(maximum[1], 0, self.height))
+        )
+
+
+def _union(a: tuple[int, int, int, int], b: tuple[int, int, int, int]) -> tuple[int, int, int, int]:
+    if a[0] >= a[2] or a[1] >= a[3]:
+        return b
+    if b[0] >= b[2] or b[1] >= b[3]:
+        return a
+
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+def _intersection(a: tuple[int, int, int, int], b: tuple[int, int, int, int]) -> tuple[int, int, int, int] | None:
+    rect = max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3])
+    if rect[0] >= rect[2] or rect[1] >= rect[3]:
+        return None
+
+    return rect
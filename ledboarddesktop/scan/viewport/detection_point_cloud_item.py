@@ -0,0 +1,341 @@
+import numpy as np
+from PySide6.QtCore import QRectF, Qt, Signal
+from PySide6.QtGui import QPen, QColor, QPainterPath
+from PySide6.QtWidgets import QGraphicsObject
+
+from ledboarddesktop.scan.viewport.detection_point_index import DetectionPointIndex
+
+
+class DetectionPointCloudItem(QGraphicsObject):
+    """
+    All the detection points in a single item, stored in contiguous arrays (one row per LED).
+
+    Points are drawn with one path per state (selected, not selected), rebuilt only when that
+    state's points change. Deleted points keep their row, flagged in is_deleted.
+    Pressing on a point selects it and drags the selected points, pressing elsewhere (or anywhere while
+    is_enabled is False, e.g. during mask editing) is ignored so the interactors below get the event.
+
+    A preview (e.g. quantized positions) can be drawn over the points with set_preview.
+
+    Edited rows are tracked until clear_dirty_rows is called, for incremental saving.
+    """
+
+    selectionDragFinished = Signal()
+    selectionDragStarted = Signal()
+    selectionDragged = Signal()
+
+    IndexedColors = {
+        -1: QColor(200, 200, 200),
+        0: QColor(255, 0, 0),
+        1: QColor(0, 255, 0),
+        2: QColor(0, 0, 255),
+        3: QColor(0, 255, 255),
+        4: QColor(255, 0, 255),
+    }
+
+    radius = 3.0
+    hit_radius = 4.0
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.point_index = DetectionPointIndex()
+
+        self._count = 0
+        self.leds = np.zeros(0, dtype=np.int64)
+        self.positions = np.zeros((0, 2), dtype=np.float64)
+        self.segments = np.zeros(0, dtype=np.int8)
+        self.is_selected = np.zeros(0, dtype=bool)
+        self.is_deleted = np.zeros(0, dtype=bool)
+        self._row_by_led: dict[int, int] = dict()
+        self._dirty_rows: set[int] = set()
+        self._is_all_dirty = False
+
+        self._pens = {
+            True: self._make_pen(self.IndexedColors[0]),
+            False: self._make_pen(self.IndexedColors[1]),
+        }
+        self._paths: dict[bool, QPainterPath | None] = {True: None, False: None}
+        self._preview_pen = self._make_pen(QColor(255, 255, 0, 160))
+        self._preview_path: QPainterPath | None = None
+        self._bounding_rect = QRectF()
+
+        self.is_enabled = True
+        self._drag_anchor: tuple[float, float] | None = None
+
+    @property
+    def count(self) -> int:
+        """
+        Number of rows in use, arrays are allocated beyond it
+        """
+        return self._count
+
+    #
+    # Rows
+    def rows(self, leds) -> np.ndarray:
+        return np.array([self._row_by_led[led] for led in leds], dtype=np.int64)
+
+    def visible_rows(self) -> np.ndarray:
+        return np.flatnonzero(~self.is_deleted[:self._count])
+
+    def selected_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.is_selected[:self._count] & ~self.is_deleted[:self._count])
+
+    #
+    # Edition
+    def add_point(self, led: int, x: float, y: float):
+        row = self._row_by_led.get(led)
+        if row is not None:
+            self.positions[row] = x, y
+            self.is_deleted[row] = False
+            self.point_index.insert(led, x, y)
+            self._dirty_rows.add(row)
+            self._points_changed()
+            return
+
+        row = self._count
+        self._reserve(self._count + 1)
+        self._count += 1
+        self._row_by_led[led] = row
+        self.leds[row] = led
+        self.positions[row] = x, y
+        self.segments[row] = -1
+        self.is_selected[row] = False
+        self.is_deleted[row] = False
+        self.point_index.insert(led, x, y)
+        self._dirty_rows.add(row)
+
+        # New points are not selected, extend the cached path instead of rebuilding it while scanning
+        if self._paths[False] is not None:
+            self._paths[False].addEllipse(x - self.radius, y - self.radius, self.radius * 2, self.radius * 2)
+
+        self._update_bounding_rect()
+        self.update()
+
+    def clear(self):
+        self._count = 0
+        self._row_by_led.clear()
+        self.point_index.clear()
+        self._is_all_dirty = True
+        self._points_changed()
+
+    def set_arrays(self, arrays: dict[str, np.ndarray]):
+        """
+        Replaces all points, arrays are the ones returned by arrays(). Rows are clean afterward
+        """
+        count = len(arrays["leds"])
+        self._count = 0
+        self._reserve(count)
+        self._count = count
+        for name in ("leds", "positions", "segments", "is_deleted"):
+            getattr(self, name)[:count] = arrays[name]
+        self.is_selected[:count] = False
+
+        self._row_by_led = {led: row for row, led in enumerate(self.leds[:count].tolist())}
+        self.point_index.clear()
+        for row in self.visible_rows().tolist():
+            self.point_index.insert(int(self.leds[row]), *self.positions[row].tolist())
+
+        self._dirty_rows.clear()
+        self._is_all_dirty = False
+        self._points_changed()
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        """
+        Views on the persistent arrays, allocated beyond count
+        """
+        return {name: getattr(self, name) for name in ("leds", "positions", "segments", "is_deleted")}
+
+    def dirty_rows(self) -> np.ndarray | None:
+        """
+        Rows edited since clear_dirty_rows was called, None if they all have to be considered edited
+        """
+        return None if self._is_all_dirty else np.array(sorted(self._dirty_rows), dtype=np.int64)
+
+    def clear_dirty_rows(self):
+        """
+        To be called once the dirty rows were saved
+        """
+        self._dirty_rows.clear()
+        self._is_all_dirty = False
+
+    def set_positions(self, rows: np.ndarray, positions: np.ndarray):
+        self.positions[rows] = positions
+        self._dirty_rows.update(np.asarray(rows).tolist())
+        for led, (x, y) in zip(self.leds[rows].tolist(), positions.tolist()):
+            if not self.is_deleted[self._row_by_led[led]]:
+                self.point_index.move(led, x, y)
+
+        self._points_changed()
+
+    def set_segments(self, rows: np.ndarray, segments: int | np.ndarray):
+        self.segments[rows] = segments
+        self._dirty_rows.update(np.asarray(rows).tolist())
+        self.update()
+
+    def set_deleted(self, rows: np.ndarray, is_deleted: bool | np.ndarray):
+        self.is_deleted[rows] = is_deleted
+        self._dirty_rows.update(np.asarray(rows).tolist())
+        for led, (x, y), is_row_deleted in zip(
+                self.leds[rows].tolist(),
+                self.positions[rows].tolist(),
+                self.is_deleted[rows].tolist()
+        ):
+            if is_row_deleted:
+                self.point_index.remove(led)
+            else:
+                self.point_index.insert(led, x, y)
+
+        self._points_changed()
+
+    def set_values(self, array_name: str, rows: np.ndarray, values: np.ndarray):
+        {
+            "positions": self.set_positions,
+            "segments": self.set_segments,
+            "is_deleted": self.set_deleted,
+        }[array_name](rows, values)
+
+    #
+    # Selection
+    def select_rows(self, rows: np.ndarray, is_selected: bool = True):
+        self.is_selected[rows] = is_selected
+        self._selection_changed()
+
+    def select_leds(self, leds, is_selected: bool = True):
+        self.select_rows(self.rows(leds), is_selected)
+
+    def clear_selection(self):
+        if not self.is_selected[:self._count].any():
+            return
+
+        self.is_selected[:self._count] = False
+        self._selection_changed()
+
+    def led_at(self, x: float, y: float) -> int | None:
+        return self.point_index.nearest(x, y, self.hit_radius)
+
+    def set_preview(self, positions: np.ndarray | None):
+        if positions is None:
+            self._preview_path = None
+        else:
+            self._preview_path = self._make_ellipses_path(positions)
+
+        self.update()
+
+    #
+    # QGraphicsItem
+    def boundingRect(self) -> QRectF:
+        return self._bounding_rect
+
+    def paint(self, painter, option, widget=None):
+        for is_selected in (False, True):
+            if self._paths[is_selected] is None:
+                self._paths[is_selected] = self._make_path(is_selected)
+
+            painter.strokePath(self._paths[is_selected], self._pens[is_selected])
+
+        if self._preview_path is not None:
+            painter.strokePath(self._preview_path, self._preview_pen)
+
+    def mousePressEvent(self, event):
+        if not self.is_enabled:
+            event.ignore()
+            return
+
+        led = self.led_at(event.pos().x(), event.pos().y())
+        if led is None or event.button() != Qt.MouseButton.LeftButton:
+            event.ignore()
+            return
+
+        row = self._row_by_led[led]
+        if not self.is_selected[row]:
+            if not event.modifiers() & Qt.ShiftModifier:
+                self.is_selected[:self._count] = False
+            self.is_selected[row] = True
+            self._selection_changed()
+
+        self._drag_anchor = event.pos().x(), event.pos().y()
+        self.selectionDragStarted.emit()
+        event.accept()
+
+    def mouseMoveEvent(self, event):
+        if self._drag_anchor is None:
+            return
+
+        delta = np.array([event.pos().x() - self._drag_anchor[0], event.pos().y() - self._drag_anchor[1]])
+        self._drag_anchor = event.pos().x(), event.pos().y()
+
+        rows = self.selected_rows()
+        self.positions[rows] += delta
+        self._dirty_rows.update(rows.tolist())
+        for led, (x, y) in zip(self.leds[rows].tolist(), self.positions[rows].tolist()):
+            self.point_index.move(led, x, y)
+
+        # Only the selected points moved, the other path is still valid
+        self._paths[True] = None
+        self._update_bounding_rect()
+        self.update()
+        self.selectionDragged.emit()
+
+    def mouseReleaseEvent(self, event):
+        if self._drag_anchor is None:
+            return
+
+        self._drag_anchor = None
+        self.selectionDragFinished.emit()
+
+    #
+    # Private
+    def _reserve(self, count: int):
+        capacity = len(self.leds)
+        if count <= capacity:
+            return
+
+        capacity = max(count, capacity * 2, 256)
+        for name in ("leds", "positions", "segments", "is_selected", "is_deleted"):
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def _make_path(self, is_selected: bool) -> QPainterPath:
+        rows = self.selected_rows() if is_selected else np.flatnonzero(
+            ~self.is_selected[:self._count] & ~self.is_deleted[:self._count]
+        )
+        return self._make_ellipses_path(self.positions[rows])
+
+    def _make_ellipses_path(self, positions: np.ndarray) -> QPainterPath:
+        path = QPainterPath()
+        diameter = self.radius * 2
+        for x, y in positions.tolist():
+            path.addEllipse(x - self.radius, y - self.radius, diameter, diameter)
+
+        return path
+
+    def _make_pen(self, color: QColor) -> QPen:
+        pen = QPen(color)
+        pen.setWidth(2)
+        return pen
+
+    def _points_changed(self):
+        self._paths = {True: None, False: None}
+        self._update_bounding_rect()
+        self.update()
+
+    def _selection_changed(self):
+        self._paths = {True: None, False: None}
+        self.update()
+
+    def _update_bounding_rect(self):
+        rows = self.visible_rows()
+        if len(rows):
+            margin = self.radius + 1
+            minimum = self.positions[rows].min(axis=0) - margin
+            maximum = self.positions[rows].max(axis=0) + margin
+            bounding_rect = QRectF(minimum[0], minimum[1], maximum[0] - minimum[0], maximum[1] - minimum[1])
+        else:
+            bounding_rect = QRectF()
+
+        if bounding_rect != self._bounding_rect:
+            self.prepareGeometryChange()
+            self._bounding_rect = bounding_rect
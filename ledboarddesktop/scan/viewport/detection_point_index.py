@@ -0,0 +1,169 @@
+import math
+
+
+class DetectionPointIndex:
+    """
+    Uniform grid over the detection points positions (scene coordinates), keyed by LED index.
+
+    Rectangle and lasso queries only visit the cells overlapping their bounding box, nearest
+    neighbour queries visit rings of cells around the position until the nearest point is found.
+    """
+
+    def __init__(self, cell_size: float = 32.0):
+        self.cell_size = cell_size
+
+        self._positions: dict[int, tuple[float, float]] = dict()
+        self._cells: dict[tuple[int, int], set[int]] = dict()
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, led: int):
+        return led in self._positions
+
+    def clear(self):
+        self._positions.clear()
+        self._cells.clear()
+
+    def insert(self, led: int, x: float, y: float):
+        if led in self._positions:
+            self.move(led, x, y)
+            return
+
+        self._positions[led] = (x, y)
+        self._cells.setdefault(self._cell(x, y), set()).add(led)
+
+    def move(self, led: int, x: float, y: float):
+        old_cell = self._cell(*self._positions[led])
+        new_cell = self._cell(x, y)
+        self._positions[led] = (x, y)
+
+        if old_cell == new_cell:
+            return
+
+        self._discard_from_cell(old_cell, led)
+        self._cells.setdefault(new_cell, set()).add(led)
+
+    def remove(self, led: int):
+        position = self._positions.pop(led, None)
+        if position is not None:
+            self._discard_from_cell(self._cell(*position), led)
+
+    def position(self, led: int) -> tuple[float, float]:
+        return self._positions[led]
+
+    def in_rect(self, left: float, top: float, right: float, bottom: float) -> list[int]:
+        left, right = min(left, right), max(left, right)
+        top, bottom = min(top, bottom), max(top, bottom)
+
+        leds = list()
+        for led in self._candidates(left, top, right, bottom):
+            x, y = self._positions[led]
+            if left <= x <= right and top <= y <= bottom:
+                leds.append(led)
+
+        return leds
+
+    def in_polygon(self, polygon: list[tuple[float, float]]) -> list[int]:
+        if len(polygon) < 3:
+            return list()
+
+        xs = [point[0] for point in polygon]
+        ys = [point[1] for point in polygon]
+
+        return [
+            led for led in self._candidates(min(xs), min(ys), max(xs), max(ys))
+            if _is_inside_polygon(self._positions[led], polygon)
+        ]
+
+    def nearest(self, x: float, y: float, max_distance: float = math.inf) -> int | None:
+        if not self._positions:
+            return None
+
+        center_x, center_y = self._cell(x, y)
+        nearest_led = None
+        nearest_distance = max_distance
+
+        ring = 0
+        max_ring = self._max_ring(center_x, center_y, max_distance)
+        while ring <= max_ring:
+            for cell in self._ring_cells(center_x, center_y, ring):
+                for led in self._cells.get(cell, ()):
+                    distance = math.dist((x, y), self._positions[led])
+                    if distance <= nearest_distance:
+                        nearest_led, nearest_distance = led, distance
+
+            # Points in further rings are at least ring * cell_size away
+            if nearest_led is not None and nearest_distance <= ring * self.cell_size:
+                break
+
+            ring += 1
+
+        return nearest_led
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _discard_from_cell(self, cell: tuple[int, int], led: int):
+        leds = self._cells[cell]
+        leds.discard(led)
+        if not leds:
+            del self._cells[cell]
+
+    def _candidates(self, left: float, top: float, right: float, bottom: float):
+        first_x, first_y = self._cell(left, top)
+        last_x, last_y = self._cell(right, bottom)
+
+        # Huge areas: walking the occupied cells is cheaper than walking the area
+        if (last_x - first_x + 1) * (last_y - first_y + 1) > len(self._cells):
+            for (cell_x, cell_y), leds in self._cells.items():
+                if first_x <= cell_x <= last_x and first_y <= cell_y <= last_y:
+                    yield from leds
+            return
+
+        for cell_x in range(first_x, last_x + 1):
+            for cell_y in range(first_y, last_y + 1):
+                yield from self._cells.get((cell_x, cell_y), ())
+
+    def _max_ring(self, center_x: int, center_y: int, max_distance: float) -> int:
+        if max_distance != math.inf:
+            return math.ceil(max_distance / self.cell_size)
+
+        # Unbounded search stops at the furthest occupied cell
+        return max(
+            max(abs(cell_x - center_x), abs(cell_y - center_y))
+            for cell_x, cell_y in self._cells
+        )
+
+    @staticmethod
+    def _ring_cells(center_x: int, center_y: int, ring: int):
+        if ring == 0:
+            yield center_x, center_y
+            return
+
+        for offset in range(-ring, ring + 1):
+            yield center_x + offset, center_y - ring
+            yield center_x + offset, center_y + ring
+
+        for offset in range(-ring + 1, ring):
+            yield center_x - ring, center_y + offset
+            yield center_x + ring, center_y + offset
+
+
+def _is_inside_polygon(point: tuple[float, float], polygon: list[tuple[float, float]]) -> bool:
+    """
+    Even-odd ray casting
+    """
+    x, y = point
+    is_inside = False
+
+    previous_x, previous_y = polygon[-1]
+    for current_x, current_y in polygon:
+        if (current_y > y) != (previous_y > y):
+            crossing_x = current_x + (y - current_y) * (previous_x - current_x) / (previous_y - current_y)
+            if x < crossing_x:
+                is_inside = not is_inside
+
+        previous_x, previous_y = current_x, current_y
+
+    return is_inside
@@ -0,0 +1,68 @@
+from PySide6.QtCore import QObject, Signal, QTimer
+from PySide6.QtGui import QImage
+
+from ledboarddesktop.components import Components
+
+
+class DetectionResultWatcher(QObject):
+    """
+    Watches the detection process from a worker thread and notifies only when a new detection result arrived.
+
+    Each notified result gets a monotonic frame id. The executor has no result id, so a result is new when
+    it is another object and its JPEG frame differs from the previous one's (the scan engine would count
+    a repeated result as one more stable detection).
+
+    The frame is decoded from the result's own JPEG, so it always matches the detection it is shown with.
+    """
+
+    errorOccurred = Signal()
+    frameReceived = Signal(int, object, QImage)  # frame id, detection result, frame
+
+    def __init__(self, poll_interval: int, parent=None):
+        super().__init__(parent)
+
+        self._poll_interval = poll_interval
+        self._timer: QTimer | None = None
+
+        self._frame_id = 0
+        self._previous_result = None
+        self._previous_frame_bytes: bytes | None = None
+
+    def start(self):
+        if self._timer is None:
+            self._timer = QTimer(self)
+            self._timer.timeout.connect(self._poll)
+
+        self._timer.start(self._poll_interval)
+
+    def stop(self):
+        """
+        Must be called once the watcher thread is stopped
+        """
+        self._previous_result = None
+        self._previous_frame_bytes = None
+
+    def _poll(self):
+        try:
+            result = Components().scan_detection.get_latest_result()
+        except RuntimeError:
+            self._timer.stop()
+            self.errorOccurred.emit()
+            return
+
+        if result is None or not result.frame_as_bytes or not self._is_new_result(result):
+            return
+
+        image = QImage.fromData(result.frame_as_bytes, "JPG")
+
+        self._previous_result = result
+        self._previous_frame_bytes = result.frame_as_bytes
+
+        self._frame_id += 1
+        self.frameReceived.emit(self._frame_id, result, image)
+
+    def _is_new_result(self, result) -> bool:
+        if result is self._previous_result:
+            return False
+
+        return result.frame_as_bytes != self._previous_frame_bytes
@@ -0,0 +1,104 @@
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class PointsEdit:
+    """
+    Values of one point cloud array (positions, segments or is_deleted) before and after an edit, for the edited rows only
+    """
+    array_name: str
+    rows: np.ndarray
+    old_values: np.ndarray
+    new_values: np.ndarray
+
+    @property
+    def size(self) -> int:
+        return self.rows.nbytes + self.old_values.nbytes + self.new_values.nbytes
+
+
+class EditHistory:
+    """
+    Undo and redo stacks of point cloud edits.
+
+    The oldest edits are forgotten beyond max_depth edits or max_bytes of stored deltas.
+    """
+
+    def __init__(self, max_depth: int = 100, max_bytes: int = 64 * 1024 * 1024):
+        self.max_depth = max_depth
+        self.max_bytes = max_bytes
+
+        self._undo_stack: deque[list[PointsEdit]] = deque()
+        self._redo_stack: deque[list[PointsEdit]] = deque()
+        self._size = 0
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo_stack)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo_stack)
+
+    def clear(self):
+        self._undo_stack.clear()
+        self._redo_stack.clear()
+        self._size = 0
+
+    def push(self, edits: list[PointsEdit]):
+        """
+        Edits recorded together are undone together, unchanged rows are dropped
+        """
+        edits = [edit for edit in (self._changed_only(edit) for edit in edits) if len(edit.rows)]
+        if not edits:
+            return
+
+        self._size -= sum(self._edits_size(redo) for redo in self._redo_stack)
+        self._redo_stack.clear()
+
+        self._undo_stack.append(edits)
+        self._size += self._edits_size(edits)
+
+        while self._undo_stack and (len(self._undo_stack) > self.max_depth or self._size > self.max_bytes):
+            self._size -= self._edits_size(self._undo_stack.popleft())
+
+    def undo(self) -> list[PointsEdit] | None:
+        """
+        Returns the edits to revert (apply their old values, last edit first)
+        """
+        if not self._undo_stack:
+            return None
+
+        edits = self._undo_stack.pop()
+        self._redo_stack.append(edits)
+        return edits
+
+    def redo(self) -> list[PointsEdit] | None:
+        """
+        Returns the edits to apply again (apply their new values)
+        """
+        if not self._redo_stack:
+            return None
+
+        edits = self._redo_stack.pop()
+        self._undo_stack.append(edits)
+        return edits
+
+    @staticmethod
+    def _changed_only(edit: PointsEdit) -> PointsEdit:
+        is_changed = edit.old_values != edit.new_values
+        if is_changed.ndim > 1:
+            is_changed = is_changed.any(axis=tuple(range(1, is_changed.ndim)))
+
+        return PointsEdit(
+            array_name=edit.array_name,
+            rows=edit.rows[is_changed].astype(np.int32),
+            old_values=edit.old_values[is_changed],
+            new_values=edit.new_values[is_changed],
+        )
+
+    @staticmethod
+    def _edits_size(edits: list[PointsEdit]) -> int:
+        return sum(edit.size for edit in edits)
@@ -11,7 +11,7 @@ class GraphicsView(QGraphicsView):
         QGraphicsView.__init__(self, parent)
 
         self.setRenderHint(QPainter.Antialiasing, True)
-        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
         self.setCacheMode(QGraphicsView.CacheBackground)
         self.setOptimizationFlag(QGraphicsView.DontAdjustForAntialiasing)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
@@ -1,32 +1,62 @@
 from PySide6.QtCore import QRect, QSize, QPoint, Qt
+from PySide6.QtGui import QPen, QColor, QPolygonF
 from PySide6.QtWidgets import QRubberBand
 
+from ledboarddesktop.scan.viewport.detection_point_cloud_item import DetectionPointCloudItem
 from ledboarddesktop.scan.viewport.interactors.abstract_graphicsview_interactor import AbstractGraphicsViewInteractor
 
 
 class DetectionPointSelector(AbstractGraphicsViewInteractor):
+    """
+    Rubber band selection, lasso selection while Shift is held, and a click near a point selects it.
 
-    def __init__(self, view):
+    Points are looked up in the point cloud's spatial index. Presses on a point are left to the
+    point cloud, which drags them.
+    """
+
+    pick_distance = 8  # view pixels
+
+    def __init__(self, view, point_cloud: DetectionPointCloudItem):
         super().__init__(view)
 
         self.is_enabled = True
         self._is_active = False
+        self._is_dragging_points = False
         self._temp_disable = False
+        self._is_lasso = False
+
+        self._point_cloud = point_cloud
 
         self._rubber_band = QRubberBand(QRubberBand.Rectangle, self._view)
         self._top_left = QPoint()
         self._bottom_right = QPoint()
 
+        self._lasso = QPolygonF()
+        self._lasso_item = self._view.scene().addPolygon(self._lasso, QPen(QColor(255, 255, 255), 0, Qt.DashLine))
+        self._lasso_item.setZValue(1000)
+
     def mousePressEvent(self, event):
         if self._temp_disable:
             return
 
+        position = self._view.mapToScene(event.pos())
+        self._is_dragging_points = self._point_cloud.led_at(position.x(), position.y()) is not None
+        if self._is_dragging_points:
+            return
+
         self._top_left = event.pos()
-        self._rubber_band.setGeometry(QRect(self._top_left, QSize()))
-        self._rubber_band.show()
+        self._is_lasso = bool(event.modifiers() & Qt.ShiftModifier)
+
+        if self._is_lasso:
+            self._lasso = QPolygonF([position])
+            self._lasso_item.setPolygon(self._lasso)
+        else:
+            self._point_cloud.clear_selection()
+            self._rubber_band.setGeometry(QRect(self._top_left, QSize()))
+            self._rubber_band.show()
 
     def mouseMoveEvent(self, event):
-        if self._temp_disable:
+        if self._temp_disable or self._is_dragging_points:
             return
 
         if event.buttons():
@@ -35,27 +65,39 @@ class DetectionPointSelector(AbstractGraphicsViewInteractor):
             return
 
         self._bottom_right = event.pos()
-        self._rubber_band.setGeometry(QRect(self._top_left, self._bottom_right).normalized())
+
+        if self._is_lasso:
+            self._lasso.append(self._view.mapToScene(event.pos()))
+            self._lasso_item.setPolygon(self._lasso)
+        else:
+            self._rubber_band.setGeometry(QRect(self._top_left, self._bottom_right).normalized())
 
     def mouseReleaseEvent(self, event):
         if self._temp_disable:
             return
 
+        if self._is_dragging_points:
+            self._is_dragging_points = False
+            return
+
         self._rubber_band.hide()
 
-        if self._is_active:
-            self._is_active = False
+        if not self._is_active:
+            self._select_nearest(event.pos())
+            return
 
-            top_left = self._view.mapToScene(self._top_left).toPoint()
-            bottom_right = self._view.mapToScene(self._bottom_right).toPoint()
-            rect = QRect(top_left, bottom_right)
+        self._is_active = False
 
-            for item in self._view.scene().items():
-                if not hasattr(item, "detection_point"):
-                    continue
+        if self._is_lasso:
+            leds = self._point_cloud.point_index.in_polygon([(point.x(), point.y()) for point in self._lasso])
+            self._lasso = QPolygonF()
+            self._lasso_item.setPolygon(self._lasso)
+        else:
+            top_left = self._view.mapToScene(self._top_left)
+            bottom_right = self._view.mapToScene(self._bottom_right)
+            leds = self._point_cloud.point_index.in_rect(top_left.x(), top_left.y(), bottom_right.x(), bottom_right.y())
 
-                if rect.contains(item.pos().toPoint()):
-                    item.setSelected(True)
+        self._point_cloud.select_leds(leds)
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Control:
@@ -64,3 +106,10 @@ class DetectionPointSelector(AbstractGraphicsViewInteractor):
     def keyReleaseEvent(self, event):
         if event.key() == Qt.Key_Control:
             self._temp_disable = False
+
+    def _select_nearest(self, view_position: QPoint):
+        position = self._view.mapToScene(view_position)
+        max_distance = self.pick_distance / max(self._view.transform().m11(), 1e-6)
+        led = self._point_cloud.point_index.nearest(position.x(), position.y(), max_distance)
+        if led is not None:
+            self._point_cloud.select_leds([led])
@@ -1,64 +1,113 @@
-from typing import Any
+from dataclasses import dataclass
+from typing import Callable
 
-from PySide6.QtCore import Qt, QPoint
-from PySide6.QtGui import QPolygonF, QPen, QBrush, QColor
+import numpy as np
+from PySide6.QtCore import Qt, QPointF, QLineF
+from PySide6.QtGui import QPolygonF, QPen, QBrush, QColor, QPainterPath
+from PySide6.QtWidgets import QGraphicsPolygonItem
 
 from ledboarddesktop.scan.viewport.interactors.abstract_graphicsview_interactor import AbstractGraphicsViewInteractor
 
 
+@dataclass
+class MaskPolygon:
+    is_exclusion: bool
+    polygon: QPolygonF
+    item: QGraphicsPolygonItem
+
+
 class MaskDrawer(AbstractGraphicsViewInteractor):
+    """
+    Mask polygons editor, while active:
+
+    - click adds a vertex to the current polygon (a new inclusion polygon if there is none)
+    - dragging a vertex moves it, and makes its polygon the current one
+    - dragging an edge of the current polygon inserts a vertex there
+    - right click on a vertex, or Delete after moving it, removes it
+
+    Each edit only updates the edited polygon's item, and calls on_polygon_changed with its index
+    (on_polygon_removed when its last vertices are removed) so the rasterized mask can be updated incrementally.
+    """
+
+    pick_distance = 8  # view pixels
+
     def __init__(self, view):
         super().__init__(view)
         self.is_enabled = True
 
         self.is_active = False
         self._temp_disable = False
-        self._is_drawing = False
 
-        color = QColor(128, 128, 128)
+        self.on_polygon_changed: Callable[[int], None] | None = None
+        self.on_polygon_removed: Callable[[int], None] | None = None
 
-        pen = QPen(color)
-        pen.setWidth(2)
-        pen.setCapStyle(Qt.RoundCap)
-        pen.setJoinStyle(Qt.RoundJoin)
+        self._pens = {
+            False: self._make_pen(QColor(128, 128, 128)),
+            True: self._make_pen(QColor(200, 64, 64)),
+        }
+        self._brushes = {
+            False: QBrush(QColor(128, 128, 128, 64)),
+            True: QBrush(QColor(200, 64, 64, 64)),
+        }
 
-        color.setAlpha(64)
-        brush = QBrush(color)
-        # brush.setStyle(Qt.BDiagPattern)
+        self._polygons: list[MaskPolygon] = list()
+        self._current: int | None = None
+        self._dragged_vertex: int | None = None
+        self._last_vertex: int | None = None
+        self._is_visible = True
 
-        self._polygon = QPolygonF()
-        self._polygon_item = self._view.scene().addPolygon(self._polygon, pen, brush)
-        self.reset()
+        self._handles_item = self._view.scene().addPath(QPainterPath(), QPen(QColor(255, 255, 255), 0))
+        self._handles_item.setZValue(1000)
 
-    @property
-    def mask_item(self):
-        return self._polygon_item
+    def set_visible(self, is_visible: bool):
+        self._is_visible = is_visible
+        for mask_polygon in self._polygons:
+            mask_polygon.item.setVisible(is_visible)
+        self._handles_item.setVisible(is_visible and self.is_active)
 
-    @property
-    def mask(self) -> Any:
-        return None
-        mask = ScanMask()
-        mask.points = [
-            [int(self._polygon.at(i).x()), int(self._polygon.at(i).y())]
-            for i in range(self._polygon.count())
-        ]
-        return mask
-
-    def set_mask(self, mask: Any) -> None:
-        return
-        self._polygon = QPolygonF()
-        for point in mask.points:
-            self._polygon.append(QPoint(*point))
-        self._polygon_item.setPolygon(self._polygon)
+    def polygon(self, index: int) -> tuple[bool, np.ndarray]:
+        """
+        (is_exclusion, (N, 2) vertices)
+        """
+        return self._polygons[index].is_exclusion, self._vertices(index)
+
+    def polygons(self) -> list[tuple[bool, np.ndarray]]:
+        return [self.polygon(index) for index in range(len(self._polygons))]
+
+    def set_polygons(self, polygons: list[tuple[bool, np.ndarray]]):
+        self._clear()
+        for is_exclusion, vertices in polygons:
+            index = self.new_polygon(is_exclusion)
+            for x, y in np.asarray(vertices).tolist():
+                self._polygons[index].polygon.append(QPointF(x, y))
+            self._polygons[index].item.setPolygon(self._polygons[index].polygon)
+
+        self._current = None
+        self._update_handles()
+
+    def new_polygon(self, is_exclusion: bool) -> int:
+        """
+        Following clicks add vertices to the new polygon
+        """
+        item = self._view.scene().addPolygon(QPolygonF(), self._pens[is_exclusion], self._brushes[is_exclusion])
+        item.setVisible(self._is_visible)
+        self._polygons.append(MaskPolygon(is_exclusion, QPolygonF(), item))
+        self._current = len(self._polygons) - 1
+        self._last_vertex = None
+        self._update_handles()
+        return self._current
 
     def reset(self):
-        self._polygon = QPolygonF()
-        self._polygon_item.setPolygon(self._polygon)
+        self._clear()
+        self._update_handles()
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Control:
             self._temp_disable = True
 
+        elif event.key() in (Qt.Key_Delete, Qt.Key_Backspace) and self.is_active and self._last_vertex is not None:
+            self._remove_vertex(self._current, self._last_vertex)
+
     def keyReleaseEvent(self, event):
         if event.key() == Qt.Key_Control:
             self._temp_disable = False
@@ -68,21 +117,160 @@ class MaskDrawer(AbstractGraphicsViewInteractor):
             return
 
         position = self._view.mapToScene(event.position().toPoint())
-        self._polygon.append(position)
-        self._polygon_item.setPolygon(self._polygon)
+        hit = self._vertex_at(position)
+
+        if event.button() == Qt.MouseButton.RightButton:
+            if hit is not None:
+                self._remove_vertex(*hit)
+            return
+
+        if hit is not None:
+            self._current, self._dragged_vertex = hit
+
+        elif (edge := self._edge_at(position)) is not None:
+            self._dragged_vertex = edge + 1
+            self._polygons[self._current].polygon.insert(self._dragged_vertex, position)
+            self._polygon_changed(self._current)
+
+        else:
+            if self._current is None:
+                self.new_polygon(is_exclusion=False)
+            self._polygons[self._current].polygon.append(position)
+            self._dragged_vertex = None
+            self._last_vertex = self._polygons[self._current].polygon.count() - 1
+            self._polygon_changed(self._current)
+            return
+
+        self._last_vertex = self._dragged_vertex
+        self._update_handles()
 
     def mouseMoveEvent(self, event):
-        return
-        """
-        if self._temp_disable or not self.is_active:
+        if self._temp_disable or not self.is_active or self._dragged_vertex is None:
+            return
+
+        if not event.buttons() & Qt.MouseButton.LeftButton:
             return
 
         position = self._view.mapToScene(event.position().toPoint())
-        polygon = self._polygon_item.polygon()
+        self._polygons[self._current].polygon.replace(self._dragged_vertex, position)
+        self._polygon_changed(self._current)
+
+    def mouseReleaseEvent(self, event):
+        self._dragged_vertex = None
+
+    def set_active(self, is_active: bool):
+        self.is_active = is_active
+        self._dragged_vertex = None
+        self._handles_item.setVisible(is_active and self._is_visible)
+
+    #
+    # Private
+    def _clear(self):
+        for mask_polygon in self._polygons:
+            self._view.scene().removeItem(mask_polygon.item)
+        self._polygons.clear()
+        self._current = None
+        self._dragged_vertex = None
+        self._last_vertex = None
+
+    def _vertices(self, index: int) -> np.ndarray:
+        polygon = self._polygons[index].polygon
+        return np.array([(polygon.at(i).x(), polygon.at(i).y()) for i in range(polygon.count())]).reshape(-1, 2)
+
+    def _remove_vertex(self, index: int, vertex: int):
+        polygon = self._polygons[index].polygon
+        polygon.remove(vertex)
+        self._last_vertex = None
+
         if polygon.isEmpty():
+            self._view.scene().removeItem(self._polygons[index].item)
+            self._polygons.pop(index)
+            self._current = None
+            self._update_handles()
+            if self.on_polygon_removed is not None:
+                self.on_polygon_removed(index)
             return
 
-        polygon.last().setX(position.x())
-        polygon.last().setY(position.y())
-        self._polygon_item.setPolygon(polygon)
+        self._polygon_changed(index)
+
+    def _polygon_changed(self, index: int):
+        mask_polygon = self._polygons[index]
+        mask_polygon.item.setPolygon(mask_polygon.polygon)
+        self._update_handles()
+
+        if self.on_polygon_changed is not None:
+            self.on_polygon_changed(index)
+
+    def _scene_pick_distance(self) -> float:
+        return self.pick_distance / max(self._view.transform().m11(), 1e-6)
+
+    def _vertex_at(self, position: QPointF) -> tuple[int, int] | None:
+        """
+        (polygon index, vertex index) of the nearest vertex within pick distance, the current polygon first
+        """
+        pick_distance = self._scene_pick_distance()
+        indices = list(range(len(self._polygons)))
+        if self._current is not None:
+            indices.remove(self._current)
+            indices.insert(0, self._current)
+
+        for index in indices:
+            vertices = self._vertices(index)
+            if not len(vertices):
+                continue
+
+            distances = np.hypot(vertices[:, 0] - position.x(), vertices[:, 1] - position.y())
+            nearest = int(np.argmin(distances))
+            if distances[nearest] <= pick_distance:
+                return index, nearest
+
+        return None
+
+    def _edge_at(self, position: QPointF) -> int | None:
         """
+        Index of the first vertex of the current polygon's edge within pick distance
+        """
+        if self._current is None:
+            return None
+
+        polygon = self._polygons[self._current].polygon
+        if polygon.count() < 2:
+            return None
+
+        pick_distance = self._scene_pick_distance()
+        for i in range(polygon.count()):
+            edge = QLineF(polygon.at(i), polygon.at((i + 1) % polygon.count()))
+            if _distance_to_segment(position, edge) <= pick_distance:
+                return i
+
+        return None
+
+    def _update_handles(self):
+        path = QPainterPath()
+        if self._current is not None:
+            size = self._scene_pick_distance() / 2
+            polygon = self._polygons[self._current].polygon
+            for i in range(polygon.count()):
+                vertex = polygon.at(i)
+                path.addRect(vertex.x() - size / 2, vertex.y() - size / 2, size, size)
+
+        self._handles_item.setPath(path)
+
+    @staticmethod
+    def _make_pen(color: QColor) -> QPen:
+        pen = QPen(color)
+        pen.setWidth(2)
+        pen.setCapStyle(Qt.RoundCap)
+        pen.setJoinStyle(Qt.RoundJoin)
+        return pen
+
+
+def _distance_to_segment(point: QPointF, segment: QLineF) -> float:
+    dx, dy = segment.dx(), segment.dy()
+    length_squared = dx * dx + dy * dy
+    if length_squared == 0:
+        return QLineF(point, segment.p1()).length()
+
+    t = ((point.x() - segment.x1()) * dx + (point.y() - segment.y1()) * dy) / length_squared
+    t = min(1.0, max(0.0, t))
+    return QLineF(point, QPointF(segment.x1() + t * dx, segment.y1() + t * dy)).length()
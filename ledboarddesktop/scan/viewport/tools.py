@@ -8,6 +8,7 @@ from pyside6helpers.frame import make_h_line
 class ScanViewportTools(QWidget):
     fitClicked = Signal()
     maskEditingChanged = Signal(bool)
+    maskPolygonAdded = Signal(bool)  # is exclusion
     maskResetClicked = Signal()
     maskToggleVisible = Signal(bool)
     saveScanEditsClicked = Signal()
@@ -15,6 +16,9 @@ class ScanViewportTools(QWidget):
     selectedPointIndexChanged = Signal(int)
     deleteSelectedClicked = Signal()
     quantizePositionsClicked = Signal()
+    quantizePreviewToggled = Signal(bool)
+    undoClicked = Signal()
+    redoClicked = Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -26,10 +30,23 @@ class ScanViewportTools(QWidget):
         self.button_fit_viewport.clicked.connect(self.fitClicked)
 
         self.button_mask_edit = QPushButton("Edit mask")
-        self.button_mask_edit.setToolTip("Masking")
+        self.button_mask_edit.setToolTip(
+            "Masking\n"
+            "Single LED scans only discard detections outside the mask, "
+            "a brighter reflection outside it can still hide the LED.\n"
+            "Gray code scans ignore masked out pixels."
+        )
         self.button_mask_edit.setIcon(icons.screenshot())
         self.button_mask_edit.setCheckable(True)
 
+        self.button_mask_add_inclusion = QPushButton("Add include polygon")
+        self.button_mask_add_inclusion.setToolTip("Next clicks draw a polygon where LEDs are detected")
+        self.button_mask_add_inclusion.clicked.connect(lambda: self.maskPolygonAdded.emit(False))
+
+        self.button_mask_add_exclusion = QPushButton("Add exclude polygon")
+        self.button_mask_add_exclusion.setToolTip("Next clicks draw a polygon where LEDs are ignored")
+        self.button_mask_add_exclusion.clicked.connect(lambda: self.maskPolygonAdded.emit(True))
+
         self.button_mask_toggle_visible = QPushButton("Mask visibility")
         self.button_mask_toggle_visible.setIcon(icons.vision())
         self.button_mask_toggle_visible.setCheckable(True)
@@ -65,6 +82,20 @@ class ScanViewportTools(QWidget):
         self.button_quantize_positions.setToolTip("Quantize selected points positions")
         self.button_quantize_positions.clicked.connect(self.quantizePositionsClicked)
 
+        self.button_quantize_preview = QPushButton("Quantize preview")
+        self.button_quantize_preview.setIcon(icons.vision())
+        self.button_quantize_preview.setToolTip("Preview quantized positions while dragging points")
+        self.button_quantize_preview.setCheckable(True)
+        self.button_quantize_preview.toggled.connect(self.quantizePreviewToggled)
+
+        self.button_undo = QPushButton("Undo")
+        self.button_undo.setToolTip("Undo last point edit (Ctrl+Z)")
+        self.button_undo.clicked.connect(self.undoClicked)
+
+        self.button_redo = QPushButton("Redo")
+        self.button_redo.setToolTip("Redo last undone point edit")
+        self.button_redo.clicked.connect(self.redoClicked)
+
         #
         # Layout
         layout = QVBoxLayout(self)
@@ -74,6 +105,8 @@ class ScanViewportTools(QWidget):
 
         layout.addWidget(make_h_line())
         layout.addWidget(self.button_mask_edit)
+        layout.addWidget(self.button_mask_add_inclusion)
+        layout.addWidget(self.button_mask_add_exclusion)
         layout.addWidget(self.button_mask_reset)
         layout.addWidget(self.button_mask_toggle_visible)
 
@@ -89,6 +122,11 @@ class ScanViewportTools(QWidget):
         layout.addWidget(self.spin_selected_point_index)
         layout.addWidget(self.button_delete_selected)
         layout.addWidget(self.button_quantize_positions)
+        layout.addWidget(self.button_quantize_preview)
+
+        layout.addWidget(make_h_line())
+        layout.addWidget(self.button_undo)
+        layout.addWidget(self.button_redo)
 
         layout.addWidget(QWidget())
         layout.setStretch(layout.count() - 1, 100)
@@ -100,6 +138,10 @@ class ScanViewportTools(QWidget):
         self.button_save_scan_edits.clicked.connect(self.saveScanEditsClicked)
         self.spin_selected_point_index.valueChanged.connect(self.selectedPointIndexChanged)
 
+    def set_undo_redo_enabled(self, can_undo: bool, can_redo: bool):
+        self.button_undo.setEnabled(can_undo)
+        self.button_redo.setEnabled(can_redo)
+
     def _mask_toggle_visible(self):
         checked = self.button_mask_toggle_visible.isChecked()
         self.button_mask_toggle_visible.setIcon(icons.vision() if checked else icons.vision_stroked())
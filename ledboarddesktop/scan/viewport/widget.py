@@ -1,9 +1,14 @@
-from PySide6.QtCore import QTimer, Signal
-from PySide6.QtGui import QPen, QColor, QPixmap
+import numpy as np
+from PySide6.QtCore import QThread, QTimer, Signal
+from PySide6.QtGui import QPen, QColor, QPixmap, QImage, QKeySequence, QShortcut
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QGraphicsScene, QGraphicsRectItem, QGraphicsEllipseItem
 
 from ledboarddesktop.components import Components
-from ledboarddesktop.scan.viewport.detection_point_graphics_item import DetectionPointGraphicsItem
+from ledboarddesktop.scan.quantizer import quantize_positions
+from ledboarddesktop.scan.scan_mask import ScanMask
+from ledboarddesktop.scan.viewport.detection_result_watcher import DetectionResultWatcher
+from ledboarddesktop.scan.viewport.detection_point_cloud_item import DetectionPointCloudItem
+from ledboarddesktop.scan.viewport.edit_history import EditHistory, PointsEdit
 from ledboarddesktop.scan.viewport.graphics_image_plane import GraphicsImagePlane
 from ledboarddesktop.scan.viewport.graphics_view import GraphicsView
 from ledboarddesktop.scan.viewport.interactors.detection_point_selector import DetectionPointSelector
@@ -12,21 +17,35 @@ from ledboarddesktop.scan.viewport.interactors.navigator import Navigator
 from ledboarddesktop.scan.viewport.options import ScanViewportOptions
 from ledboarddesktop.scan.viewport.tools import ScanViewportTools
 from ledboardlib.scan.detection_point import DetectionPoint
-from ledboardlib.scan.quantizer import DetectionPointsQuantizer
 
 
 class ScanViewport(QWidget):
-    detectionResultReceived = Signal(object)
+    detectionResultReceived = Signal(int, object)  # frame id, point in the mask (None if none)
+    frameReceived = Signal(int, QImage)  # frame id, frame
+    maskChanged = Signal()
     scanErrorOccurred = Signal()
 
+    quantize_preview_interval = 100  # ms, the library quantizer runs at most this often while dragging
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
         self._options = ScanViewportOptions(
             framerate=30,
         )
-        self._detection_points_items: dict[int, DetectionPointGraphicsItem] = dict()
-        self._detection_point_graphic_items: dict[int, DetectionPointGraphicsItem] = dict()
+        self._last_rendered_frame_id = 0
+        self._is_quantize_preview_enabled = False
+        self._edit_history = EditHistory(max_depth=Components().settings.scan_edit_history_depth)
+        self._drag_rows: np.ndarray | None = None
+        self._drag_old_positions: np.ndarray | None = None
+
+        self._quantize_preview_timer = QTimer(self)
+        self._quantize_preview_timer.setSingleShot(True)
+        self._quantize_preview_timer.setInterval(self.quantize_preview_interval)
+        self._quantize_preview_timer.timeout.connect(self._update_quantize_preview)
+
+        detector_options = Components().scan_detection.get_options()
+        self.scan_mask = ScanMask(detector_options.camera_width, detector_options.camera_height)
 
         #
         # Widgets
@@ -45,6 +64,12 @@ class ScanViewport(QWidget):
         self.scene.addItem(self.image_plane)
         self.scene.addItem(self.horizontal_line)
         self.scene.addItem(self.detection_marker)
+
+        self.detection_points = DetectionPointCloudItem()
+        self.detection_points.selectionDragStarted.connect(self._selection_drag_started)
+        self.detection_points.selectionDragged.connect(self._selection_dragged)
+        self.detection_points.selectionDragFinished.connect(self._selection_drag_finished)
+        self.scene.addItem(self.detection_points)
         self.view.setScene(self.scene)
 
         self.tools = ScanViewportTools()
@@ -60,7 +85,10 @@ class ScanViewport(QWidget):
         # Interactors
         self.viewport_navigator = Navigator(self.view, self.image_plane)
         self.viewport_mask_drawer = MaskDrawer(self.view)
-        self.viewport_detection_point_selector = DetectionPointSelector(self.view)
+        self.viewport_detection_point_selector = DetectionPointSelector(self.view, self.detection_points)
+
+        self.viewport_mask_drawer.on_polygon_changed = self._mask_polygon_changed
+        self.viewport_mask_drawer.on_polygon_removed = self._mask_polygon_removed
 
         self.view.interactors.append(self.viewport_navigator)
         self.view.interactors.append(self.viewport_mask_drawer)
@@ -68,13 +96,15 @@ class ScanViewport(QWidget):
 
         self.image_plane.set_on_size_change_callbacks([
             self.viewport_navigator.fit,
-            self._update_horizontal_line
+            self._update_horizontal_line,
+            self._resize_scan_mask
         ])
 
         #
         # Signals
         self.tools.fitClicked.connect(self.viewport_navigator.fit)
         self.tools.maskEditingChanged.connect(self._mask_editing_changed)
+        self.tools.maskPolygonAdded.connect(self._mask_polygon_added)
         self.tools.maskResetClicked.connect(self._mask_reset)
         self.tools.maskToggleVisible.connect(self._mask_toggle_visible)
         self.tools.saveScanEditsClicked.connect(self._save_scan_edits)
@@ -82,48 +112,71 @@ class ScanViewport(QWidget):
         self.tools.selectedPointIndexChanged.connect(self._selected_point_index_changed)
         self.tools.deleteSelectedClicked.connect(self._delete_selected_clicked)
         self.tools.quantizePositionsClicked.connect(self._quantize_positions_clicked)
+        self.tools.quantizePreviewToggled.connect(self._quantize_preview_toggled)
+        self.tools.undoClicked.connect(self.undo)
+        self.tools.redoClicked.connect(self.redo)
+
+        QShortcut(QKeySequence.StandardKey.Undo, self, self.undo)
+        QShortcut(QKeySequence.StandardKey.Redo, self, self.redo)
+        self._update_undo_redo_buttons()
 
         #
-        # Timers
-        self._viewport_timer = QTimer(self)
-        self._viewport_timer.timeout.connect(self._update_viewport)
+        # Detection results, watched from a thread, the GUI only wakes up for new frames
+        self._detection_result_watcher = DetectionResultWatcher(int(1000 / self._options.framerate))
+        self._detection_result_watcher.frameReceived.connect(self._update_viewport)
+        self._detection_result_watcher.errorOccurred.connect(self._detection_error_occurred)
+
+        self._detection_result_thread = QThread(self)
+        self._detection_result_watcher.moveToThread(self._detection_result_thread)
+        self._detection_result_thread.started.connect(self._detection_result_watcher.start)
 
     def get_detection_points(self) -> list[DetectionPoint]:
-        return list([point.detection_point for point in self._detection_point_graphic_items.values()])
+        return self._make_detection_points(self.detection_points.visible_rows())
+
+    def _make_detection_points(self, rows) -> list[DetectionPoint]:
+        return [
+            DetectionPoint(led_index=led_index, x=x, y=y)
+            for led_index, (x, y) in zip(
+                self.detection_points.leds[rows].tolist(),
+                self.detection_points.positions[rows].tolist()
+            )
+        ]
 
     def clear_viewport(self):
         self.image_plane.setPixmap(QPixmap())
 
     def start_viewport_update_timer(self):
-        self._viewport_timer.start(int(1000 / self._options.framerate))
+        self._last_rendered_frame_id = 0
+        self._detection_result_thread.start()
 
     def stop_viewport_update_timer(self):
-        self._viewport_timer.stop()
-
-    def _update_viewport(self):
-        try:
-            self.last_detec = Components().scan_detection.get_latest_result()
-        except RuntimeError:
-            self.stop_viewport_update_timer()
-            self.scanErrorOccurred.emit()
-            return
+        self._detection_result_thread.quit()
+        self._detection_result_thread.wait()
+        self._detection_result_watcher.stop()
 
-        if self.last_detec is None:
+    def _detection_error_occurred(self):
+        self.stop_viewport_update_timer()
+        self.scanErrorOccurred.emit()
+
+    def _update_viewport(self, frame_id: int, detection_result, image: QImage):
+        if frame_id <= self._last_rendered_frame_id:
             return
 
-        pixmap = QPixmap()
-        pixmap.loadFromData(self.last_detec.frame_as_bytes, "JPG")
-        self.image_plane.setPixmap(pixmap)
+        self._last_rendered_frame_id = frame_id
+        self.last_detec = detection_result
+
+        self.image_plane.setPixmap(QPixmap.fromImage(image))
+        self.frameReceived.emit(frame_id, image)
 
         self._make_scan_result_items()
-        if self.last_detec.point is not None:
-            self.detection_marker.setPos(
-                self.last_detec.point[0],
-                self.last_detec.point[1]
-            )
-        self.detectionResultReceived.emit(
-            (self.last_detec.point[0], self.last_detec.point[1])
-        )
+
+        point = self.last_detec.point
+        if point is not None and not self.scan_mask.contains(point[0], point[1]):
+            point = None  # Reflection or light outside the installation, the detector itself doesn't know the mask
+
+        if point is not None:
+            self.detection_marker.setPos(point[0], point[1])
+        self.detectionResultReceived.emit(frame_id, (point[0], point[1]) if point is not None else None)
 
     def _make_scan_result_items(self):
         pass
@@ -141,33 +194,64 @@ class ScanViewport(QWidget):
         """
 
     def add_point(self, i, x, y):
-        new = DetectionPointGraphicsItem(i)
-        new.setPos(x, y)
-        self.scene.addItem(new)
-        self._detection_point_graphic_items[i] = new
+        self.detection_points.add_point(i, x, y)
 
     def _mask_editing_changed(self, is_active):
-        self.viewport_mask_drawer.is_active = is_active
-        if not is_active:
-            pass
-            # scan_api.set_mask(self.viewport_mask_drawer.mask)
+        self.viewport_mask_drawer.set_active(is_active)
+        self.viewport_detection_point_selector.is_enabled = not is_active
+        self.detection_points.is_enabled = not is_active
+
+    def _mask_polygon_added(self, is_exclusion):
+        if not self.tools.button_mask_edit.isChecked():
+            self.tools.button_mask_edit.setChecked(True)
+            self._mask_editing_changed(True)
+
+        self.viewport_mask_drawer.new_polygon(is_exclusion)
+
+    def _mask_polygon_changed(self, index):
+        self.scan_mask.set_polygon(index, *self.viewport_mask_drawer.polygon(index))
+        self.maskChanged.emit()
+
+    def _mask_polygon_removed(self, index):
+        self.scan_mask.remove_polygon(index)
+        self.maskChanged.emit()
 
     def _mask_reset(self):
         self.viewport_mask_drawer.reset()
-        # scan_api.reset_mask()
+        self._update_scan_mask()
+
+    def mask_polygons(self) -> list[tuple[bool, np.ndarray]]:
+        return self.viewport_mask_drawer.polygons()
+
+    def set_mask_polygons(self, polygons: list[tuple[bool, np.ndarray]]):
+        self.viewport_mask_drawer.set_polygons(polygons)
+        self._update_scan_mask()
+
+    def _update_scan_mask(self):
+        self.scan_mask.set_polygons(self.viewport_mask_drawer.polygons())
+        self.maskChanged.emit()
+
+    def _resize_scan_mask(self):
+        size = self.image_plane.pixmap().size()
+        if not size.isEmpty():
+            self.scan_mask.resize(size.width(), size.height())
 
     def _mask_toggle_visible(self, is_visible):
-        self.viewport_mask_drawer.mask_item.setVisible(is_visible)
+        self.viewport_mask_drawer.set_visible(is_visible)
 
     def load_from_client(self):
         pass
         #self.viewport_mask_drawer.set_mask(scan_api.get_mask())  # FIXME: create ViewportMaskDrawer.load_from_client() ?
 
+    def set_detection_point_arrays(self, arrays: dict[str, np.ndarray]):
+        self.detection_points.set_arrays(arrays)
+        self._edit_history.clear()
+        self._update_undo_redo_buttons()
+
     def clear_detection_points(self):
-        for item in self._detection_point_graphic_items.values():
-            if isinstance(item, DetectionPointGraphicsItem):
-                self.scene.removeItem(item)
-        self._detection_point_graphic_items = dict()
+        self.detection_points.clear()
+        self._edit_history.clear()
+        self._update_undo_redo_buttons()
         """
         for item in self._detection_points_items.values():
             self.scene.removeItem(item)
@@ -196,59 +280,102 @@ class ScanViewport(QWidget):
         """
 
     def _assign_segment_index(self, index):
-        for led_number, detection_point_item in self._detection_points_items.items():
-            if not detection_point_item.isSelected():
-                continue
-
-            detection_point_item.detection_point.assigned_segment_number = index
-            detection_point_item.update()
+        rows = self.detection_points.selected_rows()
+        self._push_edits([self._edit("segments", rows, np.full(len(rows), index, dtype=np.int8))])
 
     def _selected_point_index_changed(self, index):
-        if index >= len(self._detection_point_graphic_items):
+        self.detection_points.clear_selection()
+        if index == -1 or index not in self.detection_points.point_index:
             return
 
-        self.scene.clearSelection()
-        if index == -1:
+        self.detection_points.select_leds([index])
+
+    def _delete_selected_clicked(self):
+        rows = self.detection_points.selected_rows()
+        self.detection_points.select_rows(rows, False)
+        self._push_edits([self._edit("is_deleted", rows, np.ones(len(rows), dtype=bool))])
+
+    def _quantize_positions_clicked(self):
+        rows = self.detection_points.selected_rows()
+        if not len(rows):
+            rows = self.detection_points.visible_rows()
+
+        rows = self._rows_in_led_order(rows)
+        self._push_edits([self._edit("positions", rows, quantize_positions(self.detection_points.positions[rows]))])
+
+    def _quantize_preview_toggled(self, is_enabled):
+        self._is_quantize_preview_enabled = is_enabled
+
+    def _selection_drag_started(self):
+        self._drag_rows = self.detection_points.selected_rows()
+        self._drag_old_positions = self.detection_points.positions[self._drag_rows].copy()
+
+    def _selection_drag_finished(self):
+        self._quantize_preview_timer.stop()
+        self.detection_points.set_preview(None)
+
+        self._push_edits([PointsEdit(
+            array_name="positions",
+            rows=self._drag_rows,
+            old_values=self._drag_old_positions,
+            new_values=self.detection_points.positions[self._drag_rows].copy()
+        )])
+        self._drag_rows = None
+        self._drag_old_positions = None
+
+    def _selection_dragged(self):
+        """
+        Mouse moves only arm the timer, so the preview follows the drag at most every quantize_preview_interval
+        """
+        if self._is_quantize_preview_enabled and not self._quantize_preview_timer.isActive():
+            self._quantize_preview_timer.start()
+
+    def _update_quantize_preview(self):
+        if self._drag_rows is None:
             return
 
-        point = self._detection_point_graphic_items[index]
-        point.setSelected(True)
+        rows = self._rows_in_led_order(self._drag_rows)
+        self.detection_points.set_preview(quantize_positions(self.detection_points.positions[rows]))
 
-    def _delete_selected_clicked(self):
-        indices_to_delete = list()
-        for led_number, detection_point_item in self._detection_point_graphic_items.items():
-            if detection_point_item.isSelected():
-                self.scene.removeItem(detection_point_item)
-                indices_to_delete.append(led_number)
+    def _rows_in_led_order(self, rows):
+        return rows[np.argsort(self.detection_points.leds[rows], kind="stable")]
 
-        for index in indices_to_delete:
-            self._detection_point_graphic_items.pop(index)
+    #
+    # Edit history
+    def undo(self):
+        edits = self._edit_history.undo()
+        if edits is None:
+            return
 
-    def _quantize_positions_clicked(self):
-        if not self.scene.selectedItems():
-            detection_points = [
-                DetectionPoint(
-                    led_index=led_index,
-                    x=point.x(),
-                    y=point.y()
-                )
-                for led_index, point in self._detection_point_graphic_items.items()
-            ]
-        else:
-            detection_points = [
-                DetectionPoint(
-                    led_index=led_index,
-                    x=point.x(),
-                    y=point.y()
-                )
-                for led_index, point in self._detection_point_graphic_items.items() if point.isSelected()
-            ]
-
-        quantizer = DetectionPointsQuantizer(detection_points)
-        smoothed_points = quantizer.quantize()
-        for smoothed_point in smoothed_points:
-            self._detection_point_graphic_items[smoothed_point.led_index].setPos(
-                smoothed_point.x,
-                smoothed_point.y,
-            )
-            self._detection_point_graphic_items[smoothed_point.led_index].detection_point = smoothed_point
+        for edit in reversed(edits):
+            self.detection_points.set_values(edit.array_name, edit.rows, edit.old_values)
+        self._update_undo_redo_buttons()
+
+    def redo(self):
+        edits = self._edit_history.redo()
+        if edits is None:
+            return
+
+        for edit in edits:
+            self.detection_points.set_values(edit.array_name, edit.rows, edit.new_values)
+        self._update_undo_redo_buttons()
+
+    def _edit(self, array_name: str, rows: np.ndarray, new_values: np.ndarray) -> PointsEdit:
+        """
+        Applies new values to the point cloud, returns the edit to record
+        """
+        edit = PointsEdit(
+            array_name=array_name,
+            rows=rows,
+            old_values=getattr(self.detection_points, array_name)[rows].copy(),
+            new_values=new_values
+        )
+        self.detection_points.set_values(array_name, rows, new_values)
+        return edit
+
+    def _push_edits(self, edits: list[PointsEdit]):
+        self._edit_history.push(edits)
+        self._update_undo_redo_buttons()
+
+    def _update_undo_redo_buttons(self):
+        self.tools.set_undo_redo_enabled(self._edit_history.can_undo, self._edit_history.can_redo)
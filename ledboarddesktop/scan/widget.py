@@ -1,23 +1,42 @@
-import json
-from importlib import resources
+import time
+from dataclasses import replace
 
-from PySide6.QtCore import QTimer
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QFileDialog
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QFileDialog, QCheckBox, QComboBox
 
-from ledboardlib import ListedBoard, BoardApi, InteropDataStore, SamplingPoint
+from ledboardlib import InteropDataStore, SamplingPoint, ListedBoard, ControlParameters
 from pyside6helpers import icons
 
 from ledboarddesktop.components import Components
+from ledboarddesktop.interop import interop_filepath
+from ledboarddesktop.scan.artnet_led_pattern_emitter import ArtnetLedPatternEmitter
+from ledboarddesktop.scan.gray_code_scan import GrayCodeScan
+from ledboarddesktop.scan.scan_engine import ScanEngine
+from ledboarddesktop.scan.scan_log import ScanLogWriter, ScanRecord, last_recorded_led, load_scan_records
 from ledboarddesktop.scan.viewport.widget import ScanViewport
 from pyside6helpers.slider import Slider
 from pyside6helpers.spinbox import SpinBox
 
 
 class ScanWidget(QWidget):
+    """
+    Art-Net scan modes light LEDs through the board's DMX input, enabled over serial once for the whole scan
+    (and restored afterward), so the serial link stays free during the scan.
+    If the board's control parameters aren't known yet, they are requested first and the scan starts once they arrive
+    """
+
+    mode_serial = "Serial, one LED at a time"
+    mode_artnet_single = "Art-Net, one LED at a time"
+    mode_artnet_gray_code = "Art-Net, Gray code patterns"
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
         self._is_starting = False
+        self._scan_board: ListedBoard | None = None
+        self._original_dmx_enabled: int | None = None
+        self._emitter: ArtnetLedPatternEmitter | None = None
+        self._pending_artnet_start: tuple[str, int] | None = None  # mode, first LED, until the board is ready
+        self._is_waiting_for_dmx = False  # pending start waiting for the board to acknowledge dmx_enabled
 
         self.viewport = ScanViewport()
         self.viewport.detectionResultReceived.connect(self._detection_result_received)
@@ -26,10 +45,18 @@ class ScanWidget(QWidget):
 
         self.range_first = SpinBox(name="first LED", minimum=0, maximum=10000)
         self.range_last = SpinBox(name="last LED", minimum=0, maximum=10000, value=360)
-        self.interval = SpinBox(name="interval (ms)", minimum=1, maximum=10000, value=1500)
+        self.interval = SpinBox(name="LED timeout (ms)", minimum=1, maximum=10000, value=1500)
+
+        self.combo_mode = QComboBox()
+        self.combo_mode.addItems([self.mode_serial, self.mode_artnet_single, self.mode_artnet_gray_code])
+
         self.button_scan = QPushButton("Scan")
         self.button_scan.clicked.connect(self._start_scan_clicked)
 
+        self.button_resume_scan = QPushButton("Resume scan...")
+        self.button_resume_scan.setIcon(icons.file())
+        self.button_resume_scan.clicked.connect(self._resume_scan_clicked)
+
         self.button_start_stop = QPushButton("Start Camera")
         self.button_start_stop.setIcon(icons.play_button())
         self.button_start_stop.clicked.connect(self._start_stop_clicked)
@@ -42,6 +69,28 @@ class ScanWidget(QWidget):
         self.button_save_scan_data.setIcon(icons.diskette())
         self.button_save_scan_data.clicked.connect(self._save_scan_data_clicked)
 
+        self.scan_engine = ScanEngine(self)
+        self.scan_engine.stepStarted.connect(lambda led: self.button_scan.setText(f"Step {led}"))
+        self.scan_engine.pointDetected.connect(self._point_detected)
+        self.scan_engine.pointMissed.connect(lambda led: print(f"No detection result for LED {led}"))
+        self.scan_engine.finished.connect(self._scan_finished)
+        self.viewport.detectionResultReceived.connect(self.scan_engine.detection_received)
+
+        self.gray_code_scan = GrayCodeScan(self)
+        self.gray_code_scan.stepStarted.connect(lambda step, count: self.button_scan.setText(f"Pattern {step + 1}/{count}"))
+        self.gray_code_scan.pointDetected.connect(self._gray_code_point_detected)
+        self.gray_code_scan.finished.connect(self._scan_finished)
+        self.viewport.frameReceived.connect(self.gray_code_scan.frame_received)
+
+        board_communicator = Components().board_communicator
+        board_communicator.controlParametersAcquired.connect(self._control_parameters_acquired)
+        board_communicator.controlParametersAcquisitionFailed.connect(self._control_parameters_acquisition_failed)
+        board_communicator.boardControlParametersSet.connect(self._control_parameters_set)
+        board_communicator.controlParametersSetFailed.connect(self._control_parameters_set_failed)
+
+        self.checkbox_adaptive_average = QCheckBox("Adaptive averaging (scan only)")
+        self.checkbox_adaptive_average.toggled.connect(self._options_changed)
+
         self.slider_blur = Slider(
             name="Blur",
             minimum=0, maximum=20, value=9,
@@ -57,35 +106,36 @@ class ScanWidget(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(self.viewport)
         layout.addWidget(self.slider_average)
+        layout.addWidget(self.checkbox_adaptive_average)
         layout.addWidget(self.slider_blur)
         layout.addWidget(self.range_first)
         layout.addWidget(self.range_last)
         layout.addWidget(self.interval)
+        layout.addWidget(self.combo_mode)
         layout.addWidget(self.button_scan)
+        layout.addWidget(self.button_resume_scan)
         layout.addWidget(self.button_start_stop)
         layout.addWidget(self.button_load_scan_data)
         layout.addWidget(self.button_save_scan_data)
 
-        self.timer: QTimer | None = None
-        self.current_step: int | None = None
-        self.board: ListedBoard | None = None
-        self.api: BoardApi | None = None
-        self.points: list[tuple[int, int]] | None = None
+        self.scan_log: ScanLogWriter | None = None
 
-        self.latest_point_detected: tuple[int, int] | None = None
-        self.viewport.detectionResultReceived.connect(lambda point: setattr(self, "latest_point_detected", point))
-
-    def _detection_result_received(self):
+    def _detection_result_received(self, frame_id: int, point: tuple[float, float] | None):
         if self._is_starting:
             self._set_start_button_stop()
             self.viewport.setEnabled(True)
             self._is_starting = False
 
     def _options_changed(self, _):
+        is_adaptive = self.checkbox_adaptive_average.isChecked() and self.scan_engine.is_running
+        self.slider_average.setEnabled(not is_adaptive)
+
         options = Components().scan_detection.get_options()
         options.blur_radius = self.slider_blur.value()
-        options.average_frame_count = self.slider_average.value()
+        # Adaptive mode needs every frame, the scan engine does the averaging
+        options.average_frame_count = 1 if is_adaptive else self.slider_average.value()
         Components().scan_detection.set_options(options)
+        self.scan_engine.average_frame_count = options.average_frame_count
 
     def _start_stop_clicked(self):
         scan_detection = Components().scan_detection
@@ -117,95 +167,196 @@ class ScanWidget(QWidget):
         self.button_start_stop.setText("Stop Camera")
         self.button_start_stop.setIcon(icons.stop())
 
+    @property
+    def is_scanning(self) -> bool:
+        return self._pending_artnet_start is not None or self.scan_engine.is_running or self.gray_code_scan.is_running
+
     def _start_scan_clicked(self):
-        if self.timer is not None:
-            self._stop()
+        if self._pending_artnet_start is not None:
+            self._pending_artnet_start = None
+            self._scan_finished()
+        elif self.scan_engine.is_running:
+            self.scan_engine.stop()
+        elif self.gray_code_scan.is_running:
+            self.gray_code_scan.stop()
         else:
-            self._start()
+            self.viewport.clear_detection_points()
+            self._start(time.strftime("scan-%Y%m%d-%H%M%S.ndjson"), self.range_first.value())
+
+    def _resume_scan_clicked(self):
+        if self.is_scanning:
+            return
+
+        filepath, _ = QFileDialog.getOpenFileName(self, "Resume scan", "", "Scan logs (*.ndjson)")
+        if not filepath:
+            return
 
-    def _start(self):
-        board_list_widget = Components().board_list_widget
-        board_list_widget.setEnabled(False)
-        self.board = board_list_widget.selected_board()
-        if self.board is None:
+        self._load_scan_records(filepath)
+        last_led = last_recorded_led(filepath)
+        self._start(filepath, self.range_first.value() if last_led is None else last_led + 1)
+
+    def _start(self, log_filepath: str, first_led: int):
+        board = Components().board_list_widget.selected_board()
+        if board is None:
             print("No board selected")
             return
 
-        self.api = BoardApi(self.board.serial_port_name)
+        if not Components().scan_detection.is_running:
+            print("Camera is not running")
+            return
+
+        Components().board_list_widget.setEnabled(False)
+        self.scan_log = ScanLogWriter(log_filepath)
+        self.combo_mode.setEnabled(False)
+        self._scan_board = board
+
+        mode = self.combo_mode.currentText()
+        if mode == self.mode_serial:
+            self.scan_engine.is_adaptive = self.checkbox_adaptive_average.isChecked()
+            self.scan_engine.start(board, first_led, self.range_last.value(), self.interval.value())
+            self._options_changed(None)
+            return
+
+        self._pending_artnet_start = mode, first_led
+        board_communicator = Components().board_communicator
+        parameters = board_communicator.last_control_parameters(board)
+        if parameters is None:
+            board_communicator.request_board_control_parameters(board)  # Continues in _control_parameters_acquired
+            return
+
+        self._enable_dmx(board, parameters)
+
+    def _start_artnet_scan(self):
+        mode, first_led = self._pending_artnet_start
+        self._pending_artnet_start = None
+
+        settings = Components().settings
+        self._emitter = ArtnetLedPatternEmitter(
+            Components().artnet_output,
+            target_ip=settings.artnet_target_ip,
+            first_universe=settings.artnet_scan_first_universe,
+            channels_per_led=settings.artnet_scan_channels_per_led
+        )
+
+        if mode == self.mode_artnet_single:
+            self.scan_engine.is_adaptive = self.checkbox_adaptive_average.isChecked()
+            self.scan_engine.start(
+                self._scan_board, first_led, self.range_last.value(), self.interval.value(), self._emitter
+            )
+            self._options_changed(None)
+        else:
+            self.gray_code_scan.mask = self.viewport.scan_mask
+            self.gray_code_scan.start(self._emitter, first_led, self.range_last.value())
+
+    def _control_parameters_acquired(self, board: ListedBoard, parameters: ControlParameters):
+        if self._is_waiting_for_parameters(board):
+            self._enable_dmx(board, parameters)
+
+    def _control_parameters_acquisition_failed(self, board: ListedBoard, error: str):
+        if not self._is_waiting_for_parameters(board):
+            return
 
-        self.current_step = self.range_first.value()
-        self.points = []
+        print(f"Cannot read control parameters ({error})")
+        self._pending_artnet_start = None
+        self._scan_finished()
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self._step1)
-        self.timer.start(self.interval.value() * 2 / 3)
+    def _control_parameters_set(self, board: ListedBoard, parameters: ControlParameters):
+        if self._is_waiting_for_dmx_acknowledgement(board) and parameters.dmx_enabled:
+            self._is_waiting_for_dmx = False
+            self._start_artnet_scan()
 
-    def _step1(self):
-        if self.current_step > self.range_last.value():
-            self._stop()
+    def _control_parameters_set_failed(self, board: ListedBoard, error: str):
+        if not self._is_waiting_for_dmx_acknowledgement(board):
             return
 
-        self.button_scan.setText(f"Step {self.current_step}")
-        self.current_step += 1
+        print(f"Cannot enable DMX input ({error})")
+        self._pending_artnet_start = None
+        self._scan_finished()
 
-        if Components().scan_detection.is_running:
-            parameters = self.api.get_control_parameters()
-            parameters.single_led = self.current_step
-            self.api.set_control_parameters(parameters)
-            self.step2_timer = QTimer(self)
-            self.step2_timer.timeout.connect(self._step2)
-            self.step2_timer.start(self.interval.value() / 3)
+    def _is_waiting_for_parameters(self, board: ListedBoard) -> bool:
+        return (
+            self._pending_artnet_start is not None and not self._is_waiting_for_dmx
+            and board.serial_port_name == self._scan_board.serial_port_name
+        )
+
+    def _is_waiting_for_dmx_acknowledgement(self, board: ListedBoard) -> bool:
+        return (
+            self._pending_artnet_start is not None and self._is_waiting_for_dmx
+            and board.serial_port_name == self._scan_board.serial_port_name
+        )
 
-    def _step2(self):
-        if self.step2_timer is None:
+    def _enable_dmx(self, board: ListedBoard, parameters: ControlParameters):
+        """
+        The scan starts once the board acknowledged dmx_enabled, patterns sent before would not be shown
+        """
+        self._original_dmx_enabled = parameters.dmx_enabled
+        if parameters.dmx_enabled:
+            self._start_artnet_scan()  # Already enabled, the stream won't send an identical update
             return
 
-        self.step2_timer.stop()
-        self.step2_timer.deleteLater()
-        self.step2_timer = None
+        self._is_waiting_for_dmx = True  # Continues in _control_parameters_set
+        Components().board_communicator.set_control_parameters(board, replace(parameters, dmx_enabled=1))
 
-        if self.latest_point_detected is None:
-            print("No detection result")
+    def _restore_dmx(self, board: ListedBoard):
+        """
+        Restores the value found when enabling, the board's control parameters stream skips it if unchanged
+        """
+        if self._original_dmx_enabled is None:
             return
 
-        self.points.append(self.latest_point_detected)
-        self.viewport.add_point(self.current_step, *self.latest_point_detected)
+        board_communicator = Components().board_communicator
+        parameters = board_communicator.last_control_parameters(board)
+        if parameters is not None:
+            parameters = replace(parameters, dmx_enabled=self._original_dmx_enabled)
+            board_communicator.set_control_parameters(board, parameters)
+        self._original_dmx_enabled = None
 
-    def _stop(self):
-        self.button_scan.setText("Scan")
-        self.timer.stop()
-        self.timer.deleteLater()
+    def _point_detected(self, led: int, x: float, y: float, confidence: float, frames_used: int):
+        self.scan_log.write(ScanRecord(led=led, x=x, y=y, confidence=confidence, frames_used=frames_used))
+        self.viewport.add_point(led, x, y)
+
+    def _gray_code_point_detected(self, led: int, x: float, y: float, confidence: float):
+        self._point_detected(led, x, y, confidence, GrayCodeScan.frames_per_pattern)
 
-        self.timer = None
-        self.current_step = None
-        self.board = None
-        self.api = None
+    def _scan_finished(self):
+        self._is_waiting_for_dmx = False
+        self.button_scan.setText("Scan")
+        Components().board_list_widget.setEnabled(True)
+        self.combo_mode.setEnabled(True)
 
-        board_list_widget = Components().board_list_widget
-        board_list_widget.setEnabled(True)
+        self._restore_dmx(self._scan_board)
+        self._scan_board = None
 
-        with open("detec.json", "w") as file:
-            json.dump(self.points, file, indent=2)
-            self.points = None
+        self.scan_log.close()
+        self.scan_log = None
+        self._options_changed(None)
 
     def _load_scan_data_clicked(self):
-        file_path, _ = QFileDialog.getOpenFileName(self, "Load scan data", "", "JSON files (*.json)")
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Load scan data", "", "Scan data (*.ndjson *.json);;Scan logs (*.ndjson);;JSON files (*.json)"
+        )
         if not file_path:
             return
 
-        with open(file_path, "r") as file:
-            self.points = json.load(file)
-            self.viewport.clear_detection_points()
-            for i, point in enumerate(self.points):
-                self.viewport.add_point(i, *point)
+        self._load_scan_records(file_path)
+
+    def _load_scan_records(self, filepath: str):
+        self.viewport.clear_detection_points()
+        for record in load_scan_records(filepath):
+            self.viewport.add_point(record.led, record.x, record.y)
 
     def _save_scan_data_clicked(self):
-        points = self.viewport.get_detection_points()
+        points = {point.led_index: point for point in self.viewport.get_detection_points()}
+
+        filepath = interop_filepath(self)
+        if not filepath:
+            return
 
-        interop_filepath = str(resources.files("ledboardtranslatoremulator.resources").joinpath("interop-data-elephanz.json"))
-        interop_store = InteropDataStore(interop_filepath)
+        interop_store = InteropDataStore(filepath)
         for sampling_point in interop_store.data.sampling_points:
+            if sampling_point.index not in points:
+                continue
             sampling_point.x = int(points[sampling_point.index].x)
             sampling_point.y = int(points[sampling_point.index].y)
-        interop_store._filepath = interop_filepath.replace(".json", "-quantized.json")
+        interop_store._filepath = filepath.replace(".json", "-quantized.json")
         interop_store.save()
@@ -8,6 +8,15 @@ from dataclasses_json import dataclass_json
 @dataclass
 class Settings:
     firmware_filepath: str = ""
+    interop_filepath: str = ""
+    control_parameters_max_rate: int = 60  # Hz, per board
+    control_parameters_presets_folder: str = "presets"
+    scan_edit_history_depth: int = 100
+    artnet_refresh_rate: int = 44  # Hz
+    artnet_target_ip: str = "192.168.20.12"
+    artnet_universe: int = 0
+    artnet_scan_first_universe: int = 0
+    artnet_scan_channels_per_led: int = 3
 
     def load(self):
         if os.path.exists("settings.json"):
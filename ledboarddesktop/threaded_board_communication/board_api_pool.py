@@ -0,0 +1,115 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from threading import Lock
+
+from ledboardlib import BoardApi, exceptions
+
+
+@dataclass
+class BoardApiPoolMetrics:
+    opens: int = 0
+    reuse_hits: int = 0
+    errors: int = 0
+    evictions: int = 0
+    failed_health_checks: int = 0
+
+
+@dataclass
+class _BoardApiSession:
+    api: BoardApi
+    last_used: float
+    users: int = 0
+
+
+class BoardApiPool:
+    """
+    Keeps one BoardApi session per serial port, so consecutive commands don't pay the opening cost again.
+
+    Sessions are evicted after idle_timeout, dropped on communication errors and invalidated when the
+    port disappears or the board reboots. A session idle for longer than health_check_interval is
+    checked with a hardware info request before being reused.
+    """
+
+    idle_timeout = 30.0  # seconds
+    health_check_interval = 5.0  # seconds
+
+    def __init__(self):
+        self._lock = Lock()
+        self._sessions: dict[str, _BoardApiSession] = dict()
+        self._metrics: dict[str, BoardApiPoolMetrics] = dict()
+
+    @contextmanager
+    def session(self, serial_port_name: str):
+        """
+        Yields the port's BoardApi, drops the session if a communication error occurs
+        """
+        session = self._acquire(serial_port_name)
+        try:
+            yield session.api
+
+        except exceptions.UsbSerialException:
+            with self._lock:
+                self._metric(serial_port_name).errors += 1
+            self.invalidate(serial_port_name)
+            raise
+
+        finally:
+            with self._lock:
+                session.users -= 1
+                session.last_used = time.monotonic()
+
+    def invalidate(self, serial_port_name: str):
+        with self._lock:
+            self._sessions.pop(serial_port_name, None)
+
+    def evict_idle(self):
+        now = time.monotonic()
+        with self._lock:
+            for serial_port_name, session in list(self._sessions.items()):
+                if session.users == 0 and now - session.last_used > self.idle_timeout:
+                    self._sessions.pop(serial_port_name)
+                    self._metric(serial_port_name).evictions += 1
+
+    def metrics(self, serial_port_name: str) -> BoardApiPoolMetrics:
+        with self._lock:
+            return BoardApiPoolMetrics(**self._metric(serial_port_name).__dict__)
+
+    def _acquire(self, serial_port_name: str) -> _BoardApiSession:
+        with self._lock:
+            session = self._sessions.get(serial_port_name)
+            if session is not None:
+                session.users += 1
+                needs_health_check = time.monotonic() - session.last_used > self.health_check_interval
+
+        if session is not None and needs_health_check and not self._is_healthy(session):
+            with self._lock:
+                session.users -= 1
+                self._metric(serial_port_name).failed_health_checks += 1
+                if self._sessions.get(serial_port_name) is session:
+                    self._sessions.pop(serial_port_name)
+            session = None
+
+        with self._lock:
+            if session is not None:
+                self._metric(serial_port_name).reuse_hits += 1
+                return session
+
+            session = _BoardApiSession(api=BoardApi(serial_port_name), last_used=time.monotonic(), users=1)
+            self._sessions[serial_port_name] = session
+            self._metric(serial_port_name).opens += 1
+            return session
+
+    @staticmethod
+    def _is_healthy(session: _BoardApiSession) -> bool:
+        try:
+            session.api.get_hardware_info()
+            return True
+        except exceptions.UsbSerialException:
+            return False
+
+    def _metric(self, serial_port_name: str) -> BoardApiPoolMetrics:
+        if serial_port_name not in self._metrics:
+            self._metrics[serial_port_name] = BoardApiPoolMetrics()
+
+        return self._metrics[serial_port_name]
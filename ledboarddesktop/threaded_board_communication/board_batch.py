@@ -0,0 +1,46 @@
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+from ledboardlib import ListedBoard
+
+
+class BoardOperation(Enum):
+    SetControlParameters = "set_control_parameters"
+    SaveControlParameters = "save_control_parameters"
+    Reboot = "reboot"
+    FirmwareUpload = "firmware_upload"
+
+
+@dataclass
+class BoardBatch:
+    """
+    Tracks one operation fanned out to several boards, at most max_concurrency boards at a time.
+
+    Results map serial port names to an error message (empty on success).
+    """
+    id: int
+    operation: BoardOperation
+    argument: Any
+    max_concurrency: int
+    pending: deque[ListedBoard] = field(default_factory=deque)
+    running: set[str] = field(default_factory=set)
+    results: dict[str, str] = field(default_factory=dict)
+
+    def next_boards(self) -> list[ListedBoard]:
+        boards = list()
+        while self.pending and len(self.running) < self.max_concurrency:
+            board = self.pending.popleft()
+            self.running.add(board.serial_port_name)
+            boards.append(board)
+
+        return boards
+
+    def board_finished(self, board: ListedBoard, error: str):
+        self.running.discard(board.serial_port_name)
+        self.results[board.serial_port_name] = error
+
+    @property
+    def is_finished(self) -> bool:
+        return not self.pending and not self.running
@@ -0,0 +1,105 @@
+import copy
+import time
+from dataclasses import dataclass, fields
+
+from PySide6.QtCore import QObject, Signal, QTimer
+
+from ledboardlib import ListedBoard, ControlParameters
+
+
+def is_changed(parameters: ControlParameters, reference: ControlParameters | None) -> bool:
+    """
+    BoardApi only writes whole ControlParameters, so fields are compared to skip no-op writes, not to send partial ones
+    """
+    if reference is None:
+        return True
+
+    return any(
+        getattr(parameters, field.name) != getattr(reference, field.name)
+        for field in fields(ControlParameters)
+    )
+
+
+@dataclass
+class ControlParametersStreamStatistics:
+    sent: int = 0
+    merged: int = 0  # pending updates replaced by a newer one before they were sent
+    skipped: int = 0  # updates identical to the parameters last acknowledged by the board
+    failed: int = 0
+
+
+class ControlParametersStream(QObject):
+    """
+    Coalesces control parameters updates for one board.
+
+    At most one update is in flight, and only the latest pending update is kept, so a slider drag
+    doesn't pile up writes in the port lane. Sends are rate limited to max_rate (Hz), and skipped
+    when nothing differs from the parameters the board last acknowledged.
+    """
+
+    sendRequested = Signal(ListedBoard, ControlParameters)
+
+    def __init__(self, max_rate: int, parent=None):
+        super().__init__(parent)
+
+        self.statistics = ControlParametersStreamStatistics()
+        self.last_acknowledged: ControlParameters | None = None
+
+        self._minimum_interval = 1.0 / max_rate
+        self._pending: tuple[ListedBoard, ControlParameters] | None = None
+        self._is_in_flight = False
+        self._last_send_time = 0.0
+
+        self._rate_timer = QTimer(self)
+        self._rate_timer.setSingleShot(True)
+        self._rate_timer.timeout.connect(self._send_pending)
+
+    def push(self, board: ListedBoard, parameters: ControlParameters):
+        if self._pending is not None:
+            self.statistics.merged += 1
+
+        self._pending = board, copy.copy(parameters)
+        self._send_pending()
+
+    def finish(self, error: str):
+        """
+        The in-flight update was processed by the port lane, error is empty on success
+        """
+        self._is_in_flight = False
+        if error:
+            self.statistics.failed += 1
+        self._send_pending()
+
+    def reset(self):
+        """
+        The board rebooted, got new firmware or was unplugged: what it acknowledged before is no longer applied
+        """
+        self.last_acknowledged = None
+        self._is_in_flight = False
+
+    def set_board_parameters(self, parameters: ControlParameters):
+        """
+        Parameters read from or acknowledged by the board, used as reference for the next updates
+        """
+        self.last_acknowledged = parameters
+
+    def _send_pending(self):
+        if self._is_in_flight or self._pending is None or self._rate_timer.isActive():
+            return
+
+        remaining = self._minimum_interval - (time.monotonic() - self._last_send_time)
+        if remaining > 0:
+            self._rate_timer.start(int(remaining * 1000) + 1)
+            return
+
+        board, parameters = self._pending
+        self._pending = None
+
+        if not is_changed(parameters, self.last_acknowledged):
+            self.statistics.skipped += 1
+            return
+
+        self._is_in_flight = True
+        self._last_send_time = time.monotonic()
+        self.statistics.sent += 1
+        self.sendRequested.emit(board, parameters)
@@ -0,0 +1,111 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+
+from PySide6.QtCore import QObject, Signal, QSocketNotifier
+
+
+class HotplugMonitor(QObject):
+    """
+    Notifies when a serial port appears or disappears, so board detection only runs when needed.
+
+    Must be created and started in the thread that consumes portsChanged (QSocketNotifier affinity).
+    """
+
+    portsChanged = Signal()
+
+    def start(self) -> bool:
+        """
+        Returns False if hot-plug detection is not available, callers should fall back on polling
+        """
+        return False
+
+    def stop(self):
+        pass
+
+
+class InotifyHotplugMonitor(HotplugMonitor):
+    """
+    Linux hot-plug detection, watches /dev for serial device nodes being created or deleted
+    (watching /dev/serial/by-id is not enough, udev removes that folder with the last device)
+    """
+
+    _IN_CREATE = 0x100
+    _IN_DELETE = 0x200
+    _IN_NONBLOCK = 0o4000
+    _IN_CLOEXEC = 0o2000000
+    _EVENT_HEADER = struct.Struct("iIII")
+
+    watched_folder = "/dev"
+    device_prefixes = ("ttyACM", "ttyUSB")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self._file_descriptor: int | None = None
+        self._notifier: QSocketNotifier | None = None
+
+    def start(self) -> bool:
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            return False
+
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        file_descriptor = libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        if file_descriptor < 0:
+            return False
+
+        watch_descriptor = libc.inotify_add_watch(
+            file_descriptor,
+            self.watched_folder.encode(),
+            self._IN_CREATE | self._IN_DELETE
+        )
+        if watch_descriptor < 0:
+            os.close(file_descriptor)
+            return False
+
+        self._file_descriptor = file_descriptor
+        self._notifier = QSocketNotifier(file_descriptor, QSocketNotifier.Type.Read, self)
+        self._notifier.activated.connect(self._read_events)
+        return True
+
+    def stop(self):
+        if self._notifier is not None:
+            self._notifier.setEnabled(False)
+            self._notifier.deleteLater()
+            self._notifier = None
+
+        if self._file_descriptor is not None:
+            os.close(self._file_descriptor)
+            self._file_descriptor = None
+
+    def _read_events(self):
+        is_port_changed = False
+
+        while True:
+            try:
+                buffer = os.read(self._file_descriptor, 4096)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(buffer):
+                _, _, _, name_length = self._EVENT_HEADER.unpack_from(buffer, offset)
+                offset += self._EVENT_HEADER.size
+                name = buffer[offset:offset + name_length].rstrip(b"\0").decode(errors="replace")
+                offset += name_length
+
+                if name.startswith(self.device_prefixes):
+                    is_port_changed = True
+
+        if is_port_changed:
+            self.portsChanged.emit()
+
+
+def make_hotplug_monitor(parent=None) -> HotplugMonitor:
+    if sys.platform.startswith("linux"):
+        return InotifyHotplugMonitor(parent)
+
+    return HotplugMonitor(parent)
@@ -0,0 +1,73 @@
+from contextlib import contextmanager
+from threading import Condition
+
+
+class PortBusyError(Exception):
+    pass
+
+
+class PortArbiter:
+    """
+    Arbitrates serial port usage between port lanes and board detection.
+
+    A lane leases its own port, detection leases every port at once (listing boards opens them all).
+    Waiting is done on a condition variable, with a timeout, so no CPU is spent while a port is busy.
+
+    While detection waits, no new port lease is granted, so a stream of short lane operations
+    can't keep detection out: it runs as soon as the operations in progress are done.
+    """
+
+    def __init__(self):
+        self._condition = Condition()
+        self._leased_ports: set[str] = set()
+        self._is_detecting = False
+        self._waiting_detections = 0
+
+    def acquire_port(self, serial_port_name: str, timeout: float | None = None) -> bool:
+        with self._condition:
+            is_acquired = self._condition.wait_for(
+                lambda: (
+                    not self._is_detecting and not self._waiting_detections
+                    and serial_port_name not in self._leased_ports
+                ),
+                timeout
+            )
+            if is_acquired:
+                self._leased_ports.add(serial_port_name)
+
+            return is_acquired
+
+    def release_port(self, serial_port_name: str):
+        with self._condition:
+            self._leased_ports.discard(serial_port_name)
+            self._condition.notify_all()
+
+    def acquire_all(self, timeout: float | None = None) -> bool:
+        with self._condition:
+            self._waiting_detections += 1
+            is_acquired = self._condition.wait_for(
+                lambda: not self._is_detecting and not self._leased_ports,
+                timeout
+            )
+            self._waiting_detections -= 1
+            if is_acquired:
+                self._is_detecting = True
+            else:
+                self._condition.notify_all()  # Lanes held back by this detection can lease again
+
+            return is_acquired
+
+    def release_all(self):
+        with self._condition:
+            self._is_detecting = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def port(self, serial_port_name: str, timeout: float | None = None):
+        if not self.acquire_port(serial_port_name, timeout):
+            raise PortBusyError(f"Port {serial_port_name} is busy")
+
+        try:
+            yield
+        finally:
+            self.release_port(serial_port_name)
@@ -0,0 +1,55 @@
+from collections import deque
+
+from PySide6.QtCore import QObject, Signal, QThread
+
+from ledboardlib import ListedBoard, ControlParameters
+
+from ledboarddesktop.threaded_board_communication.board_api_pool import BoardApiPool
+from ledboarddesktop.threaded_board_communication.board_batch import BoardOperation
+from ledboarddesktop.threaded_board_communication.port_arbiter import PortArbiter
+from ledboarddesktop.threaded_board_communication.port_worker import BoardPortWorker
+
+
+class BoardPortLane(QObject):
+    """
+    Owns the thread and worker dedicated to one serial port.
+
+    Requests are emitted through queued signals, so they are executed in order on the lane thread.
+    Batchable operations are recorded in pending_operations (with their batch id, None otherwise)
+    and matched, in the same order, against the worker's operationFinished.
+    """
+
+    boardControlParametersRequested = Signal(ListedBoard)
+    boardDetailsRequested = Signal(ListedBoard)
+    boardRebootRequested = Signal(ListedBoard)
+    boardSaveControlParametersRequested = Signal(ListedBoard)
+    controlParametersSet = Signal(ListedBoard, ControlParameters)
+    firmwareUploadRequested = Signal(ListedBoard, str)
+
+    def __init__(self, serial_port_name: str, port_arbiter: PortArbiter, board_api_pool: BoardApiPool, parent=None):
+        super().__init__(parent)
+
+        self.serial_port_name = serial_port_name
+        self.pending_operations: deque[tuple[BoardOperation, int | None]] = deque()
+
+        self.worker = BoardPortWorker(serial_port_name, port_arbiter, board_api_pool)
+
+        self.boardControlParametersRequested.connect(self.worker.request_board_control_parameters)
+        self.boardDetailsRequested.connect(self.worker.request_board_details)
+        self.boardRebootRequested.connect(self.worker.request_reboot)
+        self.boardSaveControlParametersRequested.connect(self.worker.request_save_parameters)
+        self.controlParametersSet.connect(self.worker.set_control_parameters)
+        self.firmwareUploadRequested.connect(self.worker.request_firmware_upload)
+
+        self._thread = QThread()
+        self._thread.setObjectName(f"BoardPortLane-{serial_port_name}")
+        self.worker.moveToThread(self._thread)
+        self._thread.finished.connect(self.worker.deleteLater)
+
+    def start(self):
+        if not self._thread.isRunning():
+            self._thread.start()
+
+    def stop(self):
+        self._thread.quit()
+        self._thread.wait()
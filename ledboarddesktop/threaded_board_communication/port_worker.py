@@ -0,0 +1,139 @@
+from contextlib import contextmanager
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+from ledboardlib import (
+    ControlParameters,
+    HardwareConfiguration,
+    HardwareInfo,
+    ListedBoard,
+    exceptions,
+)
+
+from ledboarddesktop.threaded_board_communication.board_api_pool import BoardApiPool
+from ledboarddesktop.threaded_board_communication.port_arbiter import PortArbiter, PortBusyError
+
+
+class BoardPortWorker(QObject):
+    """
+    Executes requests targeting a single serial port.
+
+    One instance lives in each port lane thread, so requests for a given port are processed
+    in order while requests for different ports run in parallel. Each request leases its port
+    from the shared PortArbiter, and gives up with boardPortBusy if the lease times out.
+    Board sessions are reused from the shared BoardApiPool.
+
+    Operations that can be batched (reboot, firmware upload, set and save control parameters)
+    always end with operationFinished, whatever exception they raised, so callers can track completion
+    in lane order. Its error message is empty on success.
+    """
+
+    boardControlParametersSaved = Signal()
+    boardDetailsAcquired = Signal(HardwareInfo, HardwareConfiguration)
+    boardDetailsAcquisitionFailed = Signal(str)
+    boardPortBusy = Signal(ListedBoard)
+    controlParametersAcquired = Signal(ListedBoard, ControlParameters)
+    controlParametersAcquisitionFailed = Signal(ListedBoard, str)
+    controlParametersSent = Signal(ListedBoard, ControlParameters)
+    operationFinished = Signal(ListedBoard, str)  # error message, empty on success
+    rebootStarted = Signal(ListedBoard)
+
+    lease_timeout = 5.0  # seconds, board detection holds every port while listing them
+
+    def __init__(self, serial_port_name: str, port_arbiter: PortArbiter, board_api_pool: BoardApiPool, parent=None):
+        super().__init__(parent)
+
+        self.serial_port_name = serial_port_name
+        self._port_arbiter = port_arbiter
+        self._board_api_pool = board_api_pool
+
+    @Slot(ListedBoard)
+    def request_board_details(self, board: ListedBoard):
+        try:
+            with self._port_arbiter.port(board.serial_port_name, self.lease_timeout), \
+                    self._board_api_pool.session(board.serial_port_name) as api:
+                hardware_info = api.get_hardware_info()
+                hardware_configuration = api.get_configuration()
+            self.boardDetailsAcquired.emit(hardware_info, hardware_configuration)
+
+        except PortBusyError as e:
+            self.boardPortBusy.emit(board)
+            self.boardDetailsAcquisitionFailed.emit(str(e))
+
+        except Exception as e:
+            self.boardDetailsAcquisitionFailed.emit(_error_message(e))
+
+    @Slot(ListedBoard)
+    def request_reboot(self, board: ListedBoard):
+        with self._operation(board):
+            with self._port_arbiter.port(board.serial_port_name, self.lease_timeout), \
+                    self._board_api_pool.session(board.serial_port_name) as api:
+                api.reboot()
+            self._board_api_pool.invalidate(board.serial_port_name)
+            self.rebootStarted.emit(board)
+
+    @Slot(ListedBoard, str)
+    def request_firmware_upload(self, board: ListedBoard, firmware_filepath: str):
+        with self._operation(board):
+            with self._port_arbiter.port(board.serial_port_name, self.lease_timeout), \
+                    self._board_api_pool.session(board.serial_port_name) as api:
+                api.upload_firmware(firmware_filepath)
+            self._board_api_pool.invalidate(board.serial_port_name)
+            self.rebootStarted.emit(board)
+
+    @Slot(ListedBoard)
+    def request_board_control_parameters(self, board: ListedBoard):
+        try:
+            with self._port_arbiter.port(board.serial_port_name, self.lease_timeout), \
+                    self._board_api_pool.session(board.serial_port_name) as api:
+                control_parameters = api.get_control_parameters()
+            self.controlParametersAcquired.emit(board, control_parameters)
+
+        except PortBusyError as e:
+            self.boardPortBusy.emit(board)
+            self.controlParametersAcquisitionFailed.emit(board, str(e))
+
+        except Exception as e:
+            self.controlParametersAcquisitionFailed.emit(board, _error_message(e))
+
+    @Slot(ListedBoard, ControlParameters)
+    def set_control_parameters(self, board: ListedBoard, parameters: ControlParameters):
+        with self._operation(board):
+            with self._port_arbiter.port(board.serial_port_name, self.lease_timeout), \
+                    self._board_api_pool.session(board.serial_port_name) as api:
+                api.set_control_parameters(parameters)
+            self.controlParametersSent.emit(board, parameters)
+
+    @Slot(ListedBoard)
+    def request_save_parameters(self, board: ListedBoard):
+        with self._operation(board):
+            with self._port_arbiter.port(board.serial_port_name, self.lease_timeout), \
+                    self._board_api_pool.session(board.serial_port_name) as api:
+                api.save_control_parameters()
+            self.boardControlParametersSaved.emit()
+
+    @contextmanager
+    def _operation(self, board: ListedBoard):
+        """
+        Wraps a batchable operation, any exception is reported through operationFinished instead of escaping
+        """
+        error = ""
+        try:
+            yield
+
+        except PortBusyError as e:
+            self.boardPortBusy.emit(board)
+            error = str(e)
+
+        except Exception as e:
+            error = _error_message(e)
+
+        finally:
+            self.operationFinished.emit(board, error)
+
+
+def _error_message(exception: Exception) -> str:
+    if isinstance(exception, exceptions.UsbSerialException):
+        return str(exception) or type(exception).__name__
+
+    return f"{type(exception).__name__}: {exception}"
@@ -1,7 +1,17 @@
-from PySide6.QtCore import QObject, Signal, QThread, Qt
+from itertools import count
+
+from PySide6.QtCore import QObject, Signal, QThread, Qt, Slot, QTimer
 
 from ledboardlib import ListedBoard, HardwareConfiguration, HardwareInfo, ControlParameters
 
+from ledboarddesktop.threaded_board_communication.board_api_pool import BoardApiPool, BoardApiPoolMetrics
+from ledboarddesktop.threaded_board_communication.board_batch import BoardBatch, BoardOperation
+from ledboarddesktop.threaded_board_communication.control_parameters_stream import (
+    ControlParametersStream,
+    ControlParametersStreamStatistics,
+)
+from ledboarddesktop.threaded_board_communication.port_arbiter import PortArbiter
+from ledboarddesktop.threaded_board_communication.port_lane import BoardPortLane
 from ledboarddesktop.threaded_board_communication.worker import ThreadedBoardCommunicationWorker
 
 
@@ -11,72 +21,126 @@ class ThreadedBoardCommunicator(QObject):
 
     This class is a high-level interface to manage communication with boards, handling
     requests for details, reboot, refresh actions, and acquiring board updates. It uses
-    PyQT's threading and signal-slot mechanisms to operate within a dedicated worker
-    thread, ensuring smooth functionality in a multithreaded environment.
+    PyQT's threading and signal-slot mechanisms: board detection runs in a dedicated
+    worker thread, and each serial port gets its own lane (thread and worker), so requests
+    for one port are processed in order while different ports are handled in parallel.
+
+    Reboot, firmware upload, and setting or saving control parameters can also be requested
+    for a set of boards at once (batch_* methods). The batch is fanned out across port lanes,
+    at most batch_max_concurrency boards at a time (by default one per port lane, all at once),
+    with per-board progress and a single result.
 
     Signals
     -------
+    - batchFinished: Emitted when every board of a batch is done, with errors by port name.
+    - batchProgress: Emitted when a board of a batch is done, with an error message if it failed.
     - boardChanged: Emitted when a board's parameters change.
+    - boardControlParametersSet: Emitted when a board acknowledged new control parameters.
     - boardDetailsAcquired: Emitted when board details (hardware info and configuration)
       are successfully acquired.
     - boardDetailsAcquisitionFailed: Emitted when acquiring board details fails, carrying
       an error message.
     - boardDetailsRequested: Emitted to request details for a specific board.
+    - boardPortBusy: Emitted when a request gave up waiting for the board's serial port.
     - boardRebootRequested: Emitted to request a reboot for a specific board.
     - boardRebooted: Emitted when a board reboot is completed.
     - boardRefreshRequested: Emitted to request a data refresh for a specific board.
+    - boardsAdded: Emitted with the boards that appeared since the last detection.
+    - boardsChanged: Emitted with the boards whose availability changed since the last detection.
     - boardsListed: Emitted when the list of detected boards is updated.
+    - boardsRemoved: Emitted with the serial port names of the boards that disappeared.
+    - controlParametersAcquired: Emitted with the board when its control parameters were read.
+    - controlParametersAcquisitionFailed: Emitted when reading a board's control parameters fails.
+    - controlParametersSetFailed: Emitted when writing control parameters to a board fails, with an error message.
+    - operationFailed: Emitted when a reboot, firmware upload or save outside a batch fails, with an error message.
 
+    :ivar batchFinished: Signal emitted when a batch is done, with errors by port name (empty on success).
+    :type batchFinished: Signal
+    :ivar batchProgress: Signal emitted when a board of a batch is done.
+    :type batchProgress: Signal
     :ivar boardChanged: Signal emitted when a board's parameters change.
     :type boardChanged: Signal
+    :ivar boardControlParametersSet: Signal emitted when a board acknowledged control parameters.
+    :type boardControlParametersSet: Signal
     :ivar boardDetailsAcquired: Signal emitted when board details are acquired successfully.
     :type boardDetailsAcquired: Signal
     :ivar boardDetailsAcquisitionFailed: Signal emitted when acquiring board details fails.
     :type boardDetailsAcquisitionFailed: Signal
     :ivar boardDetailsRequested: Signal emitted when requesting details of a board.
     :type boardDetailsRequested: Signal
+    :ivar boardPortBusy: Signal emitted when a request could not lease the board's port in time.
+    :type boardPortBusy: Signal
     :ivar boardRebootRequested: Signal emitted when requesting a board reboot.
     :type boardRebootRequested: Signal
     :ivar boardRebooted: Signal emitted when a board reboot completes.
     :type boardRebooted: Signal
     :ivar boardRefreshRequested: Signal emitted when requesting a board refresh.
     :type boardRefreshRequested: Signal
+    :ivar boardsAdded: Signal emitted with newly detected boards.
+    :type boardsAdded: Signal
+    :ivar boardsChanged: Signal emitted with boards whose availability changed.
+    :type boardsChanged: Signal
     :ivar boardsListed: Signal emitted when a new list of boards is available.
     :type boardsListed: Signal
+    :ivar boardsRemoved: Signal emitted with serial port names of boards that disappeared.
+    :type boardsRemoved: Signal
+    :ivar controlParametersAcquired: Signal emitted with the board and its control parameters, once read.
+    :type controlParametersAcquired: Signal
+    :ivar controlParametersAcquisitionFailed: Signal emitted when reading control parameters fails.
+    :type controlParametersAcquisitionFailed: Signal
+    :ivar controlParametersSetFailed: Signal emitted when writing control parameters fails.
+    :type controlParametersSetFailed: Signal
+    :ivar operationFailed: Signal emitted when an operation outside a batch fails.
+    :type operationFailed: Signal
     """
 
+    batchFinished = Signal(int, dict)
+    batchProgress = Signal(int, ListedBoard, str)
     boardChanged = Signal(ListedBoard)
     boardControlParametersAcquired = Signal(ControlParameters)
     boardControlParametersRequested = Signal(ListedBoard)
+    boardControlParametersSet = Signal(ListedBoard, ControlParameters)
     boardDetailsAcquired = Signal(HardwareInfo, HardwareConfiguration)
     boardDetailsAcquisitionFailed = Signal(str)
     boardDetailsRequested = Signal(ListedBoard)
+    boardPortBusy = Signal(ListedBoard)
     boardRebootRequested = Signal(ListedBoard)
     boardRebooted = Signal(ListedBoard)
     boardRefreshRequested = Signal(ListedBoard)
     boardSaveControlParametersRequested = Signal(ListedBoard)
+    boardsAdded = Signal(list)
+    boardsChanged = Signal(list)
     boardsListed = Signal(list)
+    boardsRemoved = Signal(list)
+    controlParametersAcquired = Signal(ListedBoard, ControlParameters)
+    controlParametersAcquisitionFailed = Signal(ListedBoard, str)
     controlParametersSet = Signal(ListedBoard, ControlParameters)
+    controlParametersSetFailed = Signal(ListedBoard, str)
     firmwareUploadRequested = Signal(ListedBoard, str)
+    operationFailed = Signal(ListedBoard, str)
+
+    batch_max_concurrency: int | None = None  # boards at a time, None for as many as there are port lanes
+    control_parameters_max_rate = 60  # Hz, per board
 
     def __init__(self):
         super().__init__()
 
-        self._worker = ThreadedBoardCommunicationWorker()
+        self._port_arbiter = PortArbiter()
+        self._board_api_pool = BoardApiPool()
+
+        self._worker = ThreadedBoardCommunicationWorker(self._port_arbiter)
         self._worker.boardChanged.connect(self.boardChanged)
-        self._worker.boardControlParametersAcquired.connect(self.boardControlParametersAcquired)
-        self._worker.boardDetailsAcquired.connect(self.boardDetailsAcquired)
-        self._worker.boardDetailsAcquisitionFailed.connect(self.boardDetailsAcquisitionFailed)
         self._worker.boardRebooted.connect(self.boardRebooted)
+        self._worker.boardsAdded.connect(self.boardsAdded)
+        self._worker.boardsChanged.connect(self.boardsChanged)
         self._worker.boardsListed.connect(self.boardsListed)
+        self._worker.boardsRemoved.connect(self.boardsRemoved)
+
+        self._worker.boardsRemoved.connect(self._invalidate_board_api_sessions)
+        self._worker.boardsRemoved.connect(self._reset_control_parameters_streams)
+        self._worker.boardRebooted.connect(self._board_restarted)
 
-        self.boardControlParametersRequested.connect(self._worker.request_board_control_parameters)
-        self.boardDetailsRequested.connect(self._worker.request_board_details)
-        self.boardRebootRequested.connect(self._worker.request_reboot)
         self.boardRefreshRequested.connect(self._worker.request_board_refresh)
-        self.boardSaveControlParametersRequested.connect(self._worker.request_save_parameters)
-        self.controlParametersSet.connect(self._worker.set_control_parameters)
-        self.firmwareUploadRequested.connect(self._worker.request_firmware_upload)
 
         self._thread = QThread()
         self._worker.moveToThread(self._thread)
@@ -84,32 +148,213 @@ class ThreadedBoardCommunicator(QObject):
         self._thread.started.connect(self._worker.poll_forever)
         self._thread.finished.connect(self._thread.deleteLater)
 
+        self._lanes: dict[str, BoardPortLane] = dict()
+        self._control_parameters_streams: dict[str, ControlParametersStream] = dict()
+        self._batches: dict[int, BoardBatch] = dict()
+        self._batch_ids = count(1)
+
+        self._board_api_eviction_timer = QTimer(self)
+        self._board_api_eviction_timer.setInterval(int(self._board_api_pool.idle_timeout * 1000))
+        self._board_api_eviction_timer.timeout.connect(self._board_api_pool.evict_idle)
+
     def start(self):
         if not self._thread.isRunning():
             self._thread.start()
+            self._board_api_eviction_timer.start()
+
+        for lane in self._lanes.values():
+            lane.start()
 
     def stop(self):
+        self._board_api_eviction_timer.stop()
+
+        for lane in self._lanes.values():
+            lane.stop()
+
         self._worker.stop()
         self._thread.quit()
         self._thread.wait()
 
     def request_board_details(self, board: ListedBoard):
         self.boardDetailsRequested.emit(board)
+        self._lane(board).boardDetailsRequested.emit(board)
 
     def request_board_reboot(self, board: ListedBoard):
         self.boardRebootRequested.emit(board)
+        self._dispatch(board, BoardOperation.Reboot)
 
     def request_board_refresh(self, board: ListedBoard):
         self.boardRefreshRequested.emit(board)
 
     def request_firmware_upload(self, board: ListedBoard, firmware_filepath: str):
         self.firmwareUploadRequested.emit(board, firmware_filepath)
+        self._dispatch(board, BoardOperation.FirmwareUpload, firmware_filepath)
 
     def request_board_control_parameters(self, board: ListedBoard):
         self.boardControlParametersRequested.emit(board)
+        self._lane(board).boardControlParametersRequested.emit(board)
 
     def request_save_parameters(self, board: ListedBoard):
         self.boardSaveControlParametersRequested.emit(board)
+        self._dispatch(board, BoardOperation.SaveControlParameters)
 
     def set_control_parameters(self, board: ListedBoard, parameters: ControlParameters):
+        """
+        Updates are coalesced per board, only the latest one is sent (see ControlParametersStream)
+        """
         self.controlParametersSet.emit(board, parameters)
+        self._control_parameters_stream(board).push(board, parameters)
+
+    def batch_set_control_parameters(self, boards: list[ListedBoard], parameters: ControlParameters) -> int:
+        return self._start_batch(boards, BoardOperation.SetControlParameters, parameters)
+
+    def batch_save_parameters(self, boards: list[ListedBoard]) -> int:
+        return self._start_batch(boards, BoardOperation.SaveControlParameters)
+
+    def batch_reboot(self, boards: list[ListedBoard]) -> int:
+        return self._start_batch(boards, BoardOperation.Reboot)
+
+    def batch_firmware_upload(self, boards: list[ListedBoard], firmware_filepath: str) -> int:
+        return self._start_batch(boards, BoardOperation.FirmwareUpload, firmware_filepath)
+
+    def board_api_metrics(self, board: ListedBoard) -> BoardApiPoolMetrics:
+        return self._board_api_pool.metrics(board.serial_port_name)
+
+    def last_control_parameters(self, board: ListedBoard) -> ControlParameters | None:
+        """
+        Latest control parameters read from or acknowledged by the board, if any
+        """
+        return self._control_parameters_stream(board).last_acknowledged
+
+    def control_parameters_statistics(self, board: ListedBoard) -> ControlParametersStreamStatistics:
+        return self._control_parameters_stream(board).statistics
+
+    def _control_parameters_stream(self, board: ListedBoard) -> ControlParametersStream:
+        stream = self._control_parameters_streams.get(board.serial_port_name)
+        if stream is None:
+            stream = ControlParametersStream(self.control_parameters_max_rate, parent=self)
+            stream.sendRequested.connect(
+                lambda board_, parameters: self._dispatch(board_, BoardOperation.SetControlParameters, parameters)
+            )
+            self._control_parameters_streams[board.serial_port_name] = stream
+
+        return stream
+
+    def _start_batch(self, boards: list[ListedBoard], operation: BoardOperation, argument=None) -> int:
+        """
+        Boards sharing a serial port are processed once. An empty batch finishes on the next event loop
+        iteration, so the caller gets the batch id before batchFinished
+        """
+        unique_boards: dict[str, ListedBoard] = dict()
+        for board in boards:
+            unique_boards.setdefault(board.serial_port_name, board)
+        boards = list(unique_boards.values())
+
+        batch = BoardBatch(
+            id=next(self._batch_ids),
+            operation=operation,
+            argument=argument,
+            max_concurrency=self.batch_max_concurrency or max(1, len(boards))
+        )
+        batch.pending.extend(boards)
+
+        if not boards:
+            QTimer.singleShot(0, lambda: self.batchFinished.emit(batch.id, batch.results))
+            return batch.id
+
+        self._batches[batch.id] = batch
+        self._continue_batch(batch)
+        return batch.id
+
+    def _continue_batch(self, batch: BoardBatch):
+        if batch.is_finished:
+            self._batches.pop(batch.id)
+            self.batchFinished.emit(batch.id, batch.results)
+            return
+
+        for board in batch.next_boards():
+            self._dispatch(board, batch.operation, batch.argument, batch.id)
+
+    def _dispatch(self, board: ListedBoard, operation: BoardOperation, argument=None, batch_id: int | None = None):
+        lane = self._lane(board)
+        lane.pending_operations.append((operation, batch_id))
+
+        if operation == BoardOperation.SetControlParameters:
+            lane.controlParametersSet.emit(board, argument)
+        elif operation == BoardOperation.SaveControlParameters:
+            lane.boardSaveControlParametersRequested.emit(board)
+        elif operation == BoardOperation.Reboot:
+            lane.boardRebootRequested.emit(board)
+        elif operation == BoardOperation.FirmwareUpload:
+            lane.firmwareUploadRequested.emit(board, argument)
+
+    @Slot(ListedBoard, str)
+    def _operation_finished(self, board: ListedBoard, error: str):
+        operation, batch_id = self._lanes[board.serial_port_name].pending_operations.popleft()
+
+        if batch_id is None:
+            if operation == BoardOperation.SetControlParameters:
+                self._control_parameters_stream(board).finish(error)
+                if error:
+                    self.controlParametersSetFailed.emit(board, error)
+            elif error:
+                self.operationFailed.emit(board, error)
+            return
+
+        batch = self._batches[batch_id]
+        batch.board_finished(board, error)
+        self.batchProgress.emit(batch_id, board, error)
+        self._continue_batch(batch)
+
+    @Slot(list)
+    def _invalidate_board_api_sessions(self, serial_port_names: list[str]):
+        for serial_port_name in serial_port_names:
+            self._board_api_pool.invalidate(serial_port_name)
+
+    @Slot(list)
+    def _reset_control_parameters_streams(self, serial_port_names: list[str]):
+        for serial_port_name in serial_port_names:
+            stream = self._control_parameters_streams.get(serial_port_name)
+            if stream is not None:
+                stream.reset()
+
+    @Slot(ListedBoard)
+    def _board_restarted(self, board: ListedBoard):
+        """
+        Reboot or firmware upload started, or reboot completed
+        """
+        self._reset_control_parameters_streams([board.serial_port_name])
+
+    @Slot(ListedBoard, ControlParameters)
+    def _control_parameters_acquired(self, board: ListedBoard, parameters: ControlParameters):
+        self._control_parameters_stream(board).set_board_parameters(parameters)
+        self.boardControlParametersAcquired.emit(parameters)
+        self.controlParametersAcquired.emit(board, parameters)
+
+    @Slot(ListedBoard, ControlParameters)
+    def _control_parameters_sent(self, board: ListedBoard, parameters: ControlParameters):
+        self._control_parameters_stream(board).set_board_parameters(parameters)
+        self.boardControlParametersSet.emit(board, parameters)
+
+    def _lane(self, board: ListedBoard) -> BoardPortLane:
+        """
+        Returns the lane dedicated to the board's serial port, creating it on first use
+        """
+        lane = self._lanes.get(board.serial_port_name)
+        if lane is None:
+            lane = BoardPortLane(board.serial_port_name, self._port_arbiter, self._board_api_pool, parent=self)
+            lane.worker.controlParametersAcquired.connect(self._control_parameters_acquired)
+            lane.worker.controlParametersAcquisitionFailed.connect(self.controlParametersAcquisitionFailed)
+            lane.worker.controlParametersSent.connect(self._control_parameters_sent)
+            lane.worker.boardDetailsAcquired.connect(self.boardDetailsAcquired)
+            lane.worker.boardDetailsAcquisitionFailed.connect(self.boardDetailsAcquisitionFailed)
+            lane.worker.boardPortBusy.connect(self.boardPortBusy)
+            lane.worker.operationFinished.connect(self._operation_finished)
+            lane.worker.rebootStarted.connect(self._worker.wait_for_reboot)
+            lane.worker.rebootStarted.connect(self._board_restarted)
+            self._lanes[board.serial_port_name] = lane
+
+            if self._thread.isRunning():
+                lane.start()
+
+        return lane
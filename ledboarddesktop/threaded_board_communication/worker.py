@@ -1,39 +1,42 @@
 from PySide6.QtCore import QObject, Signal, Slot, QTimer
 
-from ledboardlib import (
-    BoardApi,
-    BoardDetectionApi,
-    ControlParameters,
-    HardwareConfiguration,
-    HardwareInfo,
-    ListedBoard,
-    exceptions,
-)
+from ledboardlib import BoardDetectionApi, ListedBoard
+
+from ledboarddesktop.threaded_board_communication.hotplug_monitor import HotplugMonitor, make_hotplug_monitor
+from ledboarddesktop.threaded_board_communication.port_arbiter import PortArbiter
 
 
 class ThreadedBoardCommunicationWorker(QObject):
     """
-    Manages threaded communication with connected boards by continuously polling and
-    handling board-related requests, such as refreshing, rebooting, and acquiring details.
-
-    This class is designed to detect and manage boards connected to the system in a
-    thread-safe manner. It uses polling mechanisms and signals to communicate state
-    changes and events related to connected boards. The functionality includes detecting
-    board changes, responding to client requests such as rebooting or refreshing specific
-    boards, and acquiring detailed board information.
+    Detects boards connected to the system, and reports board changes, refresh requests
+    and reboot completions.
+
+    When a HotplugMonitor is available, boards are listed only when a serial port appears
+    or disappears (plus a slow safety poll to catch ports freed by other programs).
+    Otherwise, boards are listed every poll_interval.
+
+    Requests targeting a board (details, reboot, firmware upload, ...) are handled by
+    per-port workers (see BoardPortWorker). Listing boards opens every port, so a poll waits
+    (up to detection_lease_timeout, new leases being held back meanwhile) for the operations
+    in progress to finish, and is retried soon if one of them lasts longer (firmware upload).
+
+    While a board reboots, boards are listed every poll_interval even with hot-plug detection,
+    so boardRebooted is not delayed until the safety poll.
     """
 
     poll_interval = 1000  # Doesn't need to be short, Windows takes time detecting ports when plugged/rebooted
+    hotplug_poll_interval = 10000  # Safety poll, only catches availability changes when hot-plug is available
+    hotplug_debounce_interval = 300  # A single plug triggers several device node events
+    detection_lease_timeout = 0.5  # seconds
 
-    boardChanged = Signal(ListedBoard)
-    boardControlParametersAcquired = Signal(ControlParameters)
-    boardControlParametersSaved = Signal()
-    boardDetailsAcquired = Signal(HardwareInfo, HardwareConfiguration)
-    boardDetailsAcquisitionFailed = Signal(str)
+    boardChanged = Signal(ListedBoard)  # availability changed or refresh requested
     boardRebooted = Signal(ListedBoard)
+    boardsAdded = Signal(list)  # list[ListedBoard]
+    boardsChanged = Signal(list)  # list[ListedBoard], availability changed
     boardsListed = Signal(list)
+    boardsRemoved = Signal(list)  # list[str], serial port names
 
-    def __init__(self, parent=None):
+    def __init__(self, port_arbiter: PortArbiter, parent=None):
         super().__init__(parent)
 
         self._is_running = False
@@ -44,15 +47,26 @@ class ThreadedBoardCommunicationWorker(QObject):
         self._waiting_for_reboot: list[str] = list()
 
         self._poll_timer : QTimer | None = None
+        self._debounce_timer: QTimer | None = None
+        self._hotplug_monitor: HotplugMonitor | None = None
+        self._idle_poll_interval = self.poll_interval
 
-
-        self._is_polling = False
-        self._is_polling_suspended = False
+        self._port_arbiter = port_arbiter
 
     def poll_forever(self):
+        self._debounce_timer = QTimer()
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(self.hotplug_debounce_interval)
+        self._debounce_timer.timeout.connect(self._poll)
+
+        self._hotplug_monitor = make_hotplug_monitor()
+        self._hotplug_monitor.portsChanged.connect(self._debounce_timer.start)
+        is_hotplug_available = self._hotplug_monitor.start()
+
+        self._idle_poll_interval = self.hotplug_poll_interval if is_hotplug_available else self.poll_interval
         self._poll_timer = QTimer()
         self._poll_timer.timeout.connect(self._poll)
-        self._poll_timer.setInterval(self.poll_interval)
+        self._poll_timer.setInterval(self._idle_poll_interval)
         self._is_running = True
         self._poll_timer.start()
         self._poll()
@@ -62,129 +76,80 @@ class ThreadedBoardCommunicationWorker(QObject):
         if self._poll_timer:
             self._poll_timer.stop()
 
+        if self._debounce_timer:
+            self._debounce_timer.stop()
+
+        if self._hotplug_monitor:
+            self._hotplug_monitor.stop()
+
     def _poll(self):
-        if self._is_polling_suspended:
+        if not self._port_arbiter.acquire_all(timeout=self.detection_lease_timeout):
+            # A long operation holds a port, retry soon so a hot-plug event is not missed until next safety poll
+            self._debounce_timer.start()
             return
 
-        self._is_polling = True
+        try:
+            boards = {board.serial_port_name: board for board in self._detection_api.list_boards()}
+        finally:
+            self._port_arbiter.release_all()
 
-        boards = {board.serial_port_name: board for board in self._detection_api.list_boards()}
+        added = [board for port, board in boards.items() if port not in self._previous_boards]
+        removed = [port for port in self._previous_boards if port not in boards]
+        changed = list()
+        rebooted = list()
 
         for board in boards.values():
-            if board.serial_port_name not in self._previous_boards:
-                continue
+            is_added = board.serial_port_name not in self._previous_boards
 
-            if board.available != self._previous_boards[board.serial_port_name].available:
+            is_availability_changed = not is_added and board.available != self._previous_boards[board.serial_port_name].available
+            if is_availability_changed:
                 self._previous_boards[board.serial_port_name] = board
-                self.boardChanged.emit(board)
+                changed.append(board)
 
-            if board.serial_port_name in self._requested_for_refresh:
+            is_refresh_requested = board.serial_port_name in self._requested_for_refresh
+            if is_refresh_requested:
                 self._requested_for_refresh.remove(board.serial_port_name)
+
+            if not is_added and (is_availability_changed or is_refresh_requested):
                 self.boardChanged.emit(board)
 
+            # A rebooting board usually comes back as a newly added port
             if board.serial_port_name in self._waiting_for_reboot:
                 self._waiting_for_reboot.remove(board.serial_port_name)
-                self.boardRebooted.emit(board)
-
-        if self._previous_boards.keys() != boards.keys():
-            self._previous_boards = boards
-            self.boardsListed.emit(list(boards.values()))
-
-        self._is_polling = False
+                rebooted.append(board)
 
-    @Slot(ListedBoard)
-    def request_board_refresh(self, board: ListedBoard):
-        self._requested_for_refresh.append(board.serial_port_name)
+        for port in removed:
+            self._previous_boards.pop(port)
 
-    @Slot(ListedBoard)
-    def request_board_details(self, board: ListedBoard):
-        self._suspend_polling()
-        try:
-            api = BoardApi(board.serial_port_name)
-            hardware_info = api.get_hardware_info()
-            hardware_configuration = api.get_configuration()
-            self.boardDetailsAcquired.emit(hardware_info, hardware_configuration)
-
-        except exceptions.UsbSerialException as e:
-            self.boardDetailsAcquisitionFailed.emit(str(e))
-
-        finally:
-            self._restore_polling()
+        for board in added:
+            self._previous_boards[board.serial_port_name] = board
 
-    @Slot(ListedBoard)
-    def request_reboot(self, board: ListedBoard):
-        self._suspend_polling()
-        try:
-            BoardApi(board.serial_port_name).reboot()
-            self._waiting_for_reboot.append(board.serial_port_name)
+        if removed:
+            self.boardsRemoved.emit(removed)
 
-        except exceptions.UsbSerialException as e:
-            # TODO self.boardRebootRequestFailed.emit(str(e))
-            print(e)
+        if added:
+            self.boardsAdded.emit(added)
 
-        finally:
-            self._restore_polling()
+        if changed:
+            self.boardsChanged.emit(changed)
 
-    @Slot(ListedBoard, str)
-    def request_firmware_upload(self, board: ListedBoard, firmware_filepath: str):
-        self._suspend_polling()
-        try:
-            BoardApi(board.serial_port_name).upload_firmware(firmware_filepath)
-            self._waiting_for_reboot.append(board.serial_port_name)
+        if added or removed:
+            self.boardsListed.emit(list(self._previous_boards.values()))
 
-        except exceptions.UsbSerialException as e:
-            # TODO self.boardFirmwareUploadRequestFailed.emit(str(e))
-            print(e)
+        for board in rebooted:
+            self.boardRebooted.emit(board)
 
-        finally:
-            self._restore_polling()
+        if rebooted and not self._waiting_for_reboot:
+            self._poll_timer.setInterval(self._idle_poll_interval)
 
     @Slot(ListedBoard)
-    def request_board_control_parameters(self, board: ListedBoard):
-        self._suspend_polling()
-        try:
-            control_parameters = BoardApi(board.serial_port_name).get_control_parameters()
-            self.boardControlParametersAcquired.emit(control_parameters)
-
-        except exceptions.UsbSerialException as e:
-            # TODO self.boardFirmwareUploadRequestFailed.emit(str(e))
-            print(e)
-
-        finally:
-            self._restore_polling()
-
-    @Slot(ListedBoard, ControlParameters)
-    def set_control_parameters(self, board: ListedBoard, parameters: ControlParameters):
-        self._suspend_polling()
-        try:
-            BoardApi(board.serial_port_name).set_control_parameters(parameters)
-
-        except exceptions.UsbSerialException as e:
-            # TODO self.boardFirmwareUploadRequestFailed.emit(str(e))
-            print(e)
-
-        finally:
-            self._restore_polling()
+    def request_board_refresh(self, board: ListedBoard):
+        self._requested_for_refresh.append(board.serial_port_name)
+        if self._debounce_timer is not None:
+            self._debounce_timer.start()
 
     @Slot(ListedBoard)
-    def request_save_parameters(self, board: ListedBoard):
-        self._suspend_polling()
-        try:
-            BoardApi(board.serial_port_name).save_control_parameters()
-            self.boardControlParametersSaved.emit()
-
-        except exceptions.UsbSerialException as e:
-            # TODO self.boardFirmwareUploadRequestFailed.emit(str(e))
-            print(e)
-
-        finally:
-            self._restore_polling()
-
-    def _suspend_polling(self):
-        while self._is_polling:
-            continue
-
-        self._is_polling_suspended = True
-
-    def _restore_polling(self):
-        self._is_polling_suspended = False
+    def wait_for_reboot(self, board: ListedBoard):
+        self._waiting_for_reboot.append(board.serial_port_name)
+        if self._poll_timer is not None:
+            self._poll_timer.setInterval(self.poll_interval)
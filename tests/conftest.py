@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def qt_application():
+    QtCore = pytest.importorskip("PySide6.QtCore")
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("PySide6")
+
+from ledboarddesktop.artnet.output_engine import ArtnetOutputEngine
+from ledboarddesktop.scan.artnet_led_pattern_emitter import ArtnetLedPatternEmitter
+
+
+@pytest.fixture
+def emitter(qt_application):
+    emitter = ArtnetLedPatternEmitter(ArtnetOutputEngine(), "127.0.0.1", first_universe=1, channels_per_led=3)
+    emitter.applied = list()
+    emitter.patternApplied.connect(lambda: emitter.applied.append(True))
+    return emitter
+
+
+def test_pattern_spans_universes(emitter):
+    emitter.apply(169, np.array([True, False, True]))  # 170 LEDs per universe
+
+    first = np.frombuffer(emitter._output.buffer(1), dtype=np.uint8)
+    second = np.frombuffer(emitter._output.buffer(2), dtype=np.uint8)
+    assert first[507:510].tolist() == [255, 255, 255]
+    assert second[:6].tolist() == [0, 0, 0, 255, 255, 255]
+
+
+def test_restore_cancels_pattern_applied(emitter):
+    emitter.apply(0, np.array([True]))
+    assert emitter._applied_timer.isActive()
+
+    emitter.restore()
+    assert not emitter._applied_timer.isActive()
+    assert emitter.applied == []
+    assert not np.frombuffer(emitter._output.buffer(1), dtype=np.uint8).any()
+
+
+def test_new_pattern_restarts_the_notification(emitter):
+    emitter.apply(0, np.array([True]))
+    emitter.apply(1, np.array([True]))
+
+    assert emitter._applied_timer.isActive()
+    assert emitter._applied_timer.interval() == 2 * emitter._output.interval
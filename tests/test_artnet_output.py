@@ -0,0 +1,135 @@
+import socket
+import struct
+from threading import Lock
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from ledboarddesktop.artnet import output_engine
+from ledboarddesktop.artnet.output_engine import (
+    ArtnetOutputEngine, ArtnetOutputStatistics, ArtnetSender, ArtnetUniverse
+)
+from ledboarddesktop.artnet.packet import ARTDMX_HEADER_SIZE, UNIVERSE_SIZE, make_artdmx_header
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def receiver():
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(0.01)
+    yield receiver
+    receiver.close()
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(output_engine, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def sender(qt_application, receiver, clock):
+    universes = {
+        number: ArtnetUniverse(number, targets=[receiver.getsockname()])
+        for number in (1, 2)
+    }
+    sender = ArtnetSender(universes, Lock(), ArtnetOutputStatistics())
+    sender._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender.universes = universes
+    yield sender
+    sender.stop()
+
+
+def receive(receiver) -> list[bytes]:
+    packets = list()
+    while True:
+        try:
+            packets.append(receiver.recv(2048))
+        except socket.timeout:
+            return packets
+
+
+def universe_of(packet: bytes) -> int:
+    return struct.unpack_from("<H", packet, 14)[0]
+
+
+def test_header():
+    header = make_artdmx_header(0x1234, 7)
+
+    assert len(header) == ARTDMX_HEADER_SIZE
+    assert header[:8] == b"Art-Net\x00"
+    assert struct.unpack_from("<H", header, 8)[0] == 0x5000  # OpDmx
+    assert struct.unpack_from(">H", header, 10)[0] == 14  # protocol version
+    assert header[12] == 7  # sequence
+    assert header[13] == 0  # physical
+    assert struct.unpack_from("<H", header, 14)[0] == 0x1234
+    assert struct.unpack_from(">H", header, 16)[0] == UNIVERSE_SIZE
+
+
+def test_only_dirty_universes_are_sent(sender, receiver, clock):
+    sender._tick()
+    assert sorted(universe_of(packet) for packet in receive(receiver)) == [1, 2]
+
+    clock.now += 0.1
+    sender.universes[2].buffer[0:3] = b"\x01\x02\x03"
+    sender.universes[2].is_dirty = True
+    sender._tick()
+
+    packets = receive(receiver)
+    assert [universe_of(packet) for packet in packets] == [2]
+    assert packets[0][ARTDMX_HEADER_SIZE:ARTDMX_HEADER_SIZE + 3] == b"\x01\x02\x03"
+    assert len(packets[0]) == ARTDMX_HEADER_SIZE + UNIVERSE_SIZE
+
+    clock.now += 0.1
+    sender._tick()
+    assert receive(receiver) == []
+
+
+def test_keep_alive_interval(sender, receiver, clock):
+    sender.keep_alive_interval = 1.0
+    sender._tick()
+    receive(receiver)
+
+    clock.now += 0.99
+    sender._tick()
+    assert receive(receiver) == []
+
+    clock.now += 0.01
+    sender._tick()
+    assert sorted(universe_of(packet) for packet in receive(receiver)) == [1, 2]
+    assert sender._statistics.keep_alives == 2
+
+
+def test_sequence_wraps(sender, receiver, clock):
+    sequences = list()
+    for _ in range(256):
+        sender.universes[1].is_dirty = True
+        sender._tick()
+        sequences += [packet[12] for packet in receive(receiver) if universe_of(packet) == 1]
+        clock.now += 0.01
+
+    assert sequences == list(range(1, 256)) + [1]
+
+
+def test_write_rejects_offsets_outside_the_universe(qt_application):
+    engine = ArtnetOutputEngine()
+    buffer = engine.add_universe(1, "127.0.0.1")
+
+    engine.write(1, UNIVERSE_SIZE - 2, b"\x01\x02\x03\x04")
+    assert len(buffer) == UNIVERSE_SIZE
+    assert buffer[-2:] == b"\x01\x02"
+
+    for offset in (-1, UNIVERSE_SIZE + 1):
+        with pytest.raises(ValueError):
+            engine.write(1, offset, b"\x01")
+    assert len(buffer) == UNIVERSE_SIZE
@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+import pytest
+
+from ledboarddesktop.artnet.packet import UNIVERSE_SIZE
+from ledboarddesktop.artnet.recording import RecordingReader, RecordingWriter
+from ledboarddesktop.artnet.sequence_file import SequenceFile
+
+
+def universe(value: int) -> bytes:
+    return bytes([value % 256]) * UNIVERSE_SIZE
+
+
+def record(filepath: str) -> int:
+    """
+    Three universes over 2.5 s with a keyframe every second, returns the offset of the last keyframe's first record
+    """
+    writer = RecordingWriter(filepath, keyframe_interval=1.0)
+    for step in range(26):
+        writer.record(10.0 + step * 0.1, [(number, universe(step + number)) for number in (1, 2, 3)])
+    last_keyframe_offset = writer._index[-1][1]
+    writer.close()
+    return last_keyframe_offset
+
+
+def test_round_trip(tmp_path):
+    filepath = str(tmp_path / "recording.dmxrec")
+    record(filepath)
+
+    reader = RecordingReader(filepath)
+    assert reader.universes == [1, 2, 3]
+    assert reader.duration == pytest.approx(2.5)
+    states = reader.seek(1.25)
+    assert states[2][0] == 12 + 2
+    reader.close()
+
+
+@pytest.mark.parametrize("cut", [1, 20, 600, 1100])
+def test_recording_cut_inside_last_keyframe(tmp_path, cut):
+    filepath = str(tmp_path / "recording.dmxrec")
+    last_keyframe_offset = record(filepath)
+    with open(filepath, "rb") as file:
+        data = file.read(last_keyframe_offset + cut)  # crash while writing the keyframe, no index footer
+    with open(filepath, "wb") as file:
+        file.write(data)
+
+    reader = RecordingReader(filepath)
+    assert reader.universes == [1, 2, 3]
+
+    sequence_filepath = str(tmp_path / "recording.dmxseq")
+    reader.write_sequence(sequence_filepath, frame_rate=10)
+    reader.close()
+
+    sequence = SequenceFile(sequence_filepath)
+    assert sequence.universes == [1, 2, 3]
+    assert os.path.getsize(sequence_filepath) > 0
+    np.testing.assert_array_equal(sequence.frames[5, :, 0], [6, 7, 8])
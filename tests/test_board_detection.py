@@ -0,0 +1,156 @@
+from dataclasses import dataclass
+
+import pytest
+
+pytest.importorskip("PySide6")
+pytest.importorskip("ledboardlib")
+
+from ledboarddesktop.threaded_board_communication import worker as worker_module
+from ledboarddesktop.threaded_board_communication.hotplug_monitor import HotplugMonitor
+from ledboarddesktop.threaded_board_communication.port_arbiter import PortArbiter
+from ledboarddesktop.threaded_board_communication.worker import ThreadedBoardCommunicationWorker
+
+
+@dataclass
+class FakeBoard:
+    serial_port_name: str
+    available: bool = True
+
+
+class FakeDetectionApi:
+    def __init__(self):
+        self.boards: list[FakeBoard] = list()
+
+    def list_boards(self) -> list[FakeBoard]:
+        return list(self.boards)
+
+
+class FakeHotplugMonitor(HotplugMonitor):
+    """
+    Hot-plug detection always available, plug() stands for a device node event
+    """
+
+    def start(self) -> bool:
+        return True
+
+    def plug(self):
+        self.portsChanged.emit()
+
+
+@pytest.fixture
+def monitor(monkeypatch) -> FakeHotplugMonitor:
+    monitor = FakeHotplugMonitor()
+    monkeypatch.setattr(worker_module, "make_hotplug_monitor", lambda parent=None: monitor)
+    return monitor
+
+
+@pytest.fixture
+def worker(qt_application, monitor):
+    worker = ThreadedBoardCommunicationWorker(PortArbiter())
+    worker._detection_api = FakeDetectionApi()
+    worker.detection_lease_timeout = 0.01
+
+    worker.emitted = list()
+    for name in ("boardChanged", "boardRebooted", "boardsAdded", "boardsChanged", "boardsListed", "boardsRemoved"):
+        getattr(worker, name).connect(lambda *arguments, name=name: worker.emitted.append((name, arguments)))
+
+    yield worker
+    worker.stop()
+
+
+def _start(worker, boards: list[FakeBoard]):
+    worker._detection_api.boards = boards
+    worker.poll_forever()
+    worker.emitted.clear()
+
+
+def _names(worker) -> list[str]:
+    return [name for name, _ in worker.emitted]
+
+
+def test_first_poll_adds_and_lists_boards(worker):
+    boards = [FakeBoard("COM1"), FakeBoard("COM2")]
+    worker._detection_api.boards = boards
+
+    worker.poll_forever()
+
+    assert worker.emitted == [("boardsAdded", (boards,)), ("boardsListed", (boards,))]
+
+
+def test_hotplug_uses_safety_poll_and_debounces_events(worker, monitor):
+    _start(worker, [])
+    assert worker._poll_timer.interval() == worker.hotplug_poll_interval
+
+    monitor.plug()
+
+    assert worker._debounce_timer.isActive()
+
+
+def test_removed_board(worker):
+    _start(worker, [FakeBoard("COM1"), FakeBoard("COM2")])
+
+    worker._detection_api.boards = [FakeBoard("COM2")]
+    worker._poll()
+
+    assert _names(worker) == ["boardsRemoved", "boardsListed"]
+    assert worker.emitted[0][1] == (["COM1"],)
+
+
+def test_availability_change(worker):
+    _start(worker, [FakeBoard("COM1")])
+
+    occupied = FakeBoard("COM1", available=False)
+    worker._detection_api.boards = [occupied]
+    worker._poll()
+
+    assert worker.emitted == [("boardChanged", (occupied,)), ("boardsChanged", ([occupied],))]
+
+    worker.emitted.clear()
+    worker._poll()
+
+    assert worker.emitted == list()
+
+
+def test_refresh_request(worker):
+    board = FakeBoard("COM1")
+    _start(worker, [board])
+
+    worker.request_board_refresh(board)
+    worker._poll()
+
+    assert worker.emitted == [("boardChanged", (board,))]
+
+
+def test_rebooted_board_coming_back_as_added(worker):
+    board = FakeBoard("COM1")
+    _start(worker, [board])
+
+    worker.wait_for_reboot(board)
+    assert worker._poll_timer.interval() == worker.poll_interval
+
+    worker._detection_api.boards = []
+    worker._poll()
+    assert "boardRebooted" not in _names(worker)
+
+    worker.emitted.clear()
+    worker._detection_api.boards = [board]
+    worker._poll()
+
+    assert _names(worker) == ["boardsAdded", "boardsListed", "boardRebooted"]
+    assert worker._poll_timer.interval() == worker.hotplug_poll_interval
+
+
+def test_busy_port_delays_detection(worker):
+    _start(worker, [FakeBoard("COM1")])
+    worker._port_arbiter.acquire_port("COM1")
+
+    worker._detection_api.boards = []
+    worker._poll()
+
+    assert worker.emitted == list()
+    assert worker._debounce_timer.isActive()
+
+    worker._port_arbiter.release_port("COM1")
+    worker._poll()
+
+    assert _names(worker) == ["boardsRemoved", "boardsListed"]
@@ -0,0 +1,42 @@
+import numpy as np
+
+from ledboarddesktop.scan.gray_code import GrayCodeDecoder, led_pattern
+
+
+def render(led_positions: list[tuple[int, int]], lit: np.ndarray, brightness: list[int]) -> np.ndarray:
+    frame = np.full((40, 60), 10, dtype=np.uint8)
+    for (x, y), is_lit, level in zip(led_positions, lit, brightness):
+        if is_lit:
+            frame[y - 1:y + 2, x - 1:x + 2] = level
+    return frame
+
+
+def capture(decoder: GrayCodeDecoder, led_positions, brightness):
+    frames = [render(led_positions, led_pattern(decoder.led_count, bit), brightness) for bit in range(decoder.bits)]
+    complements = [
+        render(led_positions, led_pattern(decoder.led_count, bit, is_complement=True), brightness)
+        for bit in range(decoder.bits)
+    ]
+    return frames, complements
+
+
+def test_decode_positions():
+    led_positions = [(5, 5), (20, 10), (35, 30), (50, 20)]
+    decoder = GrayCodeDecoder(len(led_positions))
+
+    positions, is_found, _ = decoder.decode(*capture(decoder, led_positions, [250] * 4))
+
+    assert is_found.all()
+    np.testing.assert_allclose(positions, np.array(led_positions, dtype=np.float64))
+
+
+def test_confidence_follows_contrast():
+    led_positions = [(5, 5), (20, 10), (35, 30), (50, 20)]
+    decoder = GrayCodeDecoder(len(led_positions))
+
+    _, is_found, confidences = decoder.decode(*capture(decoder, led_positions, [250, 250, 60, 0]))
+
+    assert is_found.tolist() == [True, True, True, False]
+    assert confidences[0] == 1.0
+    assert 0.0 < confidences[2] < 1.0
+    assert confidences[3] == 0.0
@@ -0,0 +1,84 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import pytest
+
+pytest.importorskip("PySide6")
+pytest.importorskip("ledboardlib")
+
+from ledboardlib import exceptions
+
+from ledboarddesktop.threaded_board_communication.port_arbiter import PortArbiter
+from ledboarddesktop.threaded_board_communication.port_worker import BoardPortWorker
+
+
+@dataclass
+class FakeBoard:
+    serial_port_name: str
+    available: bool = True
+
+
+class FakeBoardApi:
+    def __init__(self):
+        self.error: Exception | None = None
+
+    def reboot(self):
+        if self.error is not None:
+            raise self.error
+
+    def save_control_parameters(self):
+        if self.error is not None:
+            raise self.error
+
+
+class FakeBoardApiPool:
+    def __init__(self):
+        self.api = FakeBoardApi()
+
+    @contextmanager
+    def session(self, serial_port_name: str):
+        yield self.api
+
+    def invalidate(self, serial_port_name: str):
+        pass
+
+
+@pytest.fixture
+def worker(qt_application):
+    worker = BoardPortWorker("COM1", PortArbiter(), FakeBoardApiPool())
+    worker.lease_timeout = 0.01
+
+    worker.finished = list()
+    worker.operationFinished.connect(lambda board, error: worker.finished.append((board.serial_port_name, error)))
+    return worker
+
+
+def test_operation_finished_on_success(worker):
+    worker.request_reboot(FakeBoard("COM1"))
+
+    assert worker.finished == [("COM1", "")]
+
+
+@pytest.mark.parametrize("error", [exceptions.UsbSerialException("unplugged"), RuntimeError("unexpected")])
+def test_operation_finished_with_error(worker, error):
+    worker._board_api_pool.api.error = error
+    saved = list()
+    worker.boardControlParametersSaved.connect(lambda: saved.append(True))
+
+    worker.request_save_parameters(FakeBoard("COM1"))
+
+    assert len(worker.finished) == 1
+    assert worker.finished[0][0] == "COM1"
+    assert str(error) in worker.finished[0][1]
+    assert not saved
+
+
+def test_operation_finished_when_port_busy(worker):
+    busy = list()
+    worker.boardPortBusy.connect(lambda board: busy.append(board.serial_port_name))
+
+    with worker._port_arbiter.port("COM1", 0.01):
+        worker.request_reboot(FakeBoard("COM1"))
+
+    assert busy == ["COM1"]
+    assert worker.finished == [("COM1", "Port COM1 is busy")]
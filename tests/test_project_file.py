@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("ledboardlib")
+
+from ledboarddesktop.project.project_file import ProjectFile, ProjectFileError
+
+
+def make_arrays(count: int) -> dict[str, np.ndarray]:
+    return {
+        "leds": np.arange(count, dtype=np.int64),
+        "positions": np.column_stack((np.arange(count), np.arange(count) * 2.0)),
+        "segments": np.full(count, -1, dtype=np.int8),
+        "is_deleted": np.zeros(count, dtype=bool),
+    }
+
+
+def test_points_round_trip(tmp_path):
+    project = ProjectFile(str(tmp_path / "project.ledproj"))
+    arrays = make_arrays(ProjectFile.chunk_size + 10)
+    project.save_points(arrays, len(arrays["leds"]))
+
+    arrays["positions"][5] = 100.0, 200.0
+    project.save_points(arrays, len(arrays["leds"]), dirty_rows=np.array([5]))
+    project.close()
+
+    loaded = ProjectFile(str(tmp_path / "project.ledproj")).load_points()
+    for name, array in arrays.items():
+        np.testing.assert_array_equal(loaded[name], array)
+
+
+def test_sqlite_errors_raise_project_file_error(tmp_path):
+    project = ProjectFile(str(tmp_path / "project.ledproj"))
+    project.close()
+
+    with pytest.raises(ProjectFileError):
+        project.save_points(make_arrays(3), 3)
+
+    with pytest.raises(ProjectFileError):
+        project.load_mask_polygons()
@@ -0,0 +1,32 @@
+import numpy as np
+
+from ledboarddesktop.scan.scan_mask import ScanMask
+
+
+def _square(left, top, right, bottom):
+    return np.array([(left, top), (right, top), (right, bottom), (left, bottom)], dtype=np.float64)
+
+
+def test_exclusion_wins_over_inclusion_drawn_after_it():
+    mask = ScanMask(20, 20)
+    mask.set_polygons([
+        (False, _square(0, 0, 20, 20)),
+        (True, _square(5, 5, 10, 10)),
+        (False, _square(4, 4, 12, 12)),
+    ])
+
+    assert mask.contains(2, 2)
+    assert mask.contains(11, 11)
+    assert not mask.contains(7, 7)
+
+
+def test_polygon_edit_matches_full_rasterization():
+    mask = ScanMask(20, 20)
+    mask.set_polygons([(False, _square(0, 0, 20, 20)), (True, _square(5, 5, 10, 10))])
+    mask.set_polygon(2, False, _square(4, 4, 12, 12))
+
+    expected = ScanMask(20, 20)
+    expected.set_polygons(mask.polygons)
+
+    assert not mask.contains(7, 7)
+    assert np.array_equal(mask.bitmap, expected.bitmap)
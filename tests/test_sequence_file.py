@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from ledboarddesktop.artnet.packet import UNIVERSE_SIZE
+from ledboarddesktop.artnet.sequence_file import SequenceFile, SequenceFileError
+
+
+def make_frames(frame_count: int, universe_count: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (frame_count, universe_count, UNIVERSE_SIZE), dtype=np.uint8)
+
+
+def test_round_trip(tmp_path):
+    filepath = str(tmp_path / "sequence.dmxseq")
+    frames = make_frames(10, 2)
+    SequenceFile.write(filepath, frames, [3, 7], frame_rate=44.0)
+
+    sequence = SequenceFile(filepath)
+    assert sequence.universes == [3, 7]
+    assert sequence.frame_rate == 44.0
+    assert sequence.frame_count == 10
+    np.testing.assert_array_equal(sequence.frames, frames)
+
+
+def test_wrong_frame_shape(tmp_path):
+    with pytest.raises(SequenceFileError):
+        SequenceFile.write(str(tmp_path / "sequence.dmxseq"), make_frames(2, 2), [1], frame_rate=44.0)
+
+
+@pytest.mark.parametrize("size", [0, 10, 100, 1000])
+def test_truncated_file(tmp_path, size):
+    filepath = str(tmp_path / "sequence.dmxseq")
+    SequenceFile.write(filepath, make_frames(4, 2), [1, 2], frame_rate=44.0)
+    with open(filepath, "r+b") as file:
+        file.truncate(size)
+
+    with pytest.raises(SequenceFileError):
+        SequenceFile(filepath)